@@ -0,0 +1,37 @@
+"""Store spatial extent GeoJSON
+
+Revision ID: 122c83b4bb09
+Revises: b4e16b8e8b85
+Create Date: 2026-10-19 14:46:02.250118
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "122c83b4bb09"
+down_revision: Union[str, None] = "b4e16b8e8b85"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Filled in by the admin API when it starts
+    op.add_column(
+        "spatial_extents", sa.Column("geojson", sa.LargeBinary(), nullable=True)
+    )
+    op.add_column(
+        "spatial_extents",
+        sa.Column("geojson_simplified", sa.LargeBinary(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("spatial_extents", "geojson_simplified")
+    op.drop_column("spatial_extents", "geojson")
@@ -0,0 +1,49 @@
+"""Add collection aggregates
+
+Revision ID: 8e0b14e96323
+Revises: 122c83b4bb09
+Create Date: 2026-10-19 14:46:03.967453
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8e0b14e96323"
+down_revision: Union[str, None] = "122c83b4bb09"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Filled in by the admin API when it starts
+    op.create_table(
+        "collection_aggregates",
+        sa.Column("resource_id", sa.UUID(), nullable=False),
+        sa.Column("child_count", sa.Integer(), nullable=False),
+        sa.Column("start_year", sa.Integer(), nullable=True),
+        sa.Column("end_year", sa.Integer(), nullable=True),
+        sa.Column("bbox", postgresql.ARRAY(sa.Float()), nullable=True),
+        sa.Column("geometry", postgresql.JSONB(), nullable=True),
+        sa.Column("provider_ids", postgresql.ARRAY(sa.UUID()), nullable=False),
+        sa.Column("category_ids", postgresql.ARRAY(sa.UUID()), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["resource_id"],
+            ["resources.id"],
+            name=op.f("fk_collection_aggregates_resource_id_resources"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("resource_id", name=op.f("pk_collection_aggregates")),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("collection_aggregates")
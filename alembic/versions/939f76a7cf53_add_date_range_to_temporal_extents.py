@@ -0,0 +1,77 @@
+"""Add indexed date range to temporal extents
+
+Revision ID: 939f76a7cf53
+Revises: 2757a7ab3618
+Create Date: 2026-10-19 14:46:24.556270
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "939f76a7cf53"
+down_revision: Union[str, None] = "2757a7ab3618"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The date range cannot be computed for an end before the start
+    invalid = (
+        op.get_bind()
+        .execute(
+            sa.text(
+                "SELECT id FROM temporalextents "
+                "WHERE end_date < start_date ORDER BY id"
+            )
+        )
+        .scalars()
+        .all()
+    )
+    if invalid:
+        raise RuntimeError(
+            f"{len(invalid)} temporal extents end before they start, fix their "
+            f"start_date or end_date and run the migration again: "
+            + ", ".join(str(id) for id in invalid)
+        )
+    op.create_check_constraint(
+        op.f("ck_temporalextents_end_after_start"),
+        "temporalextents",
+        "end_date IS NULL OR end_date >= start_date",
+    )
+    op.add_column(
+        "temporalextents",
+        sa.Column(
+            "date_range",
+            postgresql.DATERANGE(),
+            sa.Computed("daterange(start_date, end_date, '[]')", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_temporalextents_date_range",
+        "temporalextents",
+        ["date_range"],
+        unique=False,
+        postgresql_using="gist",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_temporalextents_date_range",
+        table_name="temporalextents",
+        postgresql_using="gist",
+    )
+    op.drop_column("temporalextents", "date_range")
+    op.drop_constraint(
+        op.f("ck_temporalextents_end_after_start"),
+        "temporalextents",
+        type_="check",
+    )
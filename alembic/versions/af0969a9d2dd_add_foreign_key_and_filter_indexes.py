@@ -0,0 +1,65 @@
+"""Add indexes on foreign keys and filter columns
+
+Revision ID: af0969a9d2dd
+Revises: 939f76a7cf53
+Create Date: 2026-10-19 14:46:26.540215
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "af0969a9d2dd"
+down_revision: Union[str, None] = "939f76a7cf53"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, column)
+INDEXES = [
+    ("ix_spatial_extents_resource_id", "spatial_extents", "resource_id"),
+    ("ix_temporalextents_resource_id", "temporalextents", "resource_id"),
+    ("ix_resource_provider_provider_id", "resource_provider", "provider_id"),
+    ("ix_resource_category_category_id", "resource_category", "category_id"),
+    ("ix_examples_resource_id", "examples", "resource_id"),
+    ("ix_code_examples_resource_id", "code_examples", "resource_id"),
+    ("ix_code_examples_id", "code", "examples_id"),
+    ("ix_resources_type", "resources", "type"),
+    ("ix_resources_license_id", "resources", "license_id"),
+    (
+        "ix_spatial_extent_geometry_relation_geometry_id",
+        "spatial_extent_geometry_relation",
+        "geometry_id",
+    ),
+    ("ix_resource_relation_parent_id", "resource_relation", "parent_id"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Build the indexes concurrently so that running migrations on startup
+    # does not block writes on a populated catalog.
+    with op.get_context().autocommit_block():
+        for name, table, column in INDEXES:
+            op.create_index(
+                name,
+                table,
+                [column],
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
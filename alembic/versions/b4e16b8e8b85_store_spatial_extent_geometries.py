@@ -0,0 +1,66 @@
+"""Store spatial extent geometries
+
+Revision ID: b4e16b8e8b85
+Revises: d4b051c36fca
+Create Date: 2026-10-19 14:46:00.607184
+
+"""
+
+from typing import Sequence, Union
+
+import geoalchemy2
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b4e16b8e8b85"
+down_revision: Union[str, None] = "d4b051c36fca"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "spatial_extents",
+        sa.Column(
+            "geometry",
+            geoalchemy2.types.Geometry(
+                srid=4326, from_text="ST_GeomFromEWKT", name="geometry"
+            ),
+            nullable=True,
+        ),
+    )
+    # Existing extents are unioned once here, later writes are unioned by
+    # the application
+    op.execute(
+        """
+        UPDATE spatial_extents
+        SET geometry = unioned.geometry
+        FROM (
+            SELECT r.spatial_extent_id, ST_Union(ST_MakeValid(g.geometry)) AS geometry
+            FROM spatial_extent_geometry_relation r
+            JOIN geometries g ON g.id = r.geometry_id
+            GROUP BY r.spatial_extent_id
+        ) AS unioned
+        WHERE spatial_extents.id = unioned.spatial_extent_id
+        """
+    )
+    op.create_index(
+        "idx_spatial_extents_geometry",
+        "spatial_extents",
+        ["geometry"],
+        unique=False,
+        postgresql_using="gist",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "idx_spatial_extents_geometry",
+        table_name="spatial_extents",
+        postgresql_using="gist",
+    )
+    op.drop_column("spatial_extents", "geometry")
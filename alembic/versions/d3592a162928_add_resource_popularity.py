@@ -0,0 +1,49 @@
+"""Add resource popularity
+
+Revision ID: d3592a162928
+Revises: 8e0b14e96323
+Create Date: 2026-10-19 14:46:05.632317
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d3592a162928"
+down_revision: Union[str, None] = "8e0b14e96323"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "resource_popularity",
+        sa.Column("resource_id", sa.UUID(), nullable=False),
+        sa.Column("view_count", sa.BigInteger(), nullable=False),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["resource_id"],
+            ["resources.id"],
+            name=op.f("fk_resource_popularity_resource_id_resources"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("resource_id", name=op.f("pk_resource_popularity")),
+    )
+    op.create_index(
+        "ix_resource_popularity_score",
+        "resource_popularity",
+        [sa.text("score DESC")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_resource_popularity_score", table_name="resource_popularity")
+    op.drop_table("resource_popularity")
@@ -0,0 +1,46 @@
+"""Add spatial index on geometries
+
+Revision ID: d4b051c36fca
+Revises: af0969a9d2dd
+Create Date: 2026-10-19 14:45:51.841395
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d4b051c36fca"
+down_revision: Union[str, None] = "af0969a9d2dd"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The model has always declared this index, but the initial migration
+    # did not create it.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_geometries_geometry",
+            "geometries",
+            ["geometry"],
+            unique=False,
+            postgresql_using="gist",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "idx_geometries_geometry",
+            table_name="geometries",
+            postgresql_using="gist",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,58 @@
+"""Add resource sort indexes
+
+Revision ID: e1d66f411bb6
+Revises: d3592a162928
+Create Date: 2026-10-19 14:46:07.531874
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e1d66f411bb6"
+down_revision: Union[str, None] = "d3592a162928"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, columns), in the order of the search sort keys. Descending
+# orders are served by scanning the indexes backwards.
+INDEXES = [
+    ("ix_resources_title_id", ["title", "id"]),
+    ("ix_resources_updated_at_id", ["updated_at", "id"]),
+    (
+        "ix_resources_release_date_id",
+        [sa.text("coalesce(release_date, DATE '0001-01-01')"), "id"],
+    ),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Build the indexes concurrently so that running migrations on startup
+    # does not block writes on a populated catalog.
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(
+                name,
+                "resources",
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name="resources",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
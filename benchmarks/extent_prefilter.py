@@ -0,0 +1,64 @@
+"""Measures the in-memory spatial prefilter for feature searches.
+
+Builds the extent index from synthetic resource areas, then times how long
+it takes to find the candidate resources for a search, compared to the
+number of resources that are left for the exact checks in the database.
+
+Run with:
+    python -m benchmarks.extent_prefilter --resources 5000
+"""
+
+import argparse
+import random
+import time
+import uuid
+from statistics import median
+
+import shapely
+from shapely.geometry import Point, box
+
+from data_catalog_backend.config import settings
+from data_catalog_backend.services.helpers.spatial_index import ResourceAreas
+
+
+def _area(rng: random.Random):
+    # A few regions per resource, with detailed borders
+    parts = []
+    for _ in range(rng.randint(1, 3)):
+        x, y = rng.uniform(-170, 160), rng.uniform(-80, 70)
+        size = rng.uniform(0.5, 8)
+        parts.append(Point(x, y).buffer(size, quad_segs=64))
+    return shapely.union_all(parts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resources", type=int, default=5000)
+    parser.add_argument("--searches", type=int, default=200)
+    parser.add_argument(
+        "--tolerance", type=float, default=settings.spatial_prefilter_tolerance
+    )
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    areas = [(uuid.uuid4(), _area(rng).wkb) for _ in range(args.resources)]
+
+    start = time.perf_counter()
+    index = ResourceAreas.from_rows(areas, [], args.tolerance)
+    print(
+        f"built index of {args.resources} areas in {time.perf_counter() - start:.2f} s"
+    )
+
+    timings, candidates = [], []
+    for _ in range(args.searches):
+        x, y = rng.uniform(-170, 160), rng.uniform(-80, 70)
+        features = [box(x, y, x + 2, y + 2), Point(x + 5, y)]
+        start = time.perf_counter()
+        candidates.append(len(index.candidates(features)))
+        timings.append(time.perf_counter() - start)
+    print(f"median lookup: {median(timings) * 1e6:.1f} us")
+    print(f"median candidates: {median(candidates):.0f} of {args.resources} resources")
+
+
+if __name__ == "__main__":
+    main()
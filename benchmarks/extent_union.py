@@ -0,0 +1,98 @@
+"""Measures repairing and unioning spatial extent geometries.
+
+Builds several hundred synthetic country polygons with detailed borders,
+some of them self-intersecting, and groups them into multi-country
+extents. Times unioning every extent in this process against unioning
+them in the geometry worker pool.
+
+Run with:
+    python -m benchmarks.extent_union --countries 400 --extents 200
+"""
+
+import argparse
+import math
+import os
+import random
+import time
+
+import shapely
+from shapely.geometry import Polygon
+
+from data_catalog_backend.config import settings
+from data_catalog_backend.services.helpers.geometry_processing import (
+    get_process_pool,
+    shutdown_process_pool,
+    union_geometries,
+)
+
+
+def _country(rng: random.Random, vertices: int) -> Polygon:
+    # A wavy ring with a noisy border around a random centre, so that
+    # neighbours overlap each other
+    x, y = rng.uniform(-20, 40), rng.uniform(-30, 30)
+    size = rng.uniform(1, 6)
+    waves, phase = rng.randint(3, 9), rng.uniform(0, 2 * math.pi)
+    ring = []
+    for i in range(vertices):
+        angle = 2 * math.pi * i / vertices
+        r = size * (0.85 + 0.1 * math.sin(waves * angle + phase))
+        r += rng.uniform(0, 0.01 * size)
+        ring.append((x + r * math.cos(angle), y + r * math.sin(angle)))
+    if rng.random() < 0.2:
+        # A bow tie, which needs repairing
+        ring[1], ring[2] = ring[2], ring[1]
+    return Polygon(ring)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--countries", type=int, default=400)
+    parser.add_argument("--vertices", type=int, default=2000)
+    parser.add_argument("--extents", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=16)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    countries = [_country(rng, args.vertices).wkb for _ in range(args.countries)]
+    invalid = sum(not shapely.from_wkb(wkb).is_valid for wkb in countries)
+    extents = [
+        (str(i), rng.sample(countries, rng.randint(2, 30))) for i in range(args.extents)
+    ]
+    print(
+        f"{args.countries} countries ({invalid} invalid), {args.extents} extents "
+        f"of {sum(len(members) for _, members in extents)} countries in total"
+    )
+
+    grid_size = settings.extent_grid_size
+    tolerance = settings.extent_simplify_tolerance
+    geojson_tolerance = settings.extent_geojson_simplify_tolerance
+
+    start = time.perf_counter()
+    serial = union_geometries(extents, grid_size, tolerance, geojson_tolerance)
+    print(f"serial: {time.perf_counter() - start:.2f} s")
+
+    workers = settings.geometry_workers or os.cpu_count()
+    pool = get_process_pool()
+    # Start the workers before timing
+    list(pool.map(abs, range(workers)))
+    start = time.perf_counter()
+    futures = [
+        pool.submit(
+            union_geometries,
+            extents[i : i + args.batch_size],
+            grid_size,
+            tolerance,
+            geojson_tolerance,
+        )
+        for i in range(0, len(extents), args.batch_size)
+    ]
+    parallel = [result for future in futures for result in future.result()]
+    print(f"pool of {workers} workers: {time.perf_counter() - start:.2f} s")
+    shutdown_process_pool()
+
+    assert [result.key for result in serial] == [result.key for result in parallel]
+    assert all(result.ewkb is not None for result in parallel)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Measures the throughput of a running server under concurrent load.
+
+Keeps ``--concurrency`` requests in flight for ``--seconds`` against the
+read-only public routes and reports requests per second and latency
+percentiles. Start the server with the settings to compare first, for
+example with different UVICORN_WORKERS, and seed its database with
+benchmarks.seed_catalog.
+
+Run with:
+    python -m benchmarks.http_load --url http://localhost:8000 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import itertools
+import time
+from statistics import quantiles
+
+import httpx
+
+PATHS = [
+    "/v1/resources/?per_page=10",
+    "/v1/resources/?per_page=10&types=DATASET",
+    "/v1/resources/?per_page=50&fields=title,type",
+    "/v1/categories/",
+    "/v1/providers/",
+    "/v1/licenses/",
+]
+
+
+async def worker(
+    client: httpx.AsyncClient,
+    paths: itertools.cycle,
+    deadline: float,
+    latencies: list[float],
+    errors: list[int],
+):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            response = await client.get(next(paths))
+            response.raise_for_status()
+        except httpx.HTTPError:
+            errors.append(1)
+            continue
+        latencies.append(time.perf_counter() - started)
+
+
+async def run(url: str, concurrency: int, seconds: float) -> None:
+    latencies: list[float] = []
+    errors: list[int] = []
+    paths = itertools.cycle(PATHS)
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        # Warm up the connections and the server before measuring
+        await asyncio.gather(*(client.get(path) for path in PATHS))
+        started = time.perf_counter()
+        deadline = started + seconds
+        await asyncio.gather(
+            *(
+                worker(client, paths, deadline, latencies, errors)
+                for _ in range(concurrency)
+            )
+        )
+        elapsed = time.perf_counter() - started
+
+    if len(latencies) < 2:
+        print(f"{len(latencies)} requests succeeded, {len(errors)} failed")
+        return
+    percentiles = quantiles(latencies, n=100)
+    print(f"{len(latencies) / elapsed:8.1f} requests/s, {len(errors)} errors")
+    for p in (50, 95, 99):
+        print(f"  p{p}: {percentiles[p - 1] * 1000:7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=30)
+    args = parser.parse_args()
+    asyncio.run(run(args.url, args.concurrency, args.seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Measures turning search result rows into a response body.
+
+Compares building a model per row and letting FastAPI validate the page
+again against the response_model, with validating the rows once as a list
+and encoding them directly, for growing page sizes.
+
+Run with:
+    python -m benchmarks.list_encoding
+"""
+
+import argparse
+import json
+import time
+import uuid
+from collections import namedtuple
+from statistics import median
+
+from data_catalog_backend.models import ResourceType, SpatialExtentType
+from data_catalog_backend.schemas.resource_query import (
+    ResourceQueryPage,
+    ResourceQueryResponse,
+    ResourceQuerySpatialResponse,
+    parse_fields,
+    resource_query_adapter,
+)
+
+# Stands in for a SQLAlchemy Row, which also has attribute access
+Row = namedtuple(
+    "Row",
+    [
+        "id",
+        "title",
+        "abstract",
+        "type",
+        "icon",
+        "has_spatial_extent",
+        "spatial_extent_type",
+        "covers_some",
+        "covers_all",
+        "intersects_some",
+        "intersects_all",
+    ],
+)
+
+
+def _rows(count: int) -> list[Row]:
+    return [
+        Row(
+            uuid.uuid4(),
+            f"Resource {i}",
+            "Daily soil moisture estimates for the whole continent " * 3,
+            ResourceType.Dataset.value,
+            "icon.svg",
+            True,
+            SpatialExtentType.Region.value,
+            True,
+            False,
+            True,
+            False,
+        )
+        for i in range(count)
+    ]
+
+
+def per_row_models(rows: list[Row]) -> bytes:
+    response = ResourceQueryResponse(
+        current_page=0,
+        total_pages=1,
+        data=[ResourceQuerySpatialResponse(**row._asdict()) for row in rows],
+    )
+    # What FastAPI does next with the returned model and its response_model
+    validated = ResourceQueryResponse.model_validate(response)
+    content = validated.model_dump(mode="json", exclude_none=True)
+    return json.dumps(content, separators=(",", ":")).encode()
+
+
+def validated_once(rows: list[Row], fields: tuple[str, ...] = ()) -> bytes:
+    data = resource_query_adapter(fields).validate_python(rows)
+    return ResourceQueryPage(0, 1, data, fields).json()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    fields = parse_fields("title,icon")
+    paths = {
+        "model per row": per_row_models,
+        "validated once": validated_once,
+        "validated once, 3 fields": lambda rows: validated_once(rows, fields),
+    }
+    print(f"{'per_page':>8}" + "".join(f"{name:>28}" for name in paths))
+    for per_page in [10, 100, 1000, 5000]:
+        rows = _rows(per_page)
+        assert json.loads(per_row_models(rows)) == json.loads(validated_once(rows))
+        line = f"{per_page:>8}"
+        for render in paths.values():
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                render(rows)
+                timings.append(time.perf_counter() - start)
+            seconds = median(timings)
+            line += f"{seconds * 1e3:>12.2f} ms {seconds / per_page * 1e6:>6.2f} us/row"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Measures the Python-side cost of a resource search, without a database.
+
+Every statement goes through the same steps as on a real engine: cache key
+generation, a lookup in the compiled cache and compilation on a cache miss.
+The database round trip itself is replaced by an empty result.
+
+Run with:
+    python -m benchmarks.resource_query_build
+"""
+
+import time
+import uuid
+from statistics import median
+from unittest.mock import MagicMock
+
+from geojson_pydantic import Feature
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.util import LRUCache
+
+from data_catalog_backend.config import settings
+from data_catalog_backend.schemas.resource_query import ResourceQueryRequest
+from data_catalog_backend.services.resource_service import ResourceService
+
+ITERATIONS = 2000
+
+
+class _Result:
+    def scalar(self):
+        return 0
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return []
+
+
+class CompilingSession:
+    """Stand-in for a Session that compiles like an Engine does."""
+
+    def __init__(self):
+        self.dialect = postgresql.psycopg2.dialect()
+        self.compiled_cache = LRUCache(500)
+
+    def execute(self, stmt, params=None):
+        compiled, extracted_params, _ = stmt._compile_w_cache(
+            self.dialect,
+            compiled_cache=self.compiled_cache,
+            column_keys=sorted(params or {}),
+        )
+        compiled.construct_params(params, extracted_parameters=extracted_params)
+        return _Result()
+
+
+def _square(x: float, y: float, size: float) -> Feature:
+    return Feature(
+        type="Feature",
+        properties={},
+        geometry={
+            "type": "Polygon",
+            "coordinates": [
+                [[x, y], [x + size, y], [x + size, y + size], [x, y + size], [x, y]]
+            ],
+        },
+    )
+
+
+REQUESTS = {
+    "no filters": ResourceQueryRequest(),
+    "tags + types": ResourceQueryRequest(
+        tags=["soil", "rain"], types=["DATASET", "API"]
+    ),
+    "categories + providers + years": ResourceQueryRequest(
+        categories=[uuid.uuid4(), uuid.uuid4()],
+        providers=[uuid.uuid4()],
+        years=["2015", "2016", "2017"],
+    ),
+    "features + spatial": ResourceQueryRequest(
+        features=[_square(10, 10, 2), _square(30, -5, 1)],
+        spatial=["REGION", "GLOBAL", "NON_SPATIAL"],
+    ),
+}
+
+
+def main():
+    # The in-memory spatial prefilter needs a database to load from, see
+    # benchmarks.extent_prefilter for its cost
+    settings.spatial_index_enabled = False
+    session = CompilingSession()
+    service = ResourceService(session, *[MagicMock() for _ in range(6)])
+
+    print(f"{'request':<34}{'median us/search':>18}")
+    for name, request in REQUESTS.items():
+        timings = []
+        for i in range(ITERATIONS):
+            start = time.perf_counter()
+            service.get_resources(i % 5, 10, request)
+            timings.append(time.perf_counter() - start)
+        print(f"{name:<34}{median(timings) * 1e6:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
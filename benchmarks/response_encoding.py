@@ -0,0 +1,155 @@
+"""Measures encoding and compressing a resource with a country-level geometry.
+
+Builds a resource response whose spatial extent is a multipolygon with
+detailed borders, then compares how long each way of rendering it takes
+and how large the body is with each content coding. The last renderer is
+the one GET /v1/resources/{id} uses.
+
+Run with:
+    python -m benchmarks.response_encoding --polygons 40 --vertices 2500
+"""
+
+import argparse
+import gzip
+import json
+import math
+import random
+import time
+import uuid
+import zlib
+from statistics import median
+
+import orjson
+
+import brotli
+import zstandard
+from shapely.geometry import MultiPolygon, Polygon
+
+from data_catalog_backend.models import ResourceType, SpatialExtentType
+from data_catalog_backend.schemas.resource import ResourceResponse
+from data_catalog_backend.schemas.spatial_extent import SpatialExtentResponse
+from data_catalog_backend.services.helpers.geometry_processing import (
+    feature_collection_json,
+)
+from data_catalog_backend.utils.json_splice import dump_json_without, splice_json
+
+
+def _country(rng: random.Random, polygons: int, vertices: int) -> MultiPolygon:
+    # A mainland with a detailed coast and a number of islands
+    parts = []
+    for n in range(polygons):
+        x, y = 30 + rng.uniform(-5, 5), rng.uniform(-5, 5)
+        size = 4 if n == 0 else rng.uniform(0.05, 0.5)
+        ring = []
+        for i in range(vertices):
+            angle = 2 * math.pi * i / vertices
+            r = size * (1 + 0.05 * rng.random())
+            ring.append((x + r * math.cos(angle), y + r * math.sin(angle)))
+        parts.append(Polygon(ring))
+    return MultiPolygon(parts)
+
+
+def _resource(extent_geometry: dict) -> dict:
+    return {
+        "id": uuid.uuid4(),
+        "title": "Soil moisture",
+        "abstract": "Daily soil moisture estimates",
+        "html_content": "<p>Soil moisture</p>" * 20,
+        "documentation_url": "https://example.com/docs",
+        "maintenance_and_update_frequency": "daily",
+        "keywords": ["soil", "moisture", "drought"],
+        "type": ResourceType.Dataset,
+        "license": None,
+        "providers": [],
+        "spatial_extent": [
+            {
+                "id": uuid.uuid4(),
+                "type": SpatialExtentType.Region,
+                "region": "Kenya",
+                "geometry": extent_geometry,
+            }
+        ],
+    }
+
+
+def _time(render, repeat: int) -> tuple[float, bytes]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = render()
+        timings.append(time.perf_counter() - start)
+    return median(timings), body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--polygons", type=int, default=40)
+    parser.add_argument("--vertices", type=int, default=2500)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    country = _country(random.Random(42), args.polygons, args.vertices)
+    geojson = feature_collection_json(country)
+    stored = zlib.compress(geojson)
+    data = _resource(json.loads(geojson))
+    model = ResourceResponse.model_validate(data)
+    print(f"multipolygon of {args.polygons * args.vertices} vertices")
+
+    def fastapi_default():
+        # What FastAPI does with a returned model and a response_model:
+        # validate it again, dump it in json mode, render with json.dumps
+        validated = ResourceResponse.model_validate(model)
+        content = validated.model_dump(mode="json", exclude_none=True)
+        return json.dumps(
+            content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode()
+
+    def fastapi_orjson():
+        # The same with ORJSONResponse, the response class of the /v1 router
+        validated = ResourceResponse.model_validate(model)
+        content = validated.model_dump(mode="json", exclude_none=True)
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+    def spliced():
+        extents = [
+            splice_json(
+                dump_json_without(SpatialExtentResponse, extent, {"geometry"}),
+                "geometry",
+                zlib.decompress(stored),
+            )
+            for extent in model.spatial_extent
+        ]
+        return splice_json(
+            dump_json_without(ResourceResponse, model, {"spatial_extent"}),
+            "spatial_extent",
+            b"[" + b",".join(extents) + b"]",
+        )
+
+    renderers = {
+        "fastapi default": fastapi_default,
+        "model_dump_json": lambda: model.model_dump_json(exclude_none=True).encode(),
+        "fastapi ORJSONResponse": fastapi_orjson,
+        "stored GeoJSON spliced": spliced,
+    }
+    expected = json.loads(fastapi_default())
+    for name, render in renderers.items():
+        seconds, body = _time(render, args.repeat)
+        assert json.loads(body) == expected, name
+        print(f"{name:>24}: {seconds * 1e3:7.1f} ms, {len(body) / 1e6:.2f} MB")
+
+    body = fastapi_default()
+    codings = {
+        "gzip 6": lambda: gzip.compress(body, 6),
+        "br 4": lambda: brotli.compress(body, quality=4),
+        "zstd 3": lambda: zstandard.ZstdCompressor(level=3).compress(body),
+    }
+    for name, compress in codings.items():
+        seconds, compressed = _time(compress, args.repeat)
+        print(
+            f"{name:>24}: {seconds * 1e3:7.1f} ms, {len(compressed) / 1e6:.2f} MB "
+            f"({len(compressed) / len(body):.0%})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Runs EXPLAIN ANALYZE for the resource search against a database.
+
+Uses the connection settings from the environment (see .env.example) and
+picks filter values from the data that is already in the catalog. For each
+search it prints the execution time, the number of matches with a digest of
+the matching ids, and the indexes the plan uses. Use benchmarks.seed_catalog
+to fill an empty database with a synthetic catalog first.
+
+Run with:
+    python -m benchmarks.search_plans
+"""
+
+import hashlib
+import re
+import uuid
+
+from sqlalchemy import select, Connection
+
+from data_catalog_backend.database import engine
+from data_catalog_backend.models import (
+    Category,
+    Provider,
+    ResourceType,
+    SpatialExtentRequestType,
+)
+from data_catalog_backend.schemas.resource_query import ResourceQueryRequest
+from data_catalog_backend.services.helpers.resource_queries import ResourceQuery
+
+
+def explain(connection: Connection, stmt, params: dict, analyze: bool = True) -> str:
+    """Returns the EXPLAIN output of a statement with bound parameters."""
+    compiled = stmt.params(**params).compile(
+        dialect=connection.dialect, compile_kwargs={"render_postcompile": True}
+    )
+    # exec_driver_sql skips the type bind processors, and psycopg2 cannot
+    # adapt uuid.UUID on its own
+    params = {
+        key: str(value) if isinstance(value, uuid.UUID) else value
+        for key, value in compiled.params.items()
+    }
+    options = "ANALYZE, BUFFERS" if analyze else "COSTS OFF"
+    rows = connection.exec_driver_sql(f"EXPLAIN ({options}) {compiled}", params).all()
+    return "\n".join(row[0] for row in rows)
+
+
+def index_names(plan: str) -> list[str]:
+    return sorted(set(re.findall(r"(?:using|on) ((?:ix|idx|pk)_\w+)", plan)))
+
+
+def search_requests(connection: Connection) -> dict[str, ResourceQueryRequest]:
+    categories = connection.execute(select(Category.id).limit(3)).scalars().all()
+    providers = connection.execute(select(Provider.id).limit(3)).scalars().all()
+    return {
+        "no filters": ResourceQueryRequest(),
+        "types": ResourceQueryRequest(types=[ResourceType.Dataset]),
+        "categories": ResourceQueryRequest(categories=categories),
+        "providers": ResourceQueryRequest(providers=providers),
+        "years": ResourceQueryRequest(years=["2015", "2016"]),
+        "spatial types": ResourceQueryRequest(
+            spatial=[SpatialExtentRequestType.Global]
+        ),
+        "tags": ResourceQueryRequest(tags=["soil"]),
+    }
+
+
+def result_digest(connection: Connection, stmt, params: dict) -> str:
+    """Returns the number of matches and a digest of the matching ids.
+
+    Comparing the output before and after a change to ResourceQuery on the
+    same catalog shows whether the change returns the same resources.
+    """
+    ids = sorted(
+        str(row.id)
+        for row in connection.execute(stmt, {**params, "offset": 0, "limit": None})
+    )
+    return f"{len(ids)} {hashlib.sha1(''.join(ids).encode()).hexdigest()[:10]}"
+
+
+def main():
+    query = ResourceQuery()
+    with engine.connect() as connection:
+        for name, request in search_requests(connection).items():
+            stmt, _ = query.statements(request)
+            params = query.parameters(request, 0, 10)
+            plan = explain(connection, stmt, params)
+            execution = re.search(r"Execution Time: ([\d.]+) ms", plan)
+            print(
+                f"{name:<16}{execution.group(1):>10} ms  "
+                f"{result_digest(connection, stmt, params):<18}"
+                f"{', '.join(index_names(plan))}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""Fills a database with a synthetic catalog for the benchmarks.
+
+Resources get many categories and providers each, a temporal extent and
+either a global or a regional spatial extent. Only run this against a
+scratch database: the connection settings come from the environment, the
+same way the application reads them.
+
+Run with:
+    python -m benchmarks.seed_catalog --resources 5000
+"""
+
+import argparse
+import random
+import uuid
+from datetime import date
+
+from geoalchemy2.shape import from_shape
+from shapely.geometry import box
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from data_catalog_backend.database import engine
+from data_catalog_backend.models import (
+    Category,
+    Geometry,
+    License,
+    Provider,
+    Resource,
+    ResourceCategory,
+    ResourceProvider,
+    ResourceType,
+    SpatialExtent,
+    SpatialExtentType,
+    TemporalExtent,
+    spatial_extent_geometry_relation,
+)
+from data_catalog_backend.services.helpers.extent_geometries import (
+    extent_geometry_updater,
+)
+
+CREATED_BY = "benchmark"
+WORDS = ["soil", "rain", "crop", "flood", "forest", "yield", "weather", "water"]
+
+
+def _rows(count: int, make) -> list[dict]:
+    return [make(i) for i in range(count)]
+
+
+def seed(
+    session: Session,
+    resources: int,
+    categories: int,
+    providers: int,
+    geometries: int,
+    categories_per_resource: int,
+    providers_per_resource: int,
+):
+    rng = random.Random(42)
+    prefix = uuid.uuid4().hex[:6]
+
+    category_rows = _rows(
+        categories,
+        lambda i: {
+            "id": uuid.uuid4(),
+            "title": f"{prefix} category {i}",
+            "abstract": "benchmark category",
+            "icon": "Public",
+            "created_by": CREATED_BY,
+        },
+    )
+    provider_rows = _rows(
+        providers,
+        lambda i: {
+            "id": uuid.uuid4(),
+            "name": f"{prefix} provider {i}",
+            "short_name": f"{prefix}-p{i}",
+            "provider_url": "https://example.com",
+            "description": "benchmark provider",
+            "created_by": CREATED_BY,
+        },
+    )
+    license_id = uuid.uuid4()
+
+    def geometry_row(i):
+        x, y = rng.uniform(-170, 160), rng.uniform(-80, 70)
+        return {
+            "id": uuid.uuid4(),
+            "name": f"{prefix} region {i}",
+            "geometry": from_shape(box(x, y, x + rng.uniform(1, 10), y + 5), 4326),
+            "created_by": CREATED_BY,
+        }
+
+    geometry_rows = _rows(geometries, geometry_row)
+
+    resource_rows = _rows(
+        resources,
+        lambda i: {
+            "id": uuid.uuid4(),
+            "title": f"{prefix} {rng.choice(WORDS)} resource {i}",
+            "abstract": f"A {rng.choice(WORDS)} dataset about {rng.choice(WORDS)}",
+            "keywords": rng.sample(WORDS, 3),
+            "type": rng.choice(list(ResourceType)).value,
+            "license_id": license_id,
+            "created_by": CREATED_BY,
+        },
+    )
+
+    resource_categories, resource_providers = [], []
+    temporal_extents, spatial_extents, extent_geometries = [], [], []
+    for resource in resource_rows:
+        chosen = rng.sample(category_rows, categories_per_resource)
+        for n, category in enumerate(chosen):
+            resource_categories.append(
+                {
+                    "resource_id": resource["id"],
+                    "category_id": category["id"],
+                    "is_main_category": n == 0,
+                    "created_by": CREATED_BY,
+                }
+            )
+        for provider in rng.sample(provider_rows, providers_per_resource):
+            resource_providers.append(
+                {
+                    "resource_id": resource["id"],
+                    "provider_id": provider["id"],
+                    "role": "",
+                    "created_by": CREATED_BY,
+                }
+            )
+        start_year = rng.randint(1990, 2020)
+        temporal_extents.append(
+            {
+                "id": uuid.uuid4(),
+                "resource_id": resource["id"],
+                "start_date": date(start_year, 1, 1),
+                "end_date": rng.choice(
+                    [None, date(min(start_year + rng.randint(0, 10), 2024), 12, 31)]
+                ),
+                "created_by": CREATED_BY,
+            }
+        )
+        extent_id = uuid.uuid4()
+        is_global = rng.random() < 0.2
+        spatial_extents.append(
+            {
+                "id": extent_id,
+                "resource_id": resource["id"],
+                "type": (
+                    SpatialExtentType.Global if is_global else SpatialExtentType.Region
+                ).value,
+                "created_by": CREATED_BY,
+            }
+        )
+        if not is_global:
+            for geometry in rng.sample(geometry_rows, rng.randint(1, 3)):
+                extent_geometries.append(
+                    {"spatial_extent_id": extent_id, "geometry_id": geometry["id"]}
+                )
+
+    session.execute(
+        insert(License),
+        [{"id": license_id, "name": f"{prefix} license", "created_by": CREATED_BY}],
+    )
+    for model, rows in [
+        (Category, category_rows),
+        (Provider, provider_rows),
+        (Geometry, geometry_rows),
+        (Resource, resource_rows),
+        (ResourceCategory, resource_categories),
+        (ResourceProvider, resource_providers),
+        (TemporalExtent, temporal_extents),
+        (SpatialExtent, spatial_extents),
+    ]:
+        session.execute(insert(model), rows)
+    if extent_geometries:
+        session.execute(insert(spatial_extent_geometry_relation), extent_geometries)
+    session.commit()
+    # Store the extent geometries the way the application does after writes
+    extent_geometry_updater.update(session, [row["id"] for row in spatial_extents])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resources", type=int, default=2000)
+    parser.add_argument("--categories", type=int, default=40)
+    parser.add_argument("--providers", type=int, default=40)
+    parser.add_argument("--geometries", type=int, default=200)
+    parser.add_argument("--categories-per-resource", type=int, default=8)
+    parser.add_argument("--providers-per-resource", type=int, default=6)
+    args = parser.parse_args()
+
+    with Session(engine) as session:
+        seed(
+            session,
+            resources=args.resources,
+            categories=args.categories,
+            providers=args.providers,
+            geometries=args.geometries,
+            categories_per_resource=args.categories_per_resource,
+            providers_per_resource=args.providers_per_resource,
+        )
+    print(f"Seeded {args.resources} resources")
+
+
+if __name__ == "__main__":
+    main()
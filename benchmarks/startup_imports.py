@@ -0,0 +1,94 @@
+"""Measures how long importing the application takes for each API surface.
+
+Imports data_catalog_backend.__main__ in a fresh interpreter with
+``-X importtime`` for the public API, the admin API and both, and reports
+the median total import time and the packages that took longest. Nothing
+connects to the database, as the engine only connects on first use.
+
+Run with:
+    python -m benchmarks.startup_imports --repeat 5
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from statistics import median
+
+SURFACES = {
+    "public": {"INCLUDE_PUBLIC_API": "true", "INCLUDE_ADMIN_API": "false"},
+    "admin": {"INCLUDE_PUBLIC_API": "false", "INCLUDE_ADMIN_API": "true"},
+    "both": {"INCLUDE_PUBLIC_API": "true", "INCLUDE_ADMIN_API": "true"},
+}
+
+# Packages worth watching, by the name of their top-level module
+PACKAGES = [
+    "alembic",
+    "fastapi",
+    "geoalchemy2",
+    "geojson_pydantic",
+    "jwt",
+    "numpy",
+    "pydantic",
+    "shapely",
+    "sqlalchemy",
+    "data_catalog_backend.routes.admin",
+    "data_catalog_backend.routes.v1",
+]
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_times(env: dict[str, str]) -> dict[str, float]:
+    """Returns the cumulative import time in ms of the watched packages, and
+    of the application as a whole under "total"."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            "import data_catalog_backend.__main__",
+        ],
+        env={
+            **os.environ,
+            **env,
+            "RUN_MIGRATIONS": "false",
+            "LOG_LEVEL": "WARNING",
+        },
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for match in LINE.finditer(result.stderr):
+        cumulative, module = int(match.group(2)), match.group(4)
+        # A module is only imported once, so its first entry is the one
+        if module in PACKAGES and module not in times:
+            times[module] = cumulative / 1000
+        if module == "data_catalog_backend.__main__":
+            times["total"] = cumulative / 1000
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for surface, env in SURFACES.items():
+        runs = defaultdict(list)
+        for _ in range(args.repeat):
+            for module, ms in import_times(env).items():
+                runs[module].append(ms)
+        print(f"{surface}: {median(runs.pop('total')):.0f} ms in total")
+        for module, times in sorted(runs.items(), key=lambda item: -median(item[1])):
+            print(f"  {module:>36}: {median(times):6.0f} ms")
+        missing = [module for module in PACKAGES if module not in runs]
+        print(f"  {'not imported':>36}: {', '.join(missing) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
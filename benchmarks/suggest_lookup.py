@@ -0,0 +1,66 @@
+"""Measures lookups in the prefix index behind /v1/suggest.
+
+Builds the index from synthetic titles, keywords and region names, then
+times lookups of prefixes of the lengths a user types in a search box.
+
+Run with:
+    python -m benchmarks.suggest_lookup --resources 20000
+"""
+
+import argparse
+import random
+import string
+import time
+from statistics import median
+
+from data_catalog_backend.schemas.suggestion import SuggestionResponse, SuggestionType
+from data_catalog_backend.services.helpers.suggestions import Suggestions
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resources", type=int, default=20000)
+    parser.add_argument("--lookups", type=int, default=10000)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    vocabulary = [_word(rng) for _ in range(2000)]
+    entries = [
+        SuggestionResponse(
+            text=" ".join(rng.choices(vocabulary, k=rng.randint(2, 6))).title(),
+            type=SuggestionType.Resource,
+            resources=1,
+        )
+        for _ in range(args.resources)
+    ]
+    entries += [
+        SuggestionResponse(
+            text=word, type=SuggestionType.Keyword, resources=rng.randint(1, 500)
+        )
+        for word in vocabulary
+    ]
+
+    start = time.perf_counter()
+    index = Suggestions.from_entries(entries)
+    print(
+        f"built index of {len(index.entries)} entries and {len(index.keys)} keys "
+        f"in {time.perf_counter() - start:.2f} s"
+    )
+
+    for length in (1, 2, 3, 5, 8):
+        timings = []
+        for _ in range(args.lookups):
+            prefix = rng.choice(vocabulary)[:length]
+            start = time.perf_counter()
+            index.lookup(prefix, args.limit)
+            timings.append(time.perf_counter() - start)
+        print(f"prefix of {length}: median {median(timings) * 1e6:6.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,22 @@
+import asyncio
 import logging
 import logging.config
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from prometheus_fastapi_instrumentator import Instrumentator
 
-from data_catalog_backend import migrate
+from data_catalog_backend.compression import CompressionMiddleware
 from data_catalog_backend.config import settings
-from data_catalog_backend.routes.admin import router as admin_router
-from data_catalog_backend.routes.v1 import router as public_router
+from data_catalog_backend.database import USE_PRIMARY, SessionLocal, replica_monitor
+from data_catalog_backend.readiness import readiness
+from data_catalog_backend.recycling import WorkerRecycleMiddleware
+from data_catalog_backend.routes.health_routes import router as health_router
 
 logging.config.dictConfig(settings.logging_config)
 logger = logging.getLogger(__name__)
@@ -16,27 +25,151 @@ logger.info(f"Starting public api: {settings.include_public_api}")
 logger.info(f"Starting admin api: {settings.include_admin_api}")
 
 
+@asynccontextmanager
+async def lifespan(api: FastAPI):
+    # Helpers are imported only for the enabled APIs, whose routers have
+    # already loaded them
+    if settings.include_admin_api:
+        from data_catalog_backend.services.helpers.collection_aggregates import (
+            refresh_missing_collection_aggregates,
+        )
+        from data_catalog_backend.services.helpers.extent_geometries import (
+            extent_geometry_updater,
+        )
+
+        try:
+            with SessionLocal() as session:
+                session.info[USE_PRIMARY] = True
+                # Encodes the GeoJSON of extents stored before it was kept
+                extent_geometry_updater.schedule_missing(session)
+                refresh_missing_collection_aggregates(session)
+        except Exception as e:
+            logger.warning(f"Could not check the stored extents and aggregates: {e}")
+    stop_warmup = threading.Event()
+    if settings.include_admin_api or settings.include_public_api:
+        from data_catalog_backend.warmup import warm_up
+
+        # The server takes requests while warming up, but only reports ready
+        # on /readyz once it is done
+        warmup = asyncio.create_task(
+            asyncio.to_thread(warm_up, settings.include_public_api, stop_warmup)
+        )
+    else:
+        readiness.mark_warmed_up()
+        warmup = None
+    yield
+    stop_warmup.set()
+    if warmup is not None:
+        try:
+            await asyncio.wait_for(
+                warmup, timeout=settings.warmup_shutdown_timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            logger.warning("Shutting down before the warmup step in progress finished")
+    if settings.include_public_api:
+        from data_catalog_backend.services.helpers.view_counts import view_counter
+
+        # Write the views counted since the last flush
+        view_counter.shutdown()
+    if settings.include_admin_api:
+        # Finish scheduled extent geometry updates before stopping their workers
+        extent_geometry_updater.shutdown()
+    # The geometry worker pool only runs if something imported its module
+    geometry_processing = sys.modules.get(
+        "data_catalog_backend.services.helpers.geometry_processing"
+    )
+    if geometry_processing is not None:
+        geometry_processing.shutdown_process_pool()
+    replica_monitor.shutdown()
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        from prometheus_client import multiprocess
+
+        # Drops the live gauges of this worker from the shared metrics
+        multiprocess.mark_process_dead(os.getpid())
+
+
 def get_application() -> FastAPI:
-    api = FastAPI(root_path=settings.api_root_path)
+    api = FastAPI(root_path=settings.api_root_path, lifespan=lifespan)
+    api.include_router(health_router)
+    # Only the routers of the enabled APIs are imported, along with the
+    # services and libraries they need
     if settings.include_admin_api:
+        from data_catalog_backend.routes.admin import router as admin_router
+
         api.include_router(admin_router)
 
     if settings.include_public_api:
+        from data_catalog_backend.routes.v1 import router as public_router
+
         api.include_router(public_router)
 
+    if settings.compression_enabled:
+        api.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.compression_minimum_size,
+            gzip_level=settings.compression_gzip_level,
+            brotli_quality=settings.compression_brotli_quality,
+            zstd_level=settings.compression_zstd_level,
+        )
+
+    if settings.worker_max_requests > 0:
+        if settings.worker_count > 1:
+            api.add_middleware(
+                WorkerRecycleMiddleware,
+                max_requests=settings.worker_max_requests,
+                jitter=settings.worker_max_requests_jitter,
+            )
+        else:
+            logger.warning(
+                "WORKER_MAX_REQUESTS is ignored with a single worker, as "
+                "replacing the only worker would stop the server"
+            )
+
     logging.basicConfig(level=logging.INFO)
     Instrumentator().instrument(api).expose(api, include_in_schema=False)
 
     return api
 
 
+def prepare_multiprocess_metrics() -> None:
+    """Lets /metrics of every worker report the metrics of all workers.
+
+    Workers write their metrics to files in PROMETHEUS_MULTIPROC_DIR, a
+    new temporary directory unless one is given. Must run before the
+    workers start.
+    """
+    directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if directory:
+        # Files of an earlier run would be added to the new metrics
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory)
+    else:
+        directory = tempfile.mkdtemp(prefix="prometheus-")
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = directory
+    logger.info(f"Workers share their metrics through {directory}")
+
+
+# Set once the migrations have run, so that the workers and reloaded
+# processes that the server below starts, which import this module again,
+# do not run them again
+MIGRATIONS_DONE = "DATA_CATALOG_MIGRATIONS_DONE"
+
 if settings.run_migrations:
-    migrate.run_migrations(
-        schemas=[settings.postgres_schema],
-        connection_string=settings.database_connection,
-        script_location=settings.alembic_directory,
-        alembic_file=settings.alembic_file,
-    )
+    if os.environ.get(MIGRATIONS_DONE):
+        logger.info("Migrations already ran in the server process")
+    else:
+        from data_catalog_backend import migrate
+
+        migrate.run_migrations(
+            schemas=[settings.postgres_schema],
+            connection_string=settings.database_connection,
+            script_location=settings.alembic_directory,
+            alembic_file=settings.alembic_file,
+        )
+        os.environ[MIGRATIONS_DONE] = "true"
+
+if __name__ == "__main__" and settings.worker_count > 1:
+    prepare_multiprocess_metrics()
 
 app = get_application()
 
@@ -50,4 +183,8 @@ if __name__ == "__main__" and (
         host=settings.uvicorn_host,
         port=settings.uvicorn_port,
         reload=settings.uvicorn_reload,
+        workers=settings.worker_count,
+        loop=settings.uvicorn_loop,
+        http=settings.uvicorn_http,
+        timeout_graceful_shutdown=settings.uvicorn_timeout_graceful_shutdown,
     )
@@ -1,3 +1,5 @@
+import os
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -8,6 +10,18 @@ class Settings(BaseSettings):
     uvicorn_host: str = "0.0.0.0"
     uvicorn_reload: bool = True
     uvicorn_proxy_headers: bool = False
+    # Worker processes, 0 for one per CPU. Reload always runs one. Event
+    # loop and HTTP parser "auto" use uvloop and httptools when the server
+    # extra is installed.
+    uvicorn_workers: int = 1
+    uvicorn_loop: str = "auto"
+    uvicorn_http: str = "auto"
+    uvicorn_timeout_graceful_shutdown: int = 30
+    # A worker is replaced after handling max_requests plus up to jitter
+    # requests, 0 to keep it running. Ignored with a single worker, which
+    # the server would not replace.
+    worker_max_requests: int = 0
+    worker_max_requests_jitter: int = 0
     api_root_path: str = ""
     api_description: str = ""
     api_domain: str = "localhost"
@@ -20,6 +34,91 @@ class Settings(BaseSettings):
     postgres_host: str = "localhost"
     postgres_port: str = "5432"
     postgres_schema: str = "public"
+    # Pooled connections per worker and database. A connection budget is the
+    # most connections all workers may open to each database together, and
+    # replaces the pool size and overflow with an equal share per worker.
+    database_pool_size: int = 20
+    database_max_overflow: int = 10
+    database_connection_budget: int = 0
+    # Seconds to wait for a new database connection before giving up
+    database_connect_timeout_seconds: int = 10
+
+    # Comma separated list of read replicas as host or host:port
+    postgres_replica_hosts: str = ""
+    replica_max_lag_seconds: float = 5.0
+    replica_check_interval_seconds: float = 5.0
+
+    # Normalization of the geometries sent with a search request. The grid
+    # size is in degrees; features with more vertices than the budget are
+    # simplified, and a request may not exceed the maximum after that.
+    feature_grid_size: float = 0.00001
+    feature_vertex_budget: int = 1000
+    feature_max_vertices: int = 10000
+    feature_cache_size: int = 1024
+
+    # In-memory spatial indexes for location lookups. They are rebuilt when
+    # a check, at most every refresh interval, finds changed tables.
+    spatial_index_enabled: bool = True
+    spatial_index_refresh_seconds: float = 30.0
+    spatial_index_tolerance: float = 0.0001
+    # The feature search prefilter only rules out resources, so a coarser
+    # tolerance keeps it fast without changing results
+    spatial_prefilter_tolerance: float = 0.01
+
+    # In-memory prefix index behind /v1/suggest, rebuilt like the spatial
+    # indexes when a check finds changed tables
+    suggest_refresh_seconds: float = 30.0
+
+    # Worker processes for geometry imports and processing, 0 for one per CPU
+    geometry_workers: int = 0
+    # Largest file accepted by the bulk geometry import, in bytes
+    geometry_import_max_bytes: int = 2 * 1024**3
+    # Stored spatial extent geometries are unioned on this grid and
+    # simplified with this tolerance, 0 to keep them exact
+    extent_grid_size: float = 0.0
+    extent_simplify_tolerance: float = 0.0
+    # Tolerance of the simplified GeoJSON served with ?simplified=true
+    extent_geojson_simplify_tolerance: float = 0.01
+
+    # Most relations followed for the ancestors or descendants of a resource
+    resource_lineage_max_depth: int = 10
+
+    # Startup warmup, until which a worker is not ready on /readyz. Pooled
+    # connections are opened to each database, and the common searches and
+    # the most recently updated resources are read once.
+    warmup_enabled: bool = True
+    warmup_connections: int = 5
+    warmup_hot_resources: int = 20
+    # Seconds shutdown waits for an unfinished warmup, which stops after
+    # the step it is running
+    warmup_shutdown_timeout_seconds: float = 15.0
+
+    # Views of GET /v1/resources/{id} are counted in memory and written every
+    # flush interval. They rank resources by popularity, where a view counts
+    # half as much after each half-life. Changing the half-life only affects
+    # views counted afterwards.
+    view_counts_enabled: bool = True
+    view_counts_flush_seconds: float = 30.0
+    view_counts_max_pending: int = 10000
+    popularity_half_life_days: float = 30.0
+
+    # Readiness on /readyz. The database and PostGIS are probed over a
+    # dedicated connection at most once per cache interval. A worker with at
+    # least max_pool_usage of its pooled connections in use is not ready.
+    # A public API worker is not ready while no replica is usable, unless
+    # require_replica is off and it may fall back to the primary.
+    readiness_cache_seconds: float = 5.0
+    readiness_probe_timeout_seconds: int = 2
+    readiness_max_pool_usage: float = 1.0
+    readiness_require_replica: bool = True
+
+    # Response compression, negotiated with Accept-Encoding. Brotli and zstd
+    # need the compression extra, gzip is always available.
+    compression_enabled: bool = True
+    compression_minimum_size: int = 1024
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+    compression_zstd_level: int = 3
 
     run_migrations: bool = False
     alembic_directory: str = "./alembic"
@@ -43,12 +142,41 @@ class Settings(BaseSettings):
         else:
             return f"https://{self.api_domain}{self.api_root_path}"
 
+    @property
+    def worker_count(self) -> int:
+        if self.uvicorn_reload:
+            return 1
+        return self.uvicorn_workers or os.cpu_count() or 1
+
+    @property
+    def database_pool_limits(self) -> tuple[int, int]:
+        """Returns the pool size and overflow of each worker's engines."""
+        if self.database_connection_budget <= 0:
+            return self.database_pool_size, self.database_max_overflow
+        return max(1, self.database_connection_budget // self.worker_count), 0
+
     @property
     def database_connection(self):
+        return self._connection_string(self.postgres_host, self.postgres_port)
+
+    @property
+    def replica_database_connections(self) -> list[str]:
+        connections = []
+        for replica in self.postgres_replica_hosts.split(","):
+            replica = replica.strip()
+            if not replica:
+                continue
+            host, _, port = replica.partition(":")
+            connections.append(
+                self._connection_string(host, port or self.postgres_port)
+            )
+        return connections
+
+    def _connection_string(self, host: str, port: str) -> str:
         return (
             f"postgresql://{self.postgres_user}:"
-            f"{self.postgres_password}@{self.postgres_host}:"
-            f"{self.postgres_port}/{self.postgres_db}?"
+            f"{self.postgres_password}@{host}:"
+            f"{port}/{self.postgres_db}?"
             f"options=-csearch_path={self.postgres_schema}"
         )
 
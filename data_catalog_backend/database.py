@@ -1,16 +1,181 @@
+import logging
+import random
+import threading
+import time
 import uuid
 from datetime import datetime
-from typing import Any
+from typing import Any, Optional
 
-from sqlalchemy import create_engine, MetaData
+from sqlalchemy import create_engine, event, MetaData, text, Engine
 from sqlalchemy.dialects import postgresql
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.orm import sessionmaker, DeclarativeBase, Session
+from sqlalchemy.sql.selectable import SelectBase
 
 from data_catalog_backend.config import settings
 
+logger = logging.getLogger(__name__)
 
-engine = create_engine(settings.database_connection, pool_pre_ping=True, pool_size=20)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Key in Session.info that pins a session to the primary database
+USE_PRIMARY = "use_primary"
+
+pool_size, max_overflow = settings.database_pool_limits
+connect_args = {"connect_timeout": settings.database_connect_timeout_seconds}
+engine = create_engine(
+    settings.database_connection,
+    pool_pre_ping=True,
+    pool_size=pool_size,
+    max_overflow=max_overflow,
+    connect_args=connect_args,
+)
+replica_engines = [
+    create_engine(
+        connection,
+        pool_pre_ping=True,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        connect_args=connect_args,
+    )
+    for connection in settings.replica_database_connections
+]
+
+REPLICA_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+    """
+)
+
+
+class ReplicaMonitor:
+    """Keeps track of replica health and replication lag.
+
+    The lag of every replica is measured on a background thread once per
+    ``check_interval`` seconds, so routing a session only reads the last
+    result and a slow replica never delays a request. The thread starts
+    on first use. Replicas count as unreachable until they were checked.
+    """
+
+    def __init__(
+        self,
+        engines: list[Engine],
+        max_lag_seconds: float,
+        check_interval: float,
+    ):
+        self.engines = engines
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._status: dict[Engine, Optional[float]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _measure_lag(self, replica: Engine) -> Optional[float]:
+        try:
+            with replica.connect() as connection:
+                lag = connection.execute(REPLICA_LAG_QUERY).scalar()
+                return float(lag or 0)
+        except Exception as e:
+            logger.warning(f"Replica {replica.url.host} is unavailable: {e}")
+            return None
+
+    def check(self) -> None:
+        """Measures the lag of every replica."""
+        for replica in self.engines:
+            lag = self._measure_lag(replica)
+            with self._lock:
+                self._status[replica] = lag
+            if lag is not None and lag > self.max_lag_seconds:
+                logger.warning(
+                    f"Replica {replica.url.host} is {lag:.1f}s behind, using primary"
+                )
+
+    def _run(self) -> None:
+        self.check()
+        while not self._stop.wait(self.check_interval):
+            self.check()
+
+    def lag(self, replica: Engine) -> Optional[float]:
+        """Returns the replication lag in seconds from the last check, or
+        None if the replica was unreachable or not checked yet."""
+        with self._lock:
+            if self._thread is None and not self._stop.is_set():
+                self._thread = threading.Thread(
+                    target=self._run, name="replica-lag", daemon=True
+                )
+                self._thread.start()
+            return self._status.get(replica)
+
+    def is_usable(self, replica: Engine) -> bool:
+        lag = self.lag(replica)
+        return lag is not None and lag <= self.max_lag_seconds
+
+    def choose(self) -> Optional[Engine]:
+        """Returns a random usable replica, or None if none are usable."""
+        usable = [replica for replica in self.engines if self.is_usable(replica)]
+        if not usable:
+            return None
+        return random.choice(usable)
+
+    def health(self) -> list[dict[str, Any]]:
+        return [
+            {
+                "host": replica.url.host,
+                "port": replica.url.port,
+                "lag_seconds": (lag := self.lag(replica)),
+                "healthy": lag is not None and lag <= self.max_lag_seconds,
+            }
+            for replica in self.engines
+        ]
+
+    def shutdown(self) -> None:
+        """Stops the checks. A check in progress is not waited for."""
+        self._stop.set()
+
+
+replica_monitor = ReplicaMonitor(
+    replica_engines,
+    max_lag_seconds=settings.replica_max_lag_seconds,
+    check_interval=settings.replica_check_interval_seconds,
+)
+
+
+class RoutingSession(Session):
+    """Session that sends reads to a read replica and writes to the primary.
+
+    A replica is picked once per session, so all reads within a request see
+    the same snapshot. Statements other than selects, sessions with
+    ``info[USE_PRIMARY]`` set, and sessions that have flushed changes always
+    use the primary so that callers read their own writes.
+    """
+
+    def get_bind(self, mapper=None, *, clause=None, **kw):
+        if self.bind is not None:
+            return super().get_bind(mapper, clause=clause, **kw)
+
+        if (
+            self._flushing
+            or self.info.get(USE_PRIMARY)
+            # Includes text() statements, which may write
+            or (clause is not None and not isinstance(clause, SelectBase))
+            or not replica_engines
+        ):
+            return engine
+
+        if "replica" not in self.info:
+            self.info["replica"] = replica_monitor.choose()
+        return self.info["replica"] or engine
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _pin_to_primary(session: Session, flush_context) -> None:
+    # Later reads, also after the commit, must see the flushed changes
+    session.info[USE_PRIMARY] = True
+
+
+SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False)
 
 
 class Base(DeclarativeBase):
@@ -1,11 +1,11 @@
 import logging
+from typing import TYPE_CHECKING
 
 from fastapi.params import Depends
-from jwt import PyJWKClient
 from sqlalchemy.orm import Session
 
 from data_catalog_backend.config import settings
-from data_catalog_backend.database import SessionLocal
+from data_catalog_backend.database import SessionLocal, USE_PRIMARY
 from data_catalog_backend.services.category_service import CategoryService
 from data_catalog_backend.services.code_example_service import CodeExampleService
 from data_catalog_backend.services.example_service import ExampleService
@@ -16,6 +16,10 @@ from data_catalog_backend.services.resource_relation_service import (
     ResourceRelationService,
 )
 from data_catalog_backend.services.resource_service import ResourceService
+from data_catalog_backend.services.suggestion_service import SuggestionService
+
+if TYPE_CHECKING:
+    from jwt import PyJWKClient
 
 
 def get_db() -> Session:
@@ -26,6 +30,11 @@ def get_db() -> Session:
         db.close()
 
 
+def use_primary_db(db: Session = Depends(get_db)) -> None:
+    """Pins the request session to the primary database."""
+    db.info[USE_PRIMARY] = True
+
+
 def get_category_service(db: Session = Depends(get_db)) -> CategoryService:
     return CategoryService(db)
 
@@ -77,5 +86,12 @@ def get_resource_relation_service(
     return ResourceRelationService(db, resource_service)
 
 
-def get_jwk_client() -> PyJWKClient:
+def get_suggestion_service(db: Session = Depends(get_db)) -> SuggestionService:
+    return SuggestionService(db)
+
+
+def get_jwk_client() -> "PyJWKClient":
+    # Only the admin API authenticates, so the public API does not load PyJWT
+    from jwt import PyJWKClient
+
     return PyJWKClient(settings.auth_jwks_url)
@@ -41,3 +41,17 @@ class SpatialExtentError(ResourceError):
 
     def __init__(self, message: str = "Invalid spatial extent data"):
         super().__init__(message)
+
+
+class RequestGeometryError(ResourceError):
+    """Raised when the geometries of a search request cannot be used."""
+
+    def __init__(self, message: str = "Invalid search geometry"):
+        super().__init__(message)
+
+
+class GeometryImportError(ResourceError):
+    """Raised when a bulk geometry import cannot be read."""
+
+    def __init__(self, message: str = "Invalid geometry import"):
+        super().__init__(message)
@@ -12,3 +12,5 @@ from data_catalog_backend.models.spatial_extent import *
 from data_catalog_backend.models.temporal_extent import *
 from data_catalog_backend.models.spatial_extent_geometry_relation import *
 from data_catalog_backend.models.geometry import *
+from data_catalog_backend.models.collection_aggregate import *
+from data_catalog_backend.models.resource_popularity import *
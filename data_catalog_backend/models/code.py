@@ -29,7 +29,7 @@ class Code(Base):
     language: Mapped[str] = mapped_column(String, nullable=True, doc="type")
     source: Mapped[str] = mapped_column(String, nullable=True, doc="code")
     examples_id: Mapped[uuid.UUID] = mapped_column(
-        ForeignKey("code_examples.id"), nullable=True
+        ForeignKey("code_examples.id"), nullable=True, index=True
     )
     created_by: Mapped[str] = mapped_column(String, nullable=False, doc="created by")
     updated_by: Mapped[str] = mapped_column(String, nullable=True, doc="updated by")
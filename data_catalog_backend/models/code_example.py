@@ -29,7 +29,7 @@ class CodeExamples(Base):
         DateTime, nullable=True, default=func.now(), doc="updated at"
     )
     resource_id: Mapped[uuid.UUID] = mapped_column(
-        ForeignKey("resources.id"), nullable=True
+        ForeignKey("resources.id"), nullable=True, index=True
     )
     # Relations
     code: Mapped[List["Code"]] = relationship(back_populates="code_examples")
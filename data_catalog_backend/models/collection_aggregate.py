@@ -0,0 +1,54 @@
+import uuid
+from datetime import datetime
+from typing import Any, List, Optional
+
+from sqlalchemy import UUID, DateTime, Float, ForeignKey, Integer, func
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from data_catalog_backend.database import Base
+
+
+class CollectionAggregate(Base):
+    """Rollup of the child resources of a dataset collection.
+
+    Kept up to date when the children or relations of a collection change
+    (see services.helpers.collection_aggregates), so that collections can be
+    shown without reading every child.
+    """
+
+    __tablename__ = "collection_aggregates"
+
+    resource_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("resources.id", ondelete="CASCADE"),
+        primary_key=True,
+        doc="the dataset collection",
+    )
+    child_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, doc="number of child resources"
+    )
+    start_year: Mapped[Optional[int]] = mapped_column(
+        Integer, nullable=True, doc="first year covered by a child"
+    )
+    end_year: Mapped[Optional[int]] = mapped_column(
+        Integer, nullable=True, doc="last year covered, empty while a child is ongoing"
+    )
+    bbox: Mapped[Optional[List[float]]] = mapped_column(
+        ARRAY(Float),
+        nullable=True,
+        doc="west, south, east and north bounds of the children",
+    )
+    geometry: Mapped[Optional[dict[str, Any]]] = mapped_column(
+        JSONB,
+        nullable=True,
+        doc="simplified union of the children's regions as GeoJSON",
+    )
+    provider_ids: Mapped[List[uuid.UUID]] = mapped_column(
+        ARRAY(UUID(as_uuid=True)), nullable=False, doc="distinct child providers"
+    )
+    category_ids: Mapped[List[uuid.UUID]] = mapped_column(
+        ARRAY(UUID(as_uuid=True)), nullable=False, doc="distinct child categories"
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, default=func.now(), doc="updated at"
+    )
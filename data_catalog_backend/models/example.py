@@ -23,7 +23,9 @@ class Examples(Base):
     favicon_url: Mapped[str] = mapped_column(
         String, nullable=True, doc="link to favicon"
     )
-    resource_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("resources.id"))
+    resource_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("resources.id"), index=True
+    )
     created_by: Mapped[str] = mapped_column(String, nullable=False, doc="created by")
     updated_by: Mapped[str] = mapped_column(String, nullable=True, doc="updated by")
     created_at: Mapped[datetime] = mapped_column(
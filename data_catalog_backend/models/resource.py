@@ -15,6 +15,7 @@ from sqlalchemy import (
     func,
     exists,
     DateTime,
+    text,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship, column_property
 from data_catalog_backend.database import Base
@@ -91,9 +92,9 @@ class Resource(Base):
     version: Mapped[Optional[str]] = mapped_column(
         String, nullable=True, doc="resource version"
     )
-    type: Mapped[str] = mapped_column(String, nullable=True, doc="type")
+    type: Mapped[str] = mapped_column(String, nullable=True, doc="type", index=True)
     license_id: Mapped[uuid.UUID] = mapped_column(
-        ForeignKey("licenses.id"), nullable=True
+        ForeignKey("licenses.id"), nullable=True, index=True
     )
 
     # Computed properties
@@ -167,6 +168,10 @@ class Resource(Base):
         back_populates="resource"
     )
     examples: Mapped[List["Examples"]] = relationship(back_populates="resource")
+    # Only kept for dataset collections, and removed by the database with them
+    collection_aggregate: Mapped[Optional["CollectionAggregate"]] = relationship(
+        viewonly=True
+    )
 
     created_by: Mapped[str] = mapped_column(String, nullable=False, doc="created by")
     updated_by: Mapped[str] = mapped_column(String, nullable=True, doc="updated by")
@@ -179,4 +184,13 @@ class Resource(Base):
 
     __table_args__ = (
         Index("unique_resource_title_type", "title", "type", unique=True),
+        # Keyset pagination by each search sort order. Descending orders are
+        # served by scanning them backwards.
+        Index("ix_resources_title_id", "title", "id"),
+        Index("ix_resources_updated_at_id", "updated_at", "id"),
+        Index(
+            "ix_resources_release_date_id",
+            text("coalesce(release_date, DATE '0001-01-01')"),
+            "id",
+        ),
     )
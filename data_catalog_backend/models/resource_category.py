@@ -15,7 +15,7 @@ class ResourceCategory(Base):
         ForeignKey("resources.id", ondelete="CASCADE"), primary_key=True
     )
     category_id: Mapped[uuid.UUID] = mapped_column(
-        ForeignKey("categories.id"), primary_key=True
+        ForeignKey("categories.id"), primary_key=True, index=True
     )
     is_main_category: Mapped[bool] = mapped_column(Boolean, default=False)
 
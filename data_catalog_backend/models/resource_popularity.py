@@ -0,0 +1,37 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Float, ForeignKey, Index, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from data_catalog_backend.database import Base
+
+
+class ResourcePopularity(Base):
+    """How often a resource has been viewed, recently and in total.
+
+    Written in batches by the view counter (see
+    services.helpers.view_counts). The score is forward decayed: each view
+    adds 2 ** (days since the popularity epoch / half-life), so recent views
+    weigh more, and scores can be compared without rescoring old rows.
+    """
+
+    __tablename__ = "resource_popularity"
+
+    resource_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("resources.id", ondelete="CASCADE"),
+        primary_key=True,
+        doc="the viewed resource",
+    )
+    view_count: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, doc="number of views in total"
+    )
+    score: Mapped[float] = mapped_column(
+        Float, nullable=False, doc="forward decayed number of views"
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, default=func.now(), doc="updated at"
+    )
+
+    # For sorting searches by popularity
+    __table_args__ = (Index("ix_resource_popularity_score", text("score DESC")),)
@@ -14,7 +14,7 @@ class ResourceProvider(Base):
         ForeignKey("resources.id"), primary_key=True
     )
     provider_id: Mapped[uuid.UUID] = mapped_column(
-        ForeignKey("providers.id"), primary_key=True
+        ForeignKey("providers.id"), primary_key=True, index=True
     )
     role: Mapped[str] = mapped_column(String, default=False)
     created_by: Mapped[str] = mapped_column(String, nullable=False, doc="created by")
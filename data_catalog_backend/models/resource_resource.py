@@ -5,5 +5,5 @@ resource_relation = Table(
     "resource_relation",
     Base.metadata,
     Column("child_id", ForeignKey("resources.id"), primary_key=True),
-    Column("parent_id", ForeignKey("resources.id"), primary_key=True),
+    Column("parent_id", ForeignKey("resources.id"), primary_key=True, index=True),
 )
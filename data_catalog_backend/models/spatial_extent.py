@@ -3,18 +3,12 @@ from datetime import datetime
 from enum import StrEnum as PyStrEnum
 from typing import Optional, List
 
-from geoalchemy2 import WKBElement
+from geoalchemy2 import Geometry as Geo, WKBElement
 from geoalchemy2.shape import to_shape
 from geojson_pydantic import FeatureCollection, Feature
 from shapely.geometry.geo import mapping
-from sqlalchemy import UUID, String, ForeignKey, select, func, DateTime
-from sqlalchemy.orm import (
-    Mapped,
-    mapped_column,
-    relationship,
-    column_property,
-    deferred,
-)
+from sqlalchemy import UUID, String, ForeignKey, func, DateTime, LargeBinary
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from data_catalog_backend.database import Base
 from data_catalog_backend.models.geometry import Geometry
@@ -51,7 +45,7 @@ class SpatialExtent(Base):
         String, nullable=True, doc="region"
     )
     resource_id: Mapped[uuid.UUID] = mapped_column(
-        ForeignKey("resources.id", ondelete="CASCADE"), nullable=False
+        ForeignKey("resources.id", ondelete="CASCADE"), nullable=False, index=True
     )
 
     # Relations
@@ -64,18 +58,21 @@ class SpatialExtent(Base):
         cascade="save-update",
     )
 
-    geometry: Mapped[Optional[WKBElement]] = deferred(
-        column_property(
-            select(func.ST_Union(func.ST_MakeValid(Geometry.geometry)))
-            .select_from(Geometry)
-            .join(
-                spatial_extent_geometry_relation,
-                spatial_extent_geometry_relation.c.geometry_id == Geometry.id,
-            )
-            .where(spatial_extent_geometry_relation.c.spatial_extent_id == id)
-            .correlate_except(Geometry)
-            .scalar_subquery()
-        )
+    # Union of the linked geometries, computed in the geometry worker pool
+    # after admin writes (see services.helpers.extent_geometries)
+    geometry: Mapped[Optional[WKBElement]] = mapped_column(
+        Geo(geometry_type="GEOMETRY", srid=4326),
+        nullable=True,
+        deferred=True,
+        doc="union of the extent's geometries",
+    )
+    # zlib compressed GeoJSON FeatureCollections of the geometry, encoded
+    # along with it so that responses can include them as they are
+    geojson: Mapped[Optional[bytes]] = mapped_column(
+        LargeBinary, nullable=True, deferred=True, doc="compressed GeoJSON"
+    )
+    geojson_simplified: Mapped[Optional[bytes]] = mapped_column(
+        LargeBinary, nullable=True, deferred=True, doc="compressed simplified GeoJSON"
     )
 
     created_by: Mapped[str] = mapped_column(String, nullable=False, doc="created by")
@@ -83,8 +80,14 @@ class SpatialExtent(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime, nullable=False, default=func.now(), doc="created at"
     )
+    # Also set when the extent moves to another resource, which the spatial
+    # indexes notice through it
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, nullable=False, default=func.now(), doc="updated at"
+        DateTime,
+        nullable=False,
+        default=func.now(),
+        onupdate=func.now(),
+        doc="updated at",
     )
 
     # WKBElement to GeoJSON
@@ -11,6 +11,9 @@ spatial_extent_geometry_relation = Table(
         primary_key=True,
     ),
     Column(
-        "geometry_id", ForeignKey("geometries.id", ondelete="CASCADE"), primary_key=True
+        "geometry_id",
+        ForeignKey("geometries.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
     ),
 )
@@ -2,7 +2,18 @@ import uuid
 from typing import Optional
 from datetime import datetime
 
-from sqlalchemy import UUID, ForeignKey, Date, String, DateTime, func
+from sqlalchemy import (
+    UUID,
+    CheckConstraint,
+    ForeignKey,
+    Date,
+    String,
+    DateTime,
+    func,
+    Computed,
+    Index,
+)
+from sqlalchemy.dialects.postgresql import DATERANGE, Range
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from data_catalog_backend.database import Base
@@ -23,7 +34,13 @@ class TemporalExtent(Base):
         Date, nullable=True, doc="end date"
     )
     resource_id: Mapped[uuid.UUID] = mapped_column(
-        ForeignKey("resources.id"), nullable=False
+        ForeignKey("resources.id"), nullable=False, index=True
+    )
+    date_range: Mapped[Optional[Range]] = mapped_column(
+        DATERANGE,
+        Computed("daterange(start_date, end_date, '[]')", persisted=True),
+        deferred=True,
+        doc="inclusive date range, unbounded when there is no end date",
     )
 
     created_by: Mapped[str] = mapped_column(String, nullable=False, doc="created by")
@@ -37,3 +54,11 @@ class TemporalExtent(Base):
 
     # Relations
     resource: Mapped["Resource"] = relationship(back_populates="temporal_extent")
+
+    __table_args__ = (
+        Index("ix_temporalextents_date_range", "date_range", postgresql_using="gist"),
+        # daterange() fails for an end before the start
+        CheckConstraint(
+            "end_date IS NULL OR end_date >= start_date", name="end_after_start"
+        ),
+    )
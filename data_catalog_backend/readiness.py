@@ -0,0 +1,147 @@
+import logging
+import threading
+import time
+from typing import Any, Optional
+
+from sqlalchemy import Engine, TextClause, create_engine, text
+
+from data_catalog_backend.config import settings
+from data_catalog_backend.database import (
+    ReplicaMonitor,
+    engine,
+    replica_engines,
+    replica_monitor,
+)
+
+logger = logging.getLogger(__name__)
+
+POSTGIS_PROBE = text("SELECT postgis_lib_version()")
+
+# Probes get their own single connection, so they never wait for or take
+# a connection from the pools that serve requests
+probe_engine = create_engine(
+    settings.database_connection,
+    pool_size=1,
+    max_overflow=0,
+    connect_args={
+        "connect_timeout": settings.readiness_probe_timeout_seconds,
+        "options": (
+            f"-csearch_path={settings.postgres_schema} "
+            f"-cstatement_timeout={settings.readiness_probe_timeout_seconds * 1000}"
+        ),
+    },
+)
+
+
+class DatabaseProbe:
+    """Checks that the database answers a statement, at most once per ttl.
+
+    Callers within the ttl get the last result. Concurrent callers after it
+    wait for a single check instead of each probing the database.
+    """
+
+    def __init__(self, probe_engine: Engine, statement: TextClause, ttl_seconds: float):
+        self.engine = probe_engine
+        self.statement = statement
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._checked_at: Optional[float] = None
+        self._error: Optional[str] = None
+
+    def _probe(self) -> Optional[str]:
+        try:
+            with self.engine.connect() as connection:
+                connection.execute(self.statement)
+            return None
+        except Exception as e:
+            logger.warning(f"Database probe failed: {e}")
+            return str(e).splitlines()[0]
+
+    def check(self) -> Optional[str]:
+        """Returns None if the database is healthy, or else the error."""
+        with self._lock:
+            if (
+                self._checked_at is not None
+                and time.monotonic() - self._checked_at < self.ttl_seconds
+            ):
+                return self._error
+            self._error = self._probe()
+            self._checked_at = time.monotonic()
+            return self._error
+
+
+def pool_usage(pool_engine: Engine) -> float:
+    """Returns the share of the connections of an engine that are in use."""
+    pool_size, max_overflow = settings.database_pool_limits
+    return pool_engine.pool.checkedout() / (pool_size + max_overflow)
+
+
+class Readiness:
+    """Whether this worker can take traffic.
+
+    A worker is ready once it has warmed up, while the database and PostGIS
+    answer, its connection pools are not exhausted and, if it reads from
+    replicas and ``require_replica`` is set, at least one of them is
+    reachable and not lagging behind.
+    """
+
+    def __init__(
+        self,
+        probe: Optional[DatabaseProbe] = None,
+        engines: tuple[Engine, ...] = (),
+        max_pool_usage: float = 1.0,
+        replicas: Optional[ReplicaMonitor] = None,
+        require_replica: bool = True,
+    ):
+        self.probe = probe
+        self.engines = engines
+        self.max_pool_usage = max_pool_usage
+        self.replicas = replicas
+        self.require_replica = require_replica
+        self._warmed_up = threading.Event()
+
+    @property
+    def is_warmed_up(self) -> bool:
+        return self._warmed_up.is_set()
+
+    def mark_warmed_up(self) -> None:
+        self._warmed_up.set()
+
+    def reset(self) -> None:
+        self._warmed_up.clear()
+
+    def check(self) -> dict[str, Any]:
+        """Returns the result of each check, and whether all passed."""
+        if not self.is_warmed_up:
+            # The database is not probed before the warmup has used it
+            return {"ready": False, "warmup": "running"}
+        database_error = self.probe.check() if self.probe else None
+        usage = max((pool_usage(e) for e in self.engines), default=0.0)
+        # Lag is measured at most once per replica check interval
+        replicas = self.replicas.health() if self.replicas else []
+        replicas_ok = (
+            not self.require_replica
+            or not replicas
+            or any(replica["healthy"] for replica in replicas)
+        )
+        return {
+            "ready": database_error is None
+            and usage < self.max_pool_usage
+            and replicas_ok,
+            "warmup": "done",
+            "database": database_error or "ok",
+            "replicas": replicas,
+            "pool_usage": round(usage, 2),
+        }
+
+
+readiness = Readiness(
+    DatabaseProbe(
+        probe_engine, POSTGIS_PROBE, ttl_seconds=settings.readiness_cache_seconds
+    ),
+    engines=(engine, *replica_engines),
+    max_pool_usage=settings.readiness_max_pool_usage,
+    # Only public reads go to the replicas
+    replicas=replica_monitor if settings.include_public_api else None,
+    require_replica=settings.readiness_require_replica,
+)
@@ -0,0 +1,31 @@
+import logging
+import os
+import random
+import signal
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerRecycleMiddleware:
+    """Stops this worker gracefully after a number of requests.
+
+    The server finishes the requests in flight and starts a new worker in its
+    place, which returns memory that a long-running worker has accumulated. A
+    random jitter is added to the limit of each worker, so that workers
+    started together are not all replaced at the same time.
+    """
+
+    def __init__(self, app: ASGIApp, max_requests: int, jitter: int = 0) -> None:
+        self.app = app
+        self.remaining = max_requests + random.randint(0, max(jitter, 0))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.app(scope, receive, send)
+        if scope["type"] != "http":
+            return
+        self.remaining -= 1
+        if self.remaining == 0:
+            logger.info(f"Worker {os.getpid()} reached its request limit, restarting")
+            os.kill(os.getpid(), signal.SIGTERM)
@@ -1,5 +1,6 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
+from data_catalog_backend.dependencies import use_primary_db
 from data_catalog_backend.routes.admin.category_routes import router as category_router
 from data_catalog_backend.routes.admin.license_routes import router as license_router
 from data_catalog_backend.routes.admin.provider_routes import router as provider_router
@@ -9,7 +10,8 @@ from data_catalog_backend.routes.admin.resourcerelation_routes import (
 )
 from data_catalog_backend.routes.admin.geometry_routes import router as geometry_router
 
-router = APIRouter(prefix="/admin")
+# Admin requests write, so all their reads must see the primary as well
+router = APIRouter(prefix="/admin", dependencies=[Depends(use_primary_db)])
 router.include_router(category_router)
 router.include_router(license_router)
 router.include_router(provider_router)
@@ -1,15 +1,24 @@
 import logging
+import tempfile
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from starlette.concurrency import run_in_threadpool
 
+from data_catalog_backend.config import settings
 from data_catalog_backend.dependencies import (
     get_geometry_service,
 )
+from data_catalog_backend.exceptions import GeometryImportError
 from data_catalog_backend.models import Geometry
 from data_catalog_backend.routes.admin.authentication import authenticate_user
 from data_catalog_backend.schemas.User import User
-from data_catalog_backend.schemas.geometry import GeometryRequest
+from data_catalog_backend.schemas.geometry import (
+    GeometryConflict,
+    GeometryImportFormat,
+    GeometryImportResponse,
+    GeometryRequest,
+)
 from data_catalog_backend.services.geometry_service import GeometryService
 
 router = APIRouter(prefix="/geometries")
@@ -31,7 +40,75 @@ async def add_geometry(
         logger.info(f"User {current_user.email} is adding a geometry")
         geometry_data = geometry_req.model_dump()
         geometry = Geometry(**geometry_data)
-        geometry_service.create_geometry(geometry, current_user)
+        # Waits for the geometry worker pool and the database off the event loop
+        await run_in_threadpool(
+            geometry_service.create_geometry, geometry, current_user
+        )
     except Exception as e:
         logger.error(e)
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post(
+    "/import",
+    status_code=201,
+    summary="Import many geometries from a file",
+    description="Imports each feature of a GeoJSON FeatureCollection, a GeoPackage "
+    "or a zipped Shapefile as a named geometry. Send the file as the request body.",
+    response_model=GeometryImportResponse,
+    tags=["geometries"],
+)
+async def import_geometries(
+    request: Request,
+    current_user: Annotated[User, Depends(authenticate_user)],
+    format: GeometryImportFormat = Query(
+        GeometryImportFormat.GeoJSON, description="Format of the file"
+    ),
+    name_property: str = Query(
+        "name", description="Feature property to use as the geometry name"
+    ),
+    simplify_tolerance: float = Query(
+        0.0, ge=0, description="Simplification tolerance in degrees, 0 to keep all"
+    ),
+    on_conflict: GeometryConflict = Query(
+        GeometryConflict.Skip,
+        description="What to do with features whose name already exists",
+    ),
+    batch_size: int = Query(500, ge=1, le=10000),
+    geometry_service: GeometryService = Depends(get_geometry_service),
+) -> GeometryImportResponse:
+    logger.info(f"User {current_user.email} is importing geometries from {format}")
+    max_bytes = settings.geometry_import_max_bytes
+    too_large = HTTPException(
+        status_code=413, detail=f"Files larger than {max_bytes} bytes are not accepted"
+    )
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+        raise too_large
+    suffix = ".zip" if format == GeometryImportFormat.Shapefile else f".{format}"
+    # The body is spooled to disk so that large files never sit in memory
+    with tempfile.NamedTemporaryFile(suffix=suffix) as upload:
+        received = 0
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > max_bytes:
+                raise too_large
+            upload.write(chunk)
+        upload.flush()
+        try:
+            return await run_in_threadpool(
+                geometry_service.import_geometries,
+                upload.name,
+                format,
+                name_property,
+                simplify_tolerance,
+                on_conflict,
+                batch_size,
+                current_user,
+            )
+        except GeometryImportError as e:
+            logger.warning(f"Rejected geometry import: {e}")
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            logger.error(f"Error importing geometries: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
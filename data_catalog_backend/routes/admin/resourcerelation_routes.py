@@ -1,5 +1,5 @@
 import logging
-from typing import Annotated
+from typing import Annotated, List
 
 from fastapi import APIRouter, Depends, HTTPException
 
@@ -48,3 +48,35 @@ async def add_resource_relation(
         raise HTTPException(
             status_code=500, detail=f"Error creating resource: {str(e)}"
         )
+
+
+@router.post(
+    "/bulk",
+    summary="Add many resource relations to the database",
+    description="Adds relations between resources given by title. Relations "
+    "that already exist are skipped, and only the new ones are returned.",
+    tags=["resource_relations"],
+    response_model=List[ResourceRelationResponse],
+)
+async def add_resource_relations(
+    resource_relation_reqs: List[ResourceRelationRequest],
+    current_user: Annotated[User, Depends(authenticate_user)],
+    resource_relation_service: ResourceRelationService = Depends(
+        get_resource_relation_service
+    ),
+) -> List[ResourceRelationResponse]:
+    logger.info(
+        f"User {current_user.preferred_username} is adding "
+        f"{len(resource_relation_reqs)} resource relations"
+    )
+    try:
+        return resource_relation_service.create_resource_relations(
+            resource_relation_reqs
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(e)
+        raise HTTPException(
+            status_code=500, detail=f"Error creating resource relations: {str(e)}"
+        )
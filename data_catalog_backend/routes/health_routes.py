@@ -0,0 +1,21 @@
+from fastapi import APIRouter
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+
+from data_catalog_backend.readiness import readiness
+
+router = APIRouter(include_in_schema=False)
+
+
+@router.get("/healthz")
+async def healthz() -> JSONResponse:
+    """Reports that this worker is running, without touching the database."""
+    return JSONResponse({"status": "ok"})
+
+
+@router.get("/readyz")
+async def readyz() -> JSONResponse:
+    """Reports whether this worker has warmed up and its database is usable."""
+    # The database probe blocks, at most once per cache interval
+    status = await run_in_threadpool(readiness.check)
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
@@ -1,11 +1,20 @@
 from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
+
 from data_catalog_backend.routes.v1.category_routes import router as category_router
+from data_catalog_backend.routes.v1.geometry_routes import router as geometry_router
 from data_catalog_backend.routes.v1.license_routes import router as license_router
 from data_catalog_backend.routes.v1.provider_routes import router as provider_router
 from data_catalog_backend.routes.v1.resource_routes import router as resource_router
+from data_catalog_backend.routes.v1.suggest_routes import router as suggest_router
 
-router = APIRouter(prefix="/v1")
+# Routes that return models get them back validated and dumped in json
+# mode, which orjson encodes faster than json.dumps. The resource
+# routes with large bodies return encoded JSON themselves.
+router = APIRouter(prefix="/v1", default_response_class=ORJSONResponse)
 router.include_router(category_router)
+router.include_router(geometry_router)
 router.include_router(license_router)
 router.include_router(provider_router)
 router.include_router(resource_router)
+router.include_router(suggest_router)
@@ -0,0 +1,80 @@
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from shapely.geometry import Point, box
+from shapely.geometry.base import BaseGeometry
+
+from data_catalog_backend.dependencies import (
+    get_geometry_service,
+    get_resource_service,
+)
+from data_catalog_backend.schemas.geometry import (
+    GeometryLookupResponse,
+    GeometrySummaryResponse,
+)
+from data_catalog_backend.schemas.resource_summary import ResourceSummaryResponse
+from data_catalog_backend.services.geometry_service import GeometryService
+from data_catalog_backend.services.resource_service import ResourceService
+
+router = APIRouter(prefix="/geometries")
+logger = logging.getLogger(__name__)
+
+
+def parse_location(
+    lon: Optional[float], lat: Optional[float], bbox: Optional[str]
+) -> BaseGeometry:
+    if bbox is not None:
+        if lon is not None or lat is not None:
+            raise ValueError("Use either lon and lat, or bbox")
+        try:
+            min_lon, min_lat, max_lon, max_lat = (float(v) for v in bbox.split(","))
+        except ValueError:
+            raise ValueError("bbox must be min_lon,min_lat,max_lon,max_lat")
+        if min_lon > max_lon or min_lat > max_lat:
+            raise ValueError("bbox minimum must be below its maximum")
+        return box(min_lon, min_lat, max_lon, max_lat)
+    if lon is None or lat is None:
+        raise ValueError("Both lon and lat, or a bbox, are required")
+    return Point(lon, lat)
+
+
+@router.get(
+    "/lookup",
+    summary="Find geometries and resources at a location",
+    description="Returns the named geometries and the resources whose spatial "
+    "extents contain a point or a bounding box",
+    response_model=GeometryLookupResponse,
+    response_model_exclude_none=True,
+    tags=["geometries"],
+)
+async def lookup_geometries(
+    lon: Optional[float] = Query(None, ge=-180, le=180, description="Longitude"),
+    lat: Optional[float] = Query(None, ge=-90, le=90, description="Latitude"),
+    bbox: Optional[str] = Query(
+        None, description="Bounding box as min_lon,min_lat,max_lon,max_lat"
+    ),
+    geometry_service: GeometryService = Depends(get_geometry_service),
+    resource_service: ResourceService = Depends(get_resource_service),
+) -> GeometryLookupResponse:
+    try:
+        location = parse_location(lon, lat, bbox)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        geometries, resource_ids = geometry_service.find_covering(location)
+        resources = resource_service.get_resource_summaries(resource_ids)
+        return GeometryLookupResponse(
+            geometries=[
+                GeometrySummaryResponse(id=geometry_id, name=name)
+                for geometry_id, name in geometries
+            ],
+            resources=[
+                ResourceSummaryResponse.model_validate(resource)
+                for resource in resources
+            ],
+        )
+    except Exception as e:
+        logger.error(f"Error looking up geometries at {location}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
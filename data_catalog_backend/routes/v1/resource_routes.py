@@ -2,28 +2,64 @@ import logging
 import uuid
 from typing import Optional, List
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 
-from data_catalog_backend.dependencies import get_resource_service
+from data_catalog_backend.config import settings
+from data_catalog_backend.dependencies import (
+    get_resource_relation_service,
+    get_resource_service,
+)
+from data_catalog_backend.exceptions import RequestGeometryError
 from data_catalog_backend.models import (
+    Resource,
     ResourceType,
     SpatialExtentRequestType,
 )
 
 from data_catalog_backend.schemas.resource import (
+    ResourceBatchRequest,
+    ResourceBatchResponse,
+    ResourceLineageResponse,
     ResourceResponse,
+    ResourceView,
+    resource_response_model,
 )
 from data_catalog_backend.schemas.resource_query import (
     ResourceQueryRequest,
     ResourceQueryResponse,
+    SORT_DESCRIPTION,
+    ResourceSort,
+    parse_fields,
 )
 
 from data_catalog_backend.schemas.spatial_extent import SpatialExtentResponse
+from data_catalog_backend.services.helpers.resource_lineage import LineageDirection
+from data_catalog_backend.services.helpers.view_counts import view_counter
+from data_catalog_backend.services.resource_relation_service import (
+    ResourceRelationService,
+)
 from data_catalog_backend.services.resource_service import ResourceService
+from data_catalog_backend.utils.json_splice import dump_json_without, splice_json
 
 router = APIRouter(prefix="/resources")
 logger = logging.getLogger(__name__)
 
+FIELDS_DESCRIPTION = (
+    "Comma separated fields to return for each resource, the id is always "
+    "included. All fields when left out."
+)
+CURSOR_DESCRIPTION = (
+    "next_cursor of the previous page, to get the page after it instead of "
+    "the one numbered page. Stays valid when resources are added or removed, "
+    "but only for the same filters and sort. The response then has no "
+    "current_page."
+)
+INCLUDE_DESCRIPTION = (
+    "Comma separated related objects to return, such as providers or "
+    "spatial_extent. All of them when neither fields nor include are given."
+)
+
 
 @router.get(
     "/",
@@ -42,10 +78,25 @@ async def get_resources(
     ),
     tags: Optional[List[str]] = Query(None, description="Filter by tags"),
     years: Optional[List[str]] = Query(None, description="Filter by years"),
+    year_from: Optional[int] = Query(
+        None,
+        ge=1,
+        le=9999,
+        description="Filter by a range of years, starting with this year",
+    ),
+    year_to: Optional[int] = Query(
+        None,
+        ge=1,
+        le=9999,
+        description="Filter by a range of years, ending with this year",
+    ),
     page: int = Query(0, description="Page number for pagination"),
     per_page: int = Query(10, description="Number of items per page"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    sort: Optional[ResourceSort] = Query(None, description=SORT_DESCRIPTION),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
     resource_service: ResourceService = Depends(get_resource_service),
-) -> ResourceQueryResponse:
+) -> Response:
     resources_req = ResourceQueryRequest(
         types=types,
         spatial=spatial,
@@ -53,13 +104,26 @@ async def get_resources(
         providers=None,
         tags=tags,
         years=years,
+        year_from=year_from,
+        year_to=year_to,
         features=None,  # Explicitly set to None for GET endpoint
+        sort=sort,
     )
 
+    try:
+        requested_fields = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     logger.info("Getting resources with non-geospatial filters")
     logger.info(resources_req)
-    resources = resource_service.get_resources(page, per_page, resources_req)
-    return resources
+    try:
+        resources = resource_service.get_resources(
+            page, per_page, resources_req, requested_fields, cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return Response(resources.json(), media_type="application/json")
 
 
 @router.post(
@@ -74,12 +138,95 @@ async def search_resources(
     resources_req: ResourceQueryRequest,
     page: int = 0,
     per_page: int = 10,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
     resource_service: ResourceService = Depends(get_resource_service),
-) -> ResourceQueryResponse:
+) -> Response:
+    try:
+        requested_fields = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     logger.info("Searching resources with all filters")
     logger.info(resources_req)
-    resources = resource_service.get_resources(page, per_page, resources_req)
-    return resources
+    try:
+        resources = resource_service.get_resources(
+            page, per_page, resources_req, requested_fields, cursor
+        )
+    except RequestGeometryError as e:
+        logger.error(f"Invalid search geometry: {e}")
+        raise HTTPException(status_code=422, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return Response(resources.json(), media_type="application/json")
+
+
+def _resource_json(
+    resource: Resource, view: ResourceView, geojson: dict[uuid.UUID, bytes]
+) -> bytes:
+    schema = resource_response_model(view)
+    if "spatial_extent" not in view.include:
+        return dump_json_without(schema, resource, set())
+    # The stored GeoJSON is added to the response as it is
+    extents = [
+        splice_json(
+            dump_json_without(SpatialExtentResponse, extent, {"geometry"}),
+            "geometry",
+            geojson.get(extent.id),
+        )
+        for extent in resource.spatial_extent
+    ]
+    return splice_json(
+        dump_json_without(schema, resource, {"spatial_extent"}),
+        "spatial_extent",
+        b"[" + b",".join(extents) + b"]",
+    )
+
+
+def _extent_ids(resources: list[Resource], view: ResourceView) -> list[uuid.UUID]:
+    if "spatial_extent" not in view.include:
+        return []
+    return [extent.id for resource in resources for extent in resource.spatial_extent]
+
+
+@router.post(
+    "/batch",
+    summary="Get several resources by id",
+    description="Returns up to 500 resources in one request, and the ids that "
+    "were not found",
+    response_model=ResourceBatchResponse,
+    response_model_exclude_none=True,
+    tags=["resources"],
+)
+async def get_resources_batch(
+    batch_req: ResourceBatchRequest,
+    simplified: bool = Query(
+        False, description="Return simplified spatial extent geometries"
+    ),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION),
+    resource_service: ResourceService = Depends(get_resource_service),
+) -> Response:
+    try:
+        view = ResourceView.parse(fields, include)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    resources, missing = resource_service.get_resources_by_ids(batch_req.ids, view)
+    try:
+        geojson = resource_service.get_spatial_extent_geojson(
+            _extent_ids(resources, view), simplified
+        )
+        data = [_resource_json(resource, view, geojson) for resource in resources]
+        content = splice_json(
+            orjson.dumps({"missing": missing}),
+            "data",
+            b"[" + b",".join(data) + b"]",
+        )
+        return Response(content=content, media_type="application/json")
+    except Exception as e:
+        logger.error(e)
+        raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get(
@@ -91,21 +238,92 @@ async def search_resources(
 )
 async def get_resource(
     resource_id: uuid.UUID,
+    simplified: bool = Query(
+        False, description="Return simplified spatial extent geometries"
+    ),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION),
     resource_service: ResourceService = Depends(get_resource_service),
-) -> ResourceResponse:
-    resource = resource_service.get_resource(resource_id)
+) -> Response:
     try:
-        for extent in resource.spatial_extent:
-            extent.geometry = extent.geom  # Convert WKB to GeoJSON
+        view = ResourceView.parse(fields, include)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-        converted = ResourceResponse.model_validate(resource)
-        logger.info(converted)
-        return converted
+    resource = resource_service.get_resource_view(resource_id, view)
+    if resource is None:
+        raise HTTPException(status_code=404, detail="Resource not found")
+    if settings.view_counts_enabled:
+        view_counter.record(resource_id)
+    try:
+        geojson = resource_service.get_spatial_extent_geojson(
+            _extent_ids([resource], view), simplified
+        )
+        content = _resource_json(resource, view, geojson)
+        return Response(content=content, media_type="application/json")
     except Exception as e:
         logger.error(e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get(
+    "/{resource_id}/ancestors",
+    summary="Get the ancestors of a resource",
+    description="Returns the resources that a resource belongs to, and the "
+    "ones they belong to in turn, up to a depth",
+    response_model=ResourceLineageResponse,
+    response_model_exclude_none=True,
+    tags=["resources"],
+)
+async def get_resource_ancestors(
+    resource_id: uuid.UUID,
+    depth: int = Query(
+        1,
+        ge=1,
+        le=settings.resource_lineage_max_depth,
+        description="Number of relations to follow",
+    ),
+    resource_relation_service: ResourceRelationService = Depends(
+        get_resource_relation_service
+    ),
+) -> ResourceLineageResponse:
+    lineage = resource_relation_service.get_lineage(
+        resource_id, LineageDirection.Ancestors, depth
+    )
+    if lineage is None:
+        raise HTTPException(status_code=404, detail="Resource not found")
+    return lineage
+
+
+@router.get(
+    "/{resource_id}/descendants",
+    summary="Get the descendants of a resource",
+    description="Returns the resources that are based on a resource, and the "
+    "ones based on them in turn, up to a depth",
+    response_model=ResourceLineageResponse,
+    response_model_exclude_none=True,
+    tags=["resources"],
+)
+async def get_resource_descendants(
+    resource_id: uuid.UUID,
+    depth: int = Query(
+        1,
+        ge=1,
+        le=settings.resource_lineage_max_depth,
+        description="Number of relations to follow",
+    ),
+    resource_relation_service: ResourceRelationService = Depends(
+        get_resource_relation_service
+    ),
+) -> ResourceLineageResponse:
+    lineage = resource_relation_service.get_lineage(
+        resource_id, LineageDirection.Descendants, depth
+    )
+    if lineage is None:
+        raise HTTPException(status_code=404, detail="Resource not found")
+    return lineage
+
+
 @router.get(
     "/spatial_extent/{spatial_extent_id}",
     description="Get spatial extent from metadata store",
@@ -115,14 +333,20 @@ async def get_resource(
 )
 async def get_spatial_extent(
     spatial_extent_id: uuid.UUID,
+    simplified: bool = Query(False, description="Return a simplified geometry"),
     service: ResourceService = Depends(get_resource_service),
-) -> SpatialExtentResponse:
+) -> Response:
+    spatial_extent = service.get_spatial_extent(spatial_extent_id)
+    if not spatial_extent:
+        raise HTTPException(status_code=404, detail="Spatial extent not found")
     try:
-        spatial_extent = service.get_spatial_extent(spatial_extent_id)
-        converted = SpatialExtentResponse.model_validate(spatial_extent)
-        if not spatial_extent:
-            raise HTTPException(status_code=404, detail="Spatial extent not found")
-        return converted
+        geojson = service.get_spatial_extent_geojson([spatial_extent.id], simplified)
+        content = splice_json(
+            dump_json_without(SpatialExtentResponse, spatial_extent, {"geometry"}),
+            "geometry",
+            geojson.get(spatial_extent.id),
+        )
+        return Response(content=content, media_type="application/json")
     except Exception as e:
         logger.error(e)
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,34 @@
+import logging
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from data_catalog_backend.dependencies import get_suggestion_service
+from data_catalog_backend.schemas.suggestion import SuggestionResponse
+from data_catalog_backend.services.helpers.suggestions import MAX_SUGGESTIONS
+from data_catalog_backend.services.suggestion_service import SuggestionService
+
+router = APIRouter(prefix="/suggest")
+logger = logging.getLogger(__name__)
+
+
+@router.get(
+    "",
+    summary="Suggest search texts",
+    description="Returns resource titles, keywords, category titles, provider "
+    "names and region names with a word that starts with the given text, "
+    "those that lead to the most resources first",
+    response_model=List[SuggestionResponse],
+    response_model_exclude_none=True,
+    tags=["resources"],
+)
+async def suggest(
+    q: str = Query(..., min_length=1, max_length=100, description="Text typed so far"),
+    limit: int = Query(10, ge=1, le=MAX_SUGGESTIONS, description="Most suggestions"),
+    service: SuggestionService = Depends(get_suggestion_service),
+) -> List[SuggestionResponse]:
+    try:
+        return service.suggest(q, limit)
+    except Exception as e:
+        logger.error(f"Error suggesting texts for {q!r}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
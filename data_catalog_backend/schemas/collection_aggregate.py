@@ -0,0 +1,32 @@
+import uuid
+from datetime import datetime
+from typing import List, Optional
+
+from geojson_pydantic.geometries import Geometry
+from pydantic import Field
+
+from data_catalog_backend.schemas.basemodel import BaseModel
+
+
+class CollectionAggregateResponse(BaseModel):
+    child_count: int = Field(description="Number of resources in the collection")
+    start_year: Optional[int] = Field(
+        default=None, description="First year covered by a resource"
+    )
+    end_year: Optional[int] = Field(
+        default=None,
+        description="Last year covered by a resource, empty while one is ongoing",
+    )
+    bbox: Optional[List[float]] = Field(
+        default=None, description="West, south, east and north bounds"
+    )
+    geometry: Optional[Geometry] = Field(
+        default=None, description="Simplified union of the resources' regions"
+    )
+    provider_ids: List[uuid.UUID] = Field(
+        description="Providers of the resources in the collection"
+    )
+    category_ids: List[uuid.UUID] = Field(
+        description="Categories of the resources in the collection"
+    )
+    updated_at: datetime = Field(description="When the aggregate was computed")
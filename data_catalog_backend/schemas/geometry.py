@@ -1,11 +1,47 @@
+import uuid
+from enum import StrEnum as PyStrEnum
 from typing import List
 
 from geojson_pydantic import FeatureCollection
 from pydantic import Field
 
 from data_catalog_backend.schemas.basemodel import BaseModel
+from data_catalog_backend.schemas.resource_summary import ResourceSummaryResponse
+
+
+class GeometryImportFormat(PyStrEnum):
+    GeoJSON = "geojson"
+    GeoPackage = "gpkg"
+    # A zip file with the .shp, .shx, .dbf and .prj files
+    Shapefile = "shapefile"
+
+
+class GeometryConflict(PyStrEnum):
+    Skip = "skip"
+    Replace = "replace"
 
 
 class GeometryRequest(BaseModel):
     name: str = Field(description="Unique name for geometry")
     geometry: FeatureCollection = Field(description="GeoJSON FeatureCollection")
+
+
+class GeometrySummaryResponse(BaseModel):
+    id: uuid.UUID
+    name: str = Field(description="Unique name for geometry")
+
+
+class GeometryLookupResponse(BaseModel):
+    geometries: List[GeometrySummaryResponse] = Field(
+        description="Named geometries that contain the location"
+    )
+    resources: List[ResourceSummaryResponse] = Field(
+        description="Resources with a spatial extent that contains the location"
+    )
+
+
+class GeometryImportResponse(BaseModel):
+    inserted: int = Field(description="Number of new geometries")
+    updated: int = Field(description="Number of replaced geometries")
+    skipped: int = Field(description="Number of features that were not imported")
+    errors: List[str] = Field(description="Why features were skipped, if known")
@@ -1,6 +1,7 @@
 import datetime
 import uuid
-from typing import List, Optional
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Type
 
 from pydantic import Field, conlist
 
@@ -10,6 +11,9 @@ from data_catalog_backend.schemas.category import (
     CategorySummaryResponse,
     CategoryResponse,
 )
+from data_catalog_backend.schemas.collection_aggregate import (
+    CollectionAggregateResponse,
+)
 from data_catalog_backend.schemas.code import (
     CodeExampleRequest,
     CodeExampleResponse,
@@ -30,6 +34,10 @@ from data_catalog_backend.schemas.temporal_extent import (
     TemporalExtentRequest,
     TemporalExtentResponse,
 )
+from data_catalog_backend.utils.field_selection import (
+    parse_field_names,
+    partial_model,
+)
 
 
 class ResourceCategoryResponse(BaseModel):
@@ -121,6 +129,31 @@ class ResourceRelationResponse(BaseModel):
     based_on: uuid.UUID = Field(description="The resource it is based on")
 
 
+class ResourceLineageNode(ResourceSummaryResponse):
+    depth: int = Field(description="Number of relations from the resource")
+
+
+class ResourceLineageEdge(BaseModel):
+    parent: uuid.UUID = Field(description="The resource it belongs to")
+    child: uuid.UUID = Field(description="The resource it is based on")
+    cycle: bool = Field(
+        default=False,
+        description="True if the relation leads back to a resource on the "
+        "same branch, which is not followed further",
+    )
+
+
+class ResourceLineageResponse(BaseModel):
+    resource_id: uuid.UUID
+    depth: int = Field(description="Most relations followed from the resource")
+    nodes: List[ResourceLineageNode] = Field(
+        description="Related resources, ordered by depth"
+    )
+    edges: List[ResourceLineageEdge] = Field(
+        description="Relations between the resource and the related resources"
+    )
+
+
 class ResourceResponse(BaseModel):
     id: uuid.UUID
     title: str = Field(description="Title of the resource")
@@ -193,10 +226,96 @@ class ResourceResponse(BaseModel):
     children: Optional[List[ResourceSummaryResponse]] = Field(
         default=None, nullable=True, description="Child resources"
     )
+    collection_aggregate: Optional[CollectionAggregateResponse] = Field(
+        default=None, description="Summary of the resources in a dataset collection"
+    )
     created_by: Optional[str] = None
     updated_by: Optional[str] = None
 
 
+# Related objects of a resource that can be asked for with include=
+RESOURCE_RELATIONS = frozenset(
+    {
+        "categories",
+        "children",
+        "code_examples",
+        "collection_aggregate",
+        "examples",
+        "license",
+        "parents",
+        "providers",
+        "spatial_extent",
+        "temporal_extent",
+    }
+)
+# Columns of a resource that can be asked for with fields=
+RESOURCE_FIELDS = (
+    frozenset(ResourceResponse.model_fields)
+    - RESOURCE_RELATIONS
+    - {"created_by", "updated_by"}
+)
+
+
+class ResourceView(NamedTuple):
+    """The columns and related objects of a resource to load and return."""
+
+    fields: tuple[str, ...]
+    include: tuple[str, ...]
+
+    @classmethod
+    def parse(cls, fields: Optional[str], include: Optional[str]) -> "ResourceView":
+        """Parses the fields= and include= parameters.
+
+        Without either, the whole resource is returned. With fields= only
+        those columns and the id are returned, and with include= only those
+        related objects. Raises ValueError for unknown names.
+        """
+        requested_fields = parse_field_names(fields, RESOURCE_FIELDS)
+        requested_include = parse_field_names(include, RESOURCE_RELATIONS, "include")
+        if not requested_fields and not requested_include:
+            return FULL_RESOURCE_VIEW
+        return cls(
+            tuple(sorted((requested_fields or RESOURCE_FIELDS) | {"id"})),
+            tuple(sorted(requested_include)),
+        )
+
+    @property
+    def is_full(self) -> bool:
+        return self == FULL_RESOURCE_VIEW
+
+
+FULL_RESOURCE_VIEW = ResourceView(
+    tuple(sorted(RESOURCE_FIELDS)), tuple(sorted(RESOURCE_RELATIONS))
+)
+
+
+@lru_cache(maxsize=64)
+def resource_response_model(view: ResourceView) -> Type[BaseModel]:
+    """Returns the response model with the fields of a view."""
+    if view.is_full:
+        return ResourceResponse
+    return partial_model(
+        ResourceResponse, view.fields + view.include, "ResourceFieldsResponse"
+    )
+
+
+# Most resources that can be asked for in one batch request
+RESOURCE_BATCH_MAX_IDS = 500
+
+
+class ResourceBatchRequest(BaseModel):
+    ids: conlist(uuid.UUID, min_length=1, max_length=RESOURCE_BATCH_MAX_IDS) = Field(
+        description="Ids of the resources to return"
+    )
+
+
+class ResourceBatchResponse(BaseModel):
+    data: List[ResourceResponse] = Field(
+        description="The resources that were found, in the order of the ids"
+    )
+    missing: List[uuid.UUID] = Field(description="Ids of resources that do not exist")
+
+
 class UpdateResourceRequest(BaseModel):
     title: Optional[str] = None
     abstract: Optional[str] = None
@@ -1,13 +1,37 @@
 import uuid
 from datetime import datetime
-from typing import Optional, List
+from enum import StrEnum as PyStrEnum
+from functools import lru_cache
+from typing import Any, NamedTuple, Optional, List
 
+import orjson
 from geojson_pydantic import Feature
-from pydantic import Field
+from pydantic import Field, TypeAdapter
 
 from data_catalog_backend.models import ResourceType, SpatialExtentRequestType
 from data_catalog_backend.schemas.basemodel import BaseModel
 from data_catalog_backend.schemas.resource_summary import ResourceSummaryResponse
+from data_catalog_backend.utils.field_selection import (
+    parse_field_names,
+    partial_model,
+)
+from data_catalog_backend.utils.json_splice import splice_json
+
+
+SORT_DESCRIPTION = (
+    "Order of the results: title, updated_at or release_date (most recent "
+    "first), popularity (most viewed first), or relevance, which needs tags "
+    "or features. Defaults to relevance when ranking by overlap, and to "
+    "title otherwise."
+)
+
+
+class ResourceSort(PyStrEnum):
+    Title = "title"
+    UpdatedAt = "updated_at"
+    ReleaseDate = "release_date"
+    Popularity = "popularity"
+    Relevance = "relevance"
 
 
 class ResourceQueryRequest(BaseModel):
@@ -18,6 +42,26 @@ class ResourceQueryRequest(BaseModel):
     providers: Optional[List[uuid.UUID]] = None
     tags: Optional[List[str]] = None
     years: Optional[List[str]] = None
+    year_from: Optional[int] = Field(
+        default=None,
+        ge=1,
+        le=9999,
+        description="first year of a range of years to filter by",
+    )
+    year_to: Optional[int] = Field(
+        default=None,
+        ge=1,
+        le=9999,
+        description="last year of a range of years to filter by",
+    )
+    with_overlap: bool = Field(
+        default=False,
+        description="rank matches by how much of the features' area they cover",
+    )
+    sort: Optional[ResourceSort] = Field(
+        default=None,
+        description=SORT_DESCRIPTION,
+    )
 
 
 class ResourceQuerySpatialResponse(ResourceSummaryResponse):
@@ -34,9 +78,82 @@ class ResourceQuerySpatialResponse(ResourceSummaryResponse):
     intersects_all: Optional[bool] = Field(
         default=None, description="if the resource intersects all of the spatial extent"
     )
+    overlap_ratio: Optional[float] = Field(
+        default=None,
+        description="share of the features' area that the resource covers, from 0 to 1",
+    )
 
 
 class ResourceQueryResponse(BaseModel):
-    current_page: int
+    current_page: Optional[int] = Field(
+        default=None,
+        description="number of this page, left out for pages after a cursor",
+    )
     total_pages: int
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="cursor for the page after this one, if there is one",
+    )
     data: List[ResourceQuerySpatialResponse]
+
+
+# Fields of a search result that can be asked for with fields=
+RESOURCE_QUERY_FIELDS = frozenset(ResourceQuerySpatialResponse.model_fields) - {
+    "created_by",
+    "updated_by",
+}
+
+
+def parse_fields(value: Optional[str]) -> tuple[str, ...]:
+    """Parses a comma separated fields= parameter.
+
+    Returns the sorted field names, always with the id, or an empty tuple for
+    all fields. Raises ValueError for unknown fields.
+    """
+    fields = parse_field_names(value, RESOURCE_QUERY_FIELDS)
+    if not fields:
+        return ()
+    return tuple(sorted(fields | {"id"}))
+
+
+@lru_cache(maxsize=64)
+def resource_query_adapter(fields: tuple[str, ...] = ()) -> TypeAdapter:
+    """Returns a TypeAdapter for a list of search results with some fields.
+
+    Rows are validated once as a list, which is much cheaper than creating
+    a model per row and validating them again against the response_model.
+    """
+    if not fields:
+        return TypeAdapter(List[ResourceQuerySpatialResponse])
+    partial = partial_model(
+        ResourceQuerySpatialResponse, fields, "ResourceQueryFieldsResponse"
+    )
+    return TypeAdapter(List[partial])
+
+
+class ResourceQueryPage(NamedTuple):
+    """A page of search results that is encoded without ResourceQueryResponse."""
+
+    # None for pages after a cursor
+    current_page: Optional[int]
+    total_pages: int
+    # Validated with resource_query_adapter(fields)
+    data: list[Any]
+    fields: tuple[str, ...] = ()
+    next_cursor: Optional[str] = None
+
+    def json(self) -> bytes:
+        """Encodes the page the same way as a ResourceQueryResponse."""
+        data = resource_query_adapter(self.fields).dump_json(
+            self.data, exclude_none=True
+        )
+        head = {"total_pages": self.total_pages}
+        if self.current_page is not None:
+            head = {"current_page": self.current_page, **head}
+        if self.next_cursor is not None:
+            head["next_cursor"] = self.next_cursor
+        return splice_json(
+            orjson.dumps(head),
+            "data",
+            data,
+        )
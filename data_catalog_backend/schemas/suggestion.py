@@ -0,0 +1,24 @@
+import uuid
+from enum import StrEnum as PyStrEnum
+from typing import Optional
+
+from pydantic import Field
+
+from data_catalog_backend.schemas.basemodel import BaseModel
+
+
+class SuggestionType(PyStrEnum):
+    Resource = "resource"
+    Keyword = "keyword"
+    Category = "category"
+    Provider = "provider"
+    Region = "region"
+
+
+class SuggestionResponse(BaseModel):
+    text: str = Field(description="Suggested search text")
+    type: SuggestionType = Field(description="What the text names")
+    resource_id: Optional[uuid.UUID] = Field(
+        default=None, description="ID of the resource, for resource titles"
+    )
+    resources: int = Field(description="Number of resources the text leads to")
@@ -1,7 +1,7 @@
 import uuid
 from typing import Optional
 
-from pydantic import PastDate
+from pydantic import PastDate, model_validator
 from data_catalog_backend.schemas.basemodel import BaseModel
 
 
@@ -10,6 +10,12 @@ class TemporalExtentRequest(BaseModel):
     end_date: Optional[PastDate] = None
     created_by: Optional[str] = None
 
+    @model_validator(mode="after")
+    def validate_end_date(self):
+        if self.end_date is not None and self.end_date < self.start_date:
+            raise ValueError("end_date must not be before start_date")
+        return self
+
 
 class TemporalExtentResponse(BaseModel):
     id: uuid.UUID
@@ -1,12 +1,44 @@
 import logging
+import os
+import uuid
+from collections import deque
+from itertools import islice
 
-from sqlalchemy import select
+from sqlalchemy import select, func, bindparam, LargeBinary, union
 
-from data_catalog_backend.models import Geometry
+from data_catalog_backend.config import settings
+from data_catalog_backend.models import (
+    Geometry,
+    SpatialExtent,
+    SpatialExtentType,
+    spatial_extent_geometry_relation,
+)
 from data_catalog_backend.schemas.User import User
+from data_catalog_backend.schemas.geometry import (
+    GeometryConflict,
+    GeometryImportFormat,
+    GeometryImportResponse,
+)
 
-from shapely.geometry import shape, GeometryCollection
-from geoalchemy2.shape import from_shape
+from shapely.geometry.base import BaseGeometry
+from geoalchemy2 import WKBElement
+
+from data_catalog_backend.services.helpers.extent_geometries import (
+    extent_geometry_updater,
+)
+from data_catalog_backend.services.helpers.geometry_import import (
+    GeometryWriter,
+    read_geojson,
+    read_ogr,
+)
+from data_catalog_backend.services.helpers.geometry_processing import (
+    get_process_pool,
+    prepare_geometries,
+)
+from data_catalog_backend.services.helpers.spatial_index import (
+    geometry_index,
+    invalidate_spatial_indexes,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -24,12 +56,26 @@ class GeometryService:
         if not feature_collection["features"]:
             raise ValueError("FeatureCollection must contain at least one feature")
 
-        geometries = [
-            shape(feature["geometry"]) for feature in feature_collection["features"]
-        ]
-
-        geometry_collection = GeometryCollection(geometries)
-        wkb_element = from_shape(geometry_collection, srid=4326)
+        geometry_collection = {
+            "type": "GeometryCollection",
+            "geometries": [
+                feature["geometry"] for feature in feature_collection["features"]
+            ],
+        }
+        # Read, validated and repaired in the geometry worker pool, like imports
+        [(_, ewkb, error)] = (
+            get_process_pool()
+            .submit(
+                prepare_geometries,
+                [(geometry_req.name, geometry_collection)],
+                0.0,
+                0.0,
+            )
+            .result()
+        )
+        if error:
+            raise ValueError(f"Invalid geometry: {error}")
+        wkb_element = WKBElement(ewkb, extended=True)
 
         geometry = Geometry(
             name=geometry_req.name,
@@ -42,7 +88,140 @@ class GeometryService:
         except Exception as e:
             self.session.rollback()
             raise e
+        invalidate_spatial_indexes()
+
+    def import_geometries(
+        self,
+        path: str,
+        import_format: GeometryImportFormat,
+        name_property: str,
+        simplify_tolerance: float,
+        conflict: GeometryConflict,
+        batch_size: int,
+        user: User,
+    ) -> GeometryImportResponse:
+        """Imports every feature of a file as a named geometry.
+
+        Batches of features are validated and simplified in worker processes
+        while earlier batches are copied into the database. The import is
+        committed as a whole.
+        """
+        errors: list[str] = []
+        if import_format == GeometryImportFormat.GeoJSON:
+            source = open(path, "rb")
+            features = read_geojson(source, name_property, errors)
+        else:
+            source = None
+            features = read_ogr(path, name_property, batch_size, errors)
+
+        pool = get_process_pool()
+        pending = deque()
+        seen: set[str] = set()
+        in_flight = 2 * (settings.geometry_workers or os.cpu_count() or 1)
+        try:
+            writer = GeometryWriter(self.session, user.email, conflict)
+
+            def write_oldest():
+                rows = []
+                for name, ewkb, error in pending.popleft().result():
+                    if error:
+                        errors.append(error)
+                    else:
+                        rows.append((name, ewkb))
+                writer.write(rows)
+
+            while batch := list(islice(features, batch_size)):
+                unique = []
+                for name, geometry in batch:
+                    if name in seen:
+                        errors.append(f"{name}: duplicate name in the import")
+                    else:
+                        seen.add(name)
+                        unique.append((name, geometry))
+                pending.append(
+                    pool.submit(prepare_geometries, unique, 0.0, simplify_tolerance)
+                )
+                # Keep every worker busy without reading the whole file ahead
+                if len(pending) > in_flight:
+                    write_oldest()
+            while pending:
+                write_oldest()
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            for future in pending:
+                future.cancel()
+            raise e
+        finally:
+            if source is not None:
+                source.close()
+
+        invalidate_spatial_indexes()
+        if writer.updated_ids:
+            self.update_extent_geometries(writer.updated_ids)
+        skipped = writer.skipped + len(errors)
+        logger.info(
+            f"Imported geometries: {writer.inserted} inserted, "
+            f"{writer.updated} updated, {skipped} skipped"
+        )
+        return GeometryImportResponse(
+            inserted=writer.inserted,
+            updated=writer.updated,
+            skipped=skipped,
+            errors=errors[:100],
+        )
+
+    def update_extent_geometries(self, geometry_ids: list[uuid.UUID]) -> None:
+        """Schedules a new union for the spatial extents using the geometries."""
+        extent_ids = self.session.scalars(
+            select(spatial_extent_geometry_relation.c.spatial_extent_id)
+            .where(spatial_extent_geometry_relation.c.geometry_id.in_(geometry_ids))
+            .distinct()
+        ).all()
+        extent_geometry_updater.schedule(extent_ids)
 
     def get_geometry_by_name(self, name: str) -> Geometry:
         stmt = select(Geometry).where(Geometry.name == name)
         return self.session.scalars(stmt).unique().one_or_none()
+
+    def find_covering(
+        self, location: BaseGeometry
+    ) -> tuple[list[tuple[uuid.UUID, str]], set[uuid.UUID]]:
+        """Returns the named geometries and the ids of the resources that
+        cover a location.
+
+        Uses the in-memory index when it is enabled, and PostGIS otherwise.
+        The index holds simplified geometries, so locations within the
+        simplification tolerance of a border may differ between the two.
+        """
+        if settings.spatial_index_enabled:
+            return geometry_index.get(self.session).covering(location)
+
+        location_param = func.ST_GeomFromWKB(
+            bindparam("location", type_=LargeBinary), 4326
+        )
+        named = self.session.execute(
+            select(Geometry.id, Geometry.name)
+            .where(func.ST_Covers(Geometry.geometry, location_param))
+            .order_by(Geometry.name),
+            {"location": location.wkb},
+        ).all()
+        resource_ids = self.session.scalars(
+            union(
+                select(SpatialExtent.resource_id)
+                .join(
+                    spatial_extent_geometry_relation,
+                    spatial_extent_geometry_relation.c.spatial_extent_id
+                    == SpatialExtent.id,
+                )
+                .where(
+                    spatial_extent_geometry_relation.c.geometry_id.in_(
+                        [geometry_id for geometry_id, _ in named]
+                    )
+                ),
+                select(SpatialExtent.resource_id).where(
+                    SpatialExtent.type == SpatialExtentType.Global
+                ),
+            )
+        ).all()
+        return [(row.id, row.name) for row in named], set(resource_ids)
@@ -0,0 +1,211 @@
+import logging
+import uuid
+from functools import lru_cache
+from typing import Iterable
+
+from geoalchemy2.functions import (
+    ST_AsGeoJSON,
+    ST_Extent,
+    ST_Simplify,
+    ST_Union,
+    ST_XMax,
+    ST_XMin,
+    ST_YMax,
+    ST_YMin,
+)
+from sqlalchemy import (
+    UUID,
+    Delete,
+    Float,
+    Insert,
+    any_,
+    bindparam,
+    case,
+    delete,
+    distinct,
+    exists,
+    extract,
+    func,
+    literal,
+    null,
+    or_,
+    select,
+    true,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, array, insert
+from sqlalchemy.orm import Session
+
+from data_catalog_backend.config import settings
+from data_catalog_backend.models import (
+    CollectionAggregate,
+    Resource,
+    ResourceCategory,
+    ResourceProvider,
+    ResourceType,
+    SpatialExtent,
+    SpatialExtentType,
+    TemporalExtent,
+    resource_relation,
+)
+
+logger = logging.getLogger(__name__)
+
+WORLD_BBOX = [-180.0, -90.0, 180.0, 90.0]
+
+
+@lru_cache(maxsize=1)
+def _statements() -> tuple[Insert, Delete]:
+    resource_ids = bindparam("resource_ids", type_=ARRAY(UUID))
+    children = (
+        select(resource_relation.c.child_id)
+        .where(resource_relation.c.parent_id == Resource.id)
+        .correlate(Resource)
+    )
+
+    temporal = (
+        select(
+            func.min(extract("year", TemporalExtent.start_date)).label("start_year"),
+            case(
+                (func.bool_or(TemporalExtent.end_date.is_(None)), null()),
+                else_=func.max(extract("year", TemporalExtent.end_date)),
+            ).label("end_year"),
+        )
+        .where(TemporalExtent.resource_id.in_(children))
+        .lateral("temporal")
+    )
+    spatial = (
+        select(
+            func.bool_or(SpatialExtent.type == SpatialExtentType.Global).label(
+                "has_global"
+            ),
+            ST_Extent(SpatialExtent.geometry).label("extent"),
+            ST_Union(ST_Simplify(SpatialExtent.geometry, bindparam("tolerance"))).label(
+                "union"
+            ),
+        )
+        .where(SpatialExtent.resource_id.in_(children))
+        .lateral("spatial")
+    )
+    empty_ids = literal([], ARRAY(UUID))
+
+    aggregates = (
+        select(
+            Resource.id,
+            select(func.count())
+            .select_from(resource_relation)
+            .where(resource_relation.c.parent_id == Resource.id)
+            .scalar_subquery(),
+            temporal.c.start_year,
+            temporal.c.end_year,
+            case(
+                (spatial.c.has_global, literal(WORLD_BBOX, ARRAY(Float))),
+                (
+                    spatial.c.extent.is_not(None),
+                    array(
+                        [
+                            ST_XMin(spatial.c.extent),
+                            ST_YMin(spatial.c.extent),
+                            ST_XMax(spatial.c.extent),
+                            ST_YMax(spatial.c.extent),
+                        ]
+                    ),
+                ),
+            ),
+            case(
+                (spatial.c.has_global, null()),
+                else_=ST_AsGeoJSON(spatial.c.union, 6).cast(JSONB),
+            ),
+            func.coalesce(
+                select(func.array_agg(distinct(ResourceProvider.provider_id)))
+                .where(ResourceProvider.resource_id.in_(children))
+                .scalar_subquery(),
+                empty_ids,
+            ),
+            func.coalesce(
+                select(func.array_agg(distinct(ResourceCategory.category_id)))
+                .where(ResourceCategory.resource_id.in_(children))
+                .scalar_subquery(),
+                empty_ids,
+            ),
+            func.now(),
+        )
+        .select_from(Resource)
+        .join(temporal, true())
+        .join(spatial, true())
+        .where(
+            Resource.type == ResourceType.DatasetCollection,
+            or_(
+                Resource.id == any_(resource_ids),
+                Resource.id.in_(
+                    select(resource_relation.c.parent_id).where(
+                        resource_relation.c.child_id == any_(resource_ids)
+                    )
+                ),
+            ),
+        )
+    )
+
+    table = CollectionAggregate.__table__
+    columns = [
+        "resource_id",
+        "child_count",
+        "start_year",
+        "end_year",
+        "bbox",
+        "geometry",
+        "provider_ids",
+        "category_ids",
+        "updated_at",
+    ]
+    upsert = insert(table).from_select(columns, aggregates)
+    upsert = upsert.on_conflict_do_update(
+        index_elements=[table.c.resource_id],
+        set_={column: upsert.excluded[column] for column in columns[1:]},
+    )
+
+    # Aggregates of resources that are no longer collections
+    stale = delete(table).where(
+        table.c.resource_id == any_(resource_ids),
+        ~exists().where(
+            Resource.id == table.c.resource_id,
+            Resource.type == ResourceType.DatasetCollection,
+        ),
+    )
+    return upsert, stale
+
+
+def refresh_collection_aggregates(
+    session: Session, resource_ids: Iterable[uuid.UUID]
+) -> None:
+    """Recomputes the aggregates of collections after resources changed.
+
+    Refreshes the given resources that are collections, and the collections
+    that the given resources are children of, then commits. Failures are
+    logged, as the change itself is already committed.
+    """
+    resource_ids = sorted(set(resource_ids))
+    if not resource_ids:
+        return
+    upsert, stale = _statements()
+    params = {
+        "resource_ids": resource_ids,
+        "tolerance": settings.extent_geojson_simplify_tolerance,
+    }
+    try:
+        session.execute(upsert, params)
+        session.execute(stale, params)
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Could not refresh collection aggregates: {e}")
+
+
+def refresh_missing_collection_aggregates(session: Session) -> None:
+    """Computes the aggregates of collections that do not have one yet."""
+    collection_ids = session.scalars(
+        select(Resource.id).where(
+            Resource.type == ResourceType.DatasetCollection,
+            ~exists().where(CollectionAggregate.resource_id == Resource.id),
+        )
+    ).all()
+    refresh_collection_aggregates(session, collection_ids)
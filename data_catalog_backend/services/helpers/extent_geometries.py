@@ -0,0 +1,153 @@
+import logging
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterable, Optional
+
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.orm import Session
+
+from data_catalog_backend.config import settings
+from data_catalog_backend.database import USE_PRIMARY, SessionLocal
+from data_catalog_backend.models import (
+    Geometry,
+    SpatialExtent,
+    spatial_extent_geometry_relation,
+)
+from data_catalog_backend.services.helpers.collection_aggregates import (
+    refresh_collection_aggregates,
+)
+from data_catalog_backend.services.helpers.geometry_processing import (
+    get_process_pool,
+    union_geometries,
+)
+from data_catalog_backend.services.helpers.spatial_index import (
+    invalidate_spatial_indexes,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ExtentGeometryUpdater:
+    """Keeps the stored geometry of spatial extents up to date.
+
+    Updates run on a background thread, so admin requests return as soon as
+    their own transaction commits, and the unions run in the geometry worker
+    pool. Until an update is done, searches see the previous geometry.
+    """
+
+    def __init__(self, batch_size: int = 16):
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def schedule(self, extent_ids: Iterable[uuid.UUID]) -> Optional[Future]:
+        extent_ids = sorted(set(extent_ids))
+        if not extent_ids:
+            return None
+        with self._lock:
+            if self._executor is None:
+                # A single thread keeps updates of the same extent in order
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="extent-geometries"
+                )
+            return self._executor.submit(self._run, extent_ids)
+
+    def schedule_missing(self, session: Session) -> Optional[Future]:
+        """Schedules the extents whose GeoJSON has not been encoded yet."""
+        extent_ids = session.scalars(
+            select(SpatialExtent.id).where(
+                SpatialExtent.geometry.is_not(None), SpatialExtent.geojson.is_(None)
+            )
+        ).all()
+        return self.schedule(extent_ids)
+
+    def _run(self, extent_ids: list[uuid.UUID]) -> None:
+        try:
+            with SessionLocal() as session:
+                session.info[USE_PRIMARY] = True
+                self.update(session, extent_ids)
+        except Exception as e:
+            logger.error(f"Could not update spatial extent geometries: {e}")
+
+    def update(self, session: Session, extent_ids: list[uuid.UUID]) -> int:
+        """Unions the geometries of each extent and stores it with its GeoJSON."""
+        rows = session.execute(
+            select(SpatialExtent.id, func.ST_AsBinary(Geometry.geometry))
+            .outerjoin(
+                spatial_extent_geometry_relation,
+                spatial_extent_geometry_relation.c.spatial_extent_id
+                == SpatialExtent.id,
+            )
+            .outerjoin(
+                Geometry, Geometry.id == spatial_extent_geometry_relation.c.geometry_id
+            )
+            .where(SpatialExtent.id.in_(extent_ids))
+        ).all()
+        members: dict[uuid.UUID, list[bytes]] = {}
+        for extent_id, wkb in rows:
+            extent_members = members.setdefault(extent_id, [])
+            if wkb is not None:
+                extent_members.append(bytes(wkb))
+
+        pool = get_process_pool()
+        groups = list(members.items())
+        futures = [
+            pool.submit(
+                union_geometries,
+                groups[i : i + self.batch_size],
+                settings.extent_grid_size,
+                settings.extent_simplify_tolerance,
+                settings.extent_geojson_simplify_tolerance,
+            )
+            for i in range(0, len(groups), self.batch_size)
+        ]
+        values = [
+            {
+                "extent_id": result.key,
+                "geometry": result.ewkb,
+                "geojson": result.geojson,
+                "geojson_simplified": result.geojson_simplified,
+            }
+            for future in futures
+            for result in future.result()
+        ]
+        if not values:
+            return 0
+
+        table = SpatialExtent.__table__
+        session.execute(
+            update(table)
+            .where(table.c.id == bindparam("extent_id"))
+            .values(
+                geometry=bindparam("geometry", type_=table.c.geometry.type),
+                geojson=bindparam("geojson", type_=table.c.geojson.type),
+                geojson_simplified=bindparam(
+                    "geojson_simplified", type_=table.c.geojson_simplified.type
+                ),
+                updated_at=func.now(),
+            ),
+            values,
+        )
+        session.commit()
+        invalidate_spatial_indexes()
+        logger.info(f"Updated the geometry of {len(values)} spatial extents")
+        refresh_collection_aggregates(
+            session,
+            session.scalars(
+                select(SpatialExtent.resource_id).where(
+                    SpatialExtent.id.in_(extent_ids)
+                )
+            ).all(),
+        )
+        return len(values)
+
+    def shutdown(self) -> None:
+        """Waits for scheduled updates to finish."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+extent_geometry_updater = ExtentGeometryUpdater()
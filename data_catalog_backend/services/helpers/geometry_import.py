@@ -0,0 +1,153 @@
+import io
+import logging
+import uuid
+from typing import IO, Iterator, Union
+
+import ijson
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from data_catalog_backend.exceptions import GeometryImportError
+from data_catalog_backend.schemas.geometry import GeometryConflict
+
+logger = logging.getLogger(__name__)
+
+NamedGeometry = tuple[str, Union[dict, bytes]]
+
+
+def read_geojson(
+    source: IO[bytes], name_property: str, errors: list[str]
+) -> Iterator[NamedGeometry]:
+    """Yields (name, GeoJSON geometry) for each feature of a FeatureCollection.
+
+    The file is parsed incrementally, so only one feature is in memory at a
+    time. Features without a name or geometry are reported in errors.
+    """
+    try:
+        for i, feature in enumerate(
+            ijson.items(source, "features.item", use_float=True)
+        ):
+            name = (feature.get("properties") or {}).get(name_property)
+            if name is None or not feature.get("geometry"):
+                errors.append(f"Feature {i}: missing {name_property} or geometry")
+                continue
+            yield str(name), feature["geometry"]
+    except ijson.JSONError as e:
+        raise GeometryImportError(f"Invalid GeoJSON: {e}")
+
+
+def read_ogr(
+    path: str, name_property: str, batch_size: int, errors: list[str]
+) -> Iterator[NamedGeometry]:
+    """Yields (name, WKB) for each feature of a GeoPackage or zipped Shapefile.
+
+    Needs the optional pyogrio dependency (the formats extra).
+    """
+    try:
+        from pyogrio.raw import read, read_info
+    except ImportError:
+        raise GeometryImportError(
+            "GeoPackage and Shapefile imports need pyogrio, install the formats extra"
+        )
+
+    try:
+        info = read_info(path)
+    except Exception as e:
+        raise GeometryImportError(f"Unreadable file: {e}")
+    if name_property not in info["fields"]:
+        raise GeometryImportError(f"The layer has no field named {name_property}")
+    if info["crs"] not in (None, "EPSG:4326"):
+        raise GeometryImportError(f"Expected EPSG:4326 coordinates, got {info['crs']}")
+
+    offset = 0
+    while True:
+        _, _, geometries, (names,) = read(
+            path,
+            columns=[name_property],
+            skip_features=offset,
+            max_features=batch_size,
+        )
+        for i, (name, wkb) in enumerate(zip(names, geometries)):
+            if name is None or wkb is None:
+                errors.append(
+                    f"Feature {offset + i}: missing {name_property} or geometry"
+                )
+                continue
+            yield str(name), wkb
+        if len(names) < batch_size:
+            break
+        offset += batch_size
+
+
+def _copy_value(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+class GeometryWriter:
+    """Writes batches of named geometries with COPY.
+
+    Rows are copied into a temporary table first and then merged into
+    geometries, so that names that already exist can be skipped or replaced.
+    """
+
+    def __init__(self, session: Session, created_by: str, conflict: GeometryConflict):
+        self.session = session
+        self.created_by = created_by
+        self.conflict = conflict
+        self.inserted = 0
+        self.updated = 0
+        self.skipped = 0
+        # Existing geometries that were replaced
+        self.updated_ids: list[uuid.UUID] = []
+
+        self.session.execute(
+            text(
+                "CREATE TEMPORARY TABLE geometry_import "
+                "(name varchar, geometry geometry(GEOMETRY, 4326)) ON COMMIT DROP"
+            )
+        )
+
+    def write(self, rows: list[tuple[str, str]]) -> None:
+        """Writes (name, hex EWKB) rows."""
+        if not rows:
+            return
+        buffer = io.StringIO()
+        for name, ewkb in rows:
+            buffer.write(f"{_copy_value(name)}\t{ewkb}\n")
+        buffer.seek(0)
+
+        connection = self.session.connection().connection.dbapi_connection
+        with connection.cursor() as cursor:
+            cursor.copy_expert(
+                "COPY geometry_import (name, geometry) FROM STDIN", buffer
+            )
+
+        if self.conflict == GeometryConflict.Replace:
+            on_conflict = (
+                "DO UPDATE SET geometry = EXCLUDED.geometry, "
+                "updated_by = EXCLUDED.created_by, updated_at = now()"
+            )
+        else:
+            on_conflict = "DO NOTHING"
+        merged = self.session.execute(
+            text(
+                "INSERT INTO geometries "
+                "(id, name, geometry, created_by, created_at, updated_at) "
+                "SELECT gen_random_uuid(), name, geometry, :created_by, now(), now() "
+                f"FROM geometry_import ON CONFLICT (name) {on_conflict} "
+                "RETURNING id, xmax = 0 AS inserted"
+            ),
+            {"created_by": self.created_by},
+        ).all()
+        self.session.execute(text("TRUNCATE geometry_import"))
+
+        updated_ids = [row.id for row in merged if not row.inserted]
+        self.updated_ids.extend(updated_ids)
+        self.inserted += len(merged) - len(updated_ids)
+        self.updated += len(updated_ids)
+        self.skipped += len(rows) - len(merged)
@@ -0,0 +1,160 @@
+import logging
+import multiprocessing
+import threading
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, NamedTuple, Optional, Union
+
+import shapely
+from shapely.geometry import shape
+from shapely.geometry.base import BaseGeometry
+
+from data_catalog_backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Pool for CPU heavy geometry work. Functions submitted to it take and return
+# plain values (names, GeoJSON dicts, WKB) so that they are cheap to pickle.
+# Workers only import this module, which must not import the application or
+# the database stack.
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _pool_context() -> multiprocessing.context.BaseContext:
+    # Forking the threaded server could copy a held lock into a worker and
+    # deadlock it. Workers start from a fresh interpreter instead, through a
+    # fork server where available, which imports this module once.
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([__name__])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.geometry_workers or None,
+                mp_context=_pool_context(),
+            )
+            logger.info("Started geometry worker pool")
+        return _pool
+
+
+def shutdown_process_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
+
+def prepare_geometries(
+    batch: list[tuple[str, Union[dict, bytes]]],
+    grid_size: float,
+    tolerance: float,
+) -> list[tuple[str, Optional[str], Optional[str]]]:
+    """Validates, repairs and simplifies a batch of named geometries.
+
+    Geometries are given as GeoJSON dicts or WKB. Returns (name, hex EWKB,
+    error) for each of them, where either the EWKB or the error is None.
+    """
+    results = []
+    names, geometries = [], []
+    for name, geometry in batch:
+        try:
+            if isinstance(geometry, dict):
+                geometries.append(shape(geometry))
+            else:
+                geometries.append(shapely.from_wkb(geometry))
+            names.append(name)
+        except Exception as e:
+            results.append((name, None, f"{name}: unreadable geometry ({e})"))
+    if not geometries:
+        return results
+
+    geometries = shapely.make_valid(geometries)
+    if grid_size > 0:
+        geometries = shapely.set_precision(geometries, grid_size)
+    if tolerance > 0:
+        geometries = shapely.simplify(geometries, tolerance, preserve_topology=True)
+    geometries = shapely.set_srid(geometries, 4326)
+
+    for name, geometry in zip(names, geometries):
+        if geometry is None or geometry.is_empty:
+            results.append((name, None, f"{name}: empty geometry"))
+        else:
+            results.append(
+                (name, shapely.to_wkb(geometry, hex=True, include_srid=True), None)
+            )
+    return results
+
+
+def feature_collection_json(geometry: BaseGeometry) -> bytes:
+    """Encodes a geometry as a GeoJSON FeatureCollection.
+
+    Geometry collections get one feature per member, the same way
+    SpatialExtent.geom converts them.
+    """
+    if geometry.geom_type == "GeometryCollection":
+        parts = shapely.get_parts(geometry)
+    else:
+        parts = [geometry]
+    features = ",".join(
+        f'{{"type":"Feature","geometry":{shapely.to_geojson(part)},"properties":{{}}}}'
+        for part in parts
+    )
+    return f'{{"type":"FeatureCollection","features":[{features}]}}'.encode()
+
+
+class ExtentGeometry(NamedTuple):
+    key: Any
+    # Hex EWKB of the union
+    ewkb: Optional[str]
+    # zlib compressed GeoJSON of the union and of a simplified copy
+    geojson: Optional[bytes]
+    geojson_simplified: Optional[bytes]
+
+
+def union_geometries(
+    groups: list[tuple[Any, list[bytes]]],
+    grid_size: float,
+    tolerance: float,
+    geojson_tolerance: float,
+) -> list[ExtentGeometry]:
+    """Repairs and unions each group of WKB geometries into one geometry.
+
+    Also encodes the union as GeoJSON, both as it is and simplified with
+    geojson_tolerance. All values are None for groups that are empty or
+    whose union is empty.
+    """
+    results = []
+    for key, members in groups:
+        if not members:
+            results.append(ExtentGeometry(key, None, None, None))
+            continue
+        parts = shapely.make_valid(shapely.from_wkb(members))
+        union = shapely.union_all(parts, grid_size=grid_size or None)
+        if tolerance > 0:
+            union = shapely.simplify(union, tolerance, preserve_topology=True)
+        if union is None or union.is_empty:
+            results.append(ExtentGeometry(key, None, None, None))
+            continue
+        simplified = union
+        if geojson_tolerance > 0:
+            simplified = shapely.simplify(
+                union, geojson_tolerance, preserve_topology=True
+            )
+        union = shapely.set_srid(union, 4326)
+        results.append(
+            ExtentGeometry(
+                key,
+                shapely.to_wkb(union, hex=True, include_srid=True),
+                zlib.compress(feature_collection_json(union)),
+                zlib.compress(feature_collection_json(simplified)),
+            )
+        )
+    return results
@@ -0,0 +1,124 @@
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import shapely
+from geojson_pydantic import Feature
+from shapely.geometry import shape
+from shapely.geometry.base import BaseGeometry
+from shapely.validation import make_valid
+
+from data_catalog_backend.config import settings
+from data_catalog_backend.exceptions import RequestGeometryError
+
+logger = logging.getLogger(__name__)
+
+# Simplification stops at this tolerance (in degrees), whatever the
+# number of vertices left
+MAX_SIMPLIFY_TOLERANCE = 0.1
+
+
+class NormalizedGeometryCache:
+    """LRU cache of normalized WKB, keyed by a hash of the request GeoJSON.
+
+    The frontend sends the same drawn region with every page of a search,
+    so most lookups are hits.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, Tuple[bytes, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[bytes, int]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: Tuple[bytes, int]) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+normalized_geometries = NormalizedGeometryCache(settings.feature_cache_size)
+
+
+def geometry_key(feature: Feature) -> str:
+    content = feature.geometry.model_dump_json(exclude_none=True)
+    return hashlib.sha1(content.encode()).hexdigest()
+
+
+def normalize_geometry(
+    geometry: BaseGeometry, grid_size: float, vertex_budget: int
+) -> BaseGeometry:
+    """Makes a geometry valid, snaps it to a grid and simplifies it.
+
+    Simplification only happens when the geometry has more vertices than
+    the budget. The tolerance starts at the grid size and grows until the
+    geometry fits the budget.
+    """
+    if not geometry.is_valid:
+        geometry = make_valid(geometry)
+
+    if grid_size > 0:
+        reduced = shapely.set_precision(geometry, grid_size)
+        # Features smaller than a grid cell would disappear entirely
+        if not reduced.is_empty:
+            geometry = reduced
+
+    simplified = geometry
+    tolerance = grid_size if grid_size > 0 else 1e-6
+    while (
+        shapely.get_num_coordinates(simplified) > vertex_budget
+        and tolerance <= MAX_SIMPLIFY_TOLERANCE
+    ):
+        simplified = geometry.simplify(tolerance, preserve_topology=True)
+        tolerance *= 4
+    return simplified
+
+
+def normalized_wkb(features: List[Feature]) -> List[bytes]:
+    """Returns the normalized WKB of every feature of a search request.
+
+    Raises RequestGeometryError if a feature has no usable geometry, or if
+    the features together have more vertices than allowed.
+    """
+    wkbs = []
+    total_vertices = 0
+    for feature in features:
+        if feature.geometry is None:
+            raise RequestGeometryError("Search features must have a geometry")
+
+        key = geometry_key(feature)
+        entry = normalized_geometries.get(key)
+        if entry is None:
+            geometry = normalize_geometry(
+                shape(feature.geometry),
+                settings.feature_grid_size,
+                settings.feature_vertex_budget,
+            )
+            if geometry.is_empty:
+                raise RequestGeometryError("Search features must not be empty")
+            entry = (geometry.wkb, shapely.get_num_coordinates(geometry))
+            normalized_geometries.put(key, entry)
+
+        wkb, vertices = entry
+        total_vertices += vertices
+        if total_vertices > settings.feature_max_vertices:
+            raise RequestGeometryError(
+                f"Search features have more than {settings.feature_max_vertices} "
+                f"vertices after simplification"
+            )
+        wkbs.append(wkb)
+    return wkbs
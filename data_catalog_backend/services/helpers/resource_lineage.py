@@ -0,0 +1,77 @@
+from enum import StrEnum as PyStrEnum
+from functools import lru_cache
+
+from sqlalchemy import UUID, Select, any_, bindparam, func, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY, array
+
+from data_catalog_backend.models import Resource, resource_relation
+
+
+class LineageDirection(PyStrEnum):
+    Ancestors = "ancestors"
+    Descendants = "descendants"
+
+
+@lru_cache(maxsize=2)
+def lineage_statement(direction: LineageDirection) -> Select:
+    """Builds the query for the lineage of a resource in one direction.
+
+    A recursive CTE follows the relations from the resource with the id
+    ``resource_id``, up to ``max_depth`` relations away. Every row is a
+    relation that was followed, with the related resource it leads to. The
+    path of each branch is kept, and a relation that leads back to a
+    resource on its path is returned with ``is_cycle`` set but not followed.
+    """
+
+    def ends(edge):
+        # From the resource closer to the start, to the one further away
+        if direction == LineageDirection.Ancestors:
+            return edge.c.child_id, edge.c.parent_id
+        return edge.c.parent_id, edge.c.child_id
+
+    near, far = ends(resource_relation)
+    lineage = (
+        select(
+            near.label("near_id"),
+            far.label("far_id"),
+            literal(1).label("depth"),
+            array([near, far], type_=UUID).label("path"),
+            (near == far).label("is_cycle"),
+        )
+        .where(near == bindparam("resource_id", type_=UUID))
+        .cte("lineage", recursive=True)
+    )
+
+    step = resource_relation.alias("step")
+    step_near, step_far = ends(step)
+    lineage = lineage.union_all(
+        select(
+            step_near,
+            step_far,
+            lineage.c.depth + 1,
+            func.array_append(lineage.c.path, step_far).cast(ARRAY(UUID)),
+            step_far == any_(lineage.c.path),
+        )
+        .join(lineage, step_near == lineage.c.far_id)
+        .where(
+            lineage.c.is_cycle.is_(False),
+            lineage.c.depth < bindparam("max_depth"),
+        )
+    )
+
+    return (
+        select(
+            lineage.c.near_id,
+            lineage.c.depth,
+            lineage.c.is_cycle,
+            Resource.id,
+            Resource.title,
+            Resource.abstract,
+            Resource.type,
+            Resource.icon,
+            Resource.has_spatial_extent,
+            Resource.spatial_extent_type,
+        )
+        .join(Resource, Resource.id == lineage.c.far_id)
+        .order_by(lineage.c.depth, Resource.title, Resource.id)
+    )
@@ -0,0 +1,42 @@
+from sqlalchemy.orm import joinedload, load_only, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+
+from data_catalog_backend.models import (
+    CodeExamples,
+    Resource,
+    ResourceCategory,
+    ResourceProvider,
+)
+from data_catalog_backend.schemas.resource import ResourceView
+
+# How each related object of a resource is loaded, with what its response
+# needs from further down. Each one is a single extra query for any number
+# of resources.
+RELATION_LOADERS: dict[str, LoaderOption] = {
+    "categories": selectinload(Resource.categories).joinedload(
+        ResourceCategory.category
+    ),
+    "children": selectinload(Resource.children),
+    "code_examples": selectinload(Resource.code_examples).selectinload(
+        CodeExamples.code
+    ),
+    "collection_aggregate": joinedload(Resource.collection_aggregate),
+    "examples": selectinload(Resource.examples),
+    "license": joinedload(Resource.license),
+    "parents": selectinload(Resource.parents),
+    "providers": selectinload(Resource.providers).joinedload(ResourceProvider.provider),
+    "spatial_extent": selectinload(Resource.spatial_extent),
+    "temporal_extent": selectinload(Resource.temporal_extent),
+}
+
+
+def resource_load_options(view: ResourceView) -> list[LoaderOption]:
+    """Returns the loader options that load what a view of a resource needs.
+
+    Columns that are not asked for are left out of the SELECT, including the
+    computed ones, and related objects are only loaded when included.
+    """
+    options = [RELATION_LOADERS[relation] for relation in view.include]
+    if not view.is_full:
+        options.append(load_only(*[getattr(Resource, field) for field in view.fields]))
+    return options
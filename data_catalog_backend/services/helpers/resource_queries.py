@@ -1,11 +1,34 @@
+import hashlib
 import logging
+import math
+from functools import lru_cache
+from typing import NamedTuple, Optional
 
-from geoalchemy2.functions import ST_Covers, ST_Intersects, ST_Envelope
-from geoalchemy2.shape import from_shape
-from shapely.geometry.geo import shape
-from sqlalchemy import or_, case, and_, func, select, literal_column, exists
+from geoalchemy2.functions import ST_Covers, ST_Intersects
+from sqlalchemy import (
+    or_,
+    and_,
+    func,
+    select,
+    literal_column,
+    exists,
+    bindparam,
+    LargeBinary,
+    Select,
+    cast,
+    true,
+    case,
+    desc,
+    any_,
+    UUID,
+    ColumnElement,
+    Date,
+    Integer,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, DATEMULTIRANGE, DATERANGE
 from sqlalchemy.orm import aliased
-from datetime import datetime
+from datetime import datetime, date
 
 from data_catalog_backend.models import (
     Resource,
@@ -13,146 +36,563 @@ from data_catalog_backend.models import (
     SpatialExtentRequestType,
     Category,
     ResourceCategory,
-    Provider,
+    ResourcePopularity,
     ResourceProvider,
+    TemporalExtent,
+)
+from data_catalog_backend.schemas.resource_query import (
+    ResourceQueryRequest,
+    ResourceSort,
+)
+from data_catalog_backend.services.helpers.request_geometries import normalized_wkb
+
+logger = logging.getLogger(__name__)
+
+SORT_KEY_PREFIX = "sort_key_"
+# Last day of the current year, until which extents without an end date run
+CURRENT_YEAR_END = func.make_date(
+    cast(func.extract("year", func.current_date()), Integer), 12, 31
+)
+# Resources without a release date come last. The placeholder date is
+# returned as it is, unlike -infinity, so it can be used in cursors.
+RELEASE_DATE_KEY = func.coalesce(
+    Resource.release_date, literal_column("DATE '0001-01-01'", Date)
 )
 
 
+class QueryShape(NamedTuple):
+    """The parts of a search request that change the SQL statement.
+
+    Everything else in the request is sent as bound parameters, so two
+    requests with the same shape share one statement.
+    """
+
+    tags: int = 0
+    types: bool = False
+    categories: bool = False
+    providers: bool = False
+    features: bool = False
+    overlap: bool = False
+    prefiltered: bool = False
+    temporal: bool = False
+    non_spatial: bool = False
+    spatial_types: bool = False
+    sort: ResourceSort = ResourceSort.Title
+    # Only results after the sort key values in the cursor parameters
+    keyset: bool = False
+    # Result columns to select, all of them when empty
+    fields: tuple[str, ...] = ()
+
+    @classmethod
+    def from_request(
+        cls,
+        resources_req: ResourceQueryRequest,
+        prefiltered: bool = False,
+        fields: tuple[str, ...] = (),
+        keyset: bool = False,
+    ) -> "QueryShape":
+        """Raises ValueError when sorting by relevance without tags or
+        features to rank by."""
+        spatial = resources_req.spatial or []
+        features = bool(resources_req.features)
+        sort = resources_req.sort
+        if sort is None:
+            ranked = features and resources_req.with_overlap
+            sort = ResourceSort.Relevance if ranked else ResourceSort.Title
+        if sort == ResourceSort.Relevance and not (features or resources_req.tags):
+            raise ValueError("Sorting by relevance needs tags or features")
+        return cls(
+            tags=len(resources_req.tags or []),
+            types=bool(resources_req.types),
+            categories=bool(resources_req.categories),
+            providers=bool(resources_req.providers),
+            features=bool(resources_req.features),
+            overlap=features
+            and (resources_req.with_overlap or sort == ResourceSort.Relevance),
+            prefiltered=bool(resources_req.features) and prefiltered,
+            temporal=bool(
+                resources_req.years
+                or resources_req.year_from is not None
+                or resources_req.year_to is not None
+            ),
+            non_spatial=SpatialExtentRequestType.NonSpatial in spatial,
+            spatial_types=any(
+                stype != SpatialExtentRequestType.NonSpatial for stype in spatial
+            ),
+            sort=sort,
+            keyset=keyset,
+            fields=fields,
+        )
+
+
 class ResourceQuery:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
 
-    def apply_tag_filters(self, stmt, resources_req):
+    def statements(
+        self,
+        resources_req: ResourceQueryRequest,
+        prefiltered: bool = False,
+        fields: tuple[str, ...] = (),
+        keyset: bool = False,
+    ) -> tuple[Select, Select]:
+        """Returns the (page, count) statements for a search request.
+
+        With ``prefiltered``, feature searches only consider the resources in
+        the ``candidate_ids`` parameter. With ``fields``, only those result
+        columns and the id are selected. With ``keyset``, the page starts
+        after the sort key values in the ``cursor_<n>`` parameters.
+        """
+        return _cached_statements(
+            QueryShape.from_request(resources_req, prefiltered, fields, keyset)
+        )
+
+    def parameters(
+        self,
+        resources_req: ResourceQueryRequest,
+        page: int,
+        per_page: int,
+        cursor: Optional[list] = None,
+    ) -> dict:
+        """Returns the bound parameter values for a search request.
+
+        One more result than a page is asked for, to tell whether another
+        page follows. With a cursor, the page starts after it instead of at
+        the page number.
+        """
+        params = {"offset": per_page * page, "limit": per_page + 1}
+        if cursor is not None:
+            params["offset"] = 0
+            for i, value in enumerate(cursor):
+                params[f"cursor_{i}"] = value
+        for i, tag in enumerate(resources_req.tags or []):
+            params[f"tag_{i}"] = tag
+            params[f"tag_pattern_{i}"] = f"%{tag}%"
+        if resources_req.types:
+            params["types"] = list(resources_req.types)
+        if resources_req.categories:
+            params["categories"] = list(resources_req.categories)
+        if resources_req.providers:
+            params["providers"] = list(resources_req.providers)
+        if resources_req.features:
+            params["features"] = normalized_wkb(resources_req.features)
+        if (
+            resources_req.years
+            or resources_req.year_from is not None
+            or resources_req.year_to is not None
+        ):
+            params["year_ranges"] = year_multirange(
+                [
+                    datetime.strptime(year, "%Y").year
+                    for year in resources_req.years or []
+                ],
+                resources_req.year_from,
+                resources_req.year_to,
+            )
+        spatial_types = [
+            stype
+            for stype in resources_req.spatial or []
+            if stype != SpatialExtentRequestType.NonSpatial
+        ]
+        if spatial_types:
+            params["spatial_types"] = spatial_types
+        return params
+
+    def cursor_scope(self, resources_req: ResourceQueryRequest) -> str:
+        """Identifies the sort order and filter values that the cursors of a
+        search request are made for.
+
+        The digest is of the request's JSON rather than hash(), which
+        differs between worker processes. Which fields are returned does not
+        change the results, so cursors stay valid for other fields.
+        """
+        sort = QueryShape.from_request(resources_req).sort
+        # With the default sort filled in, which leaving it out stands for
+        normalized = resources_req.model_copy(update={"sort": sort})
+        request_json = normalized.model_dump_json().encode()
+        return f"{sort.value}:{hashlib.sha256(request_json).hexdigest()[:16]}"
+
+    def cursor(self, stmt: Select, row) -> list:
+        """Returns the sort key values of a result row of a page statement."""
+        return [getattr(row, key) for key in sort_key_names(stmt)]
+
+    def sort_keys(
+        self, stmt: Select, query_shape: QueryShape
+    ) -> list[tuple[ColumnElement, bool]]:
+        """Returns the expressions that results are ordered by, each with
+        whether it is descending. The last one is always the id."""
+        if query_shape.sort == ResourceSort.UpdatedAt:
+            return [(Resource.updated_at, True), (Resource.id, True)]
+        if query_shape.sort == ResourceSort.ReleaseDate:
+            return [(RELEASE_DATE_KEY, True), (Resource.id, True)]
+
+        keys = []
+        if query_shape.sort == ResourceSort.Popularity:
+            keys.append((func.coalesce(ResourcePopularity.score, 0.0), True))
+        elif query_shape.sort == ResourceSort.Relevance:
+            if query_shape.overlap:
+                overlap_ratio = stmt.selected_columns.overlap_ratio
+                keys.append((func.coalesce(overlap_ratio, 0.0), True))
+            if query_shape.tags:
+                keys.append((self.tag_relevance(query_shape.tags), True))
+        return keys + [(Resource.title, False), (Resource.id, False)]
+
+    def tag_relevance(self, tag_count: int) -> ColumnElement:
+        """Scores how well a resource matches the tags. A match in the title
+        counts most, then one in the keywords, the abstract and elsewhere."""
+        scores = [
+            case(
+                (Resource.title.ilike(bindparam(f"tag_pattern_{i}")), 4),
+                (keyword_match(bindparam(f"tag_{i}")), 3),
+                (Resource.abstract.ilike(bindparam(f"tag_pattern_{i}")), 2),
+                else_=1,
+            )
+            for i in range(tag_count)
+        ]
+        return sum(scores[1:], scores[0])
+
+    def build_statements(self, query_shape: QueryShape) -> tuple[Select, Select]:
+        stmt = (
+            select(
+                Resource.id,
+                Resource.title,
+                Resource.abstract,
+                Resource.type,
+                Category.icon.label("icon"),
+                Resource.has_spatial_extent,
+                Resource.spatial_extent_type,
+            )
+            .select_from(Resource)
+            .join(
+                ResourceCategory,
+                and_(
+                    ResourceCategory.resource_id == Resource.id,
+                    ResourceCategory.is_main_category.is_(True),
+                ),
+            )
+            .join(Category, Category.id == ResourceCategory.category_id)
+        )
+
+        if query_shape.tags:
+            stmt = self.apply_tag_filters(stmt, query_shape.tags)
+        if query_shape.types:
+            stmt = self.apply_type_filters(stmt)
+        if query_shape.categories:
+            stmt = self.apply_category_filters(stmt)
+        if query_shape.providers:
+            stmt = self.apply_provider_filters(stmt)
+        if query_shape.temporal:
+            stmt = self.apply_temporal_filters(stmt)
+        if query_shape.non_spatial or query_shape.spatial_types:
+            stmt = self.apply_spatial_filters(stmt, query_shape)
+
+        if query_shape.prefiltered:
+            stmt = stmt.where(
+                Resource.id == any_(bindparam("candidate_ids", type_=ARRAY(UUID)))
+            )
+        if query_shape.features:
+            stmt = self.apply_features_filters(stmt, query_shape.overlap)
+        # All filters are semi-joins or single row lateral joins, so every
+        # resource appears at most once and no deduplication is needed.
+        total_stmt = stmt.with_only_columns(func.count())
+
+        if query_shape.sort == ResourceSort.Popularity:
+            # Resources that were never viewed have no popularity row
+            stmt = stmt.outerjoin(
+                ResourcePopularity, ResourcePopularity.resource_id == Resource.id
+            )
+        keys = self.sort_keys(stmt, query_shape)
+        # The sort key values are selected too, for the cursor of the next page
+        labels = [
+            expression.label(f"{SORT_KEY_PREFIX}{i}")
+            for i, (expression, _) in enumerate(keys)
+        ]
+        stmt = stmt.add_columns(*labels)
+        if query_shape.keyset:
+            stmt = stmt.where(
+                keyset_condition(
+                    [
+                        (
+                            expression,
+                            descending,
+                            bindparam(f"cursor_{i}", type_=expression.type),
+                        )
+                        for i, (expression, descending) in enumerate(keys)
+                    ]
+                )
+            )
+        if query_shape.fields:
+            # The joins stay, as they also filter
+            stmt = stmt.with_only_columns(
+                *[
+                    column
+                    for column in stmt.selected_columns
+                    if column.key == "id"
+                    or column.key in query_shape.fields
+                    or column.key.startswith(SORT_KEY_PREFIX)
+                ]
+            )
+        stmt = stmt.order_by(
+            *[
+                label.desc() if descending else label
+                for label, (_, descending) in zip(labels, keys)
+            ]
+        )
+
+        page_stmt = stmt.offset(bindparam("offset")).limit(bindparam("limit"))
+        return page_stmt, total_stmt
+
+    def apply_tag_filters(self, stmt, tag_count: int):
         self.logger.info("Filtering by tags")
         tag_filters = []
-        for tag in resources_req.tags:
+        for i in range(tag_count):
+            tag = bindparam(f"tag_{i}")
+            pattern = bindparam(f"tag_pattern_{i}")
             tag_filters.append(
                 or_(
-                    Resource.title.ilike(f"%{tag}%"),
-                    Resource.abstract.ilike(f"%{tag}%"),
-                    exists(  # search for tag in keywords, case-insensitive
-                        select(literal_column("1"))
-                        .select_from(func.unnest(Resource.keywords).alias("keyword"))
-                        .where(func.lower(literal_column("keyword")) == func.lower(tag))
-                    ),
-                    Resource.html_content.ilike(f"%{tag}%"),
-                    Resource.spatial_extent.any(
-                        SpatialExtent.details.ilike(f"%{tag}%")
-                    ),
-                    Resource.spatial_extent.any(SpatialExtent.region.ilike(f"%{tag}%")),
+                    Resource.title.ilike(pattern),
+                    Resource.abstract.ilike(pattern),
+                    keyword_match(tag),
+                    Resource.html_content.ilike(pattern),
+                    Resource.spatial_extent.any(SpatialExtent.details.ilike(pattern)),
+                    Resource.spatial_extent.any(SpatialExtent.region.ilike(pattern)),
                 )
             )
         return stmt.where(and_(*tag_filters))
 
-    def apply_type_filters(self, stmt, resources_req):
+    def apply_type_filters(self, stmt):
         self.logger.info("Filtering by types")
-        return stmt.where(Resource.type.in_(resources_req.types))
+        return stmt.where(Resource.type.in_(bindparam("types", expanding=True)))
 
-    def apply_category_filters(self, stmt, resources_req):
+    def apply_category_filters(self, stmt):
         self.logger.info("Filtering by categories")
         FilterResourceCategory = aliased(ResourceCategory)
-        return stmt.outerjoin(
-            FilterResourceCategory, FilterResourceCategory.resource_id == Resource.id
-        ).where(FilterResourceCategory.category_id.in_(resources_req.categories))
+        return stmt.where(
+            exists().where(
+                FilterResourceCategory.resource_id == Resource.id,
+                FilterResourceCategory.category_id.in_(
+                    bindparam("categories", expanding=True)
+                ),
+            )
+        )
 
-    def apply_provider_filters(self, stmt, resources_req):
+    def apply_provider_filters(self, stmt):
         self.logger.info("Filtering by providers")
-        return stmt.outerjoin(
-            Resource.providers,
-        ).where(ResourceProvider.provider_id.in_(resources_req.providers))
+        return stmt.where(
+            Resource.providers.any(
+                ResourceProvider.provider_id.in_(bindparam("providers", expanding=True))
+            )
+        )
 
-    def apply_spatial_filters(self, stmt, resources_req):
+    def apply_spatial_filters(self, stmt, query_shape: QueryShape):
         self.logger.info("Filtering by spatial extent")
 
         conditions = []
 
-        if SpatialExtentRequestType.NonSpatial in resources_req.spatial:
-            conditions.append(Resource.spatial_extent == None)
-        other_types = [
-            stype
-            for stype in resources_req.spatial
-            if stype != SpatialExtentRequestType.NonSpatial
-        ]
-        if other_types:
-            conditions.append(SpatialExtent.type.in_(other_types))
+        if query_shape.non_spatial:
+            conditions.append(~Resource.spatial_extent.any())
+        if query_shape.spatial_types:
+            conditions.append(
+                Resource.spatial_extent.any(
+                    SpatialExtent.type.in_(bindparam("spatial_types", expanding=True))
+                )
+            )
         if conditions:
             stmt = stmt.where(or_(*conditions))
         return stmt
 
-    def apply_features_filters(self, stmt, resources_req):
+    def apply_features_filters(self, stmt, with_overlap: bool):
         self.logger.info("Filtering by features")
 
-        shapely_geoms = [
-            from_shape(shape(feature.geometry), srid=4326)
-            for feature in resources_req.features
-        ]
+        requested = func.unnest(
+            bindparam("features", type_=ARRAY(LargeBinary))
+        ).table_valued("wkb", with_ordinality="n")
+        features = select(
+            requested.c.n, func.ST_GeomFromWKB(requested.c.wkb, 4326).label("geom")
+        ).cte("features")
 
-        envelope_intersects_conditions = [
-            ST_Intersects(ST_Envelope(SpatialExtent.geometry), ST_Envelope(geom))
-            for geom in shapely_geoms
+        # The union of the resource's stored extent geometries, limited to
+        # the ones that can touch the requested features.
+        resource_area = (
+            select(func.ST_Union(SpatialExtent.geometry).label("geom"))
+            .where(
+                SpatialExtent.resource_id == Resource.id,
+                SpatialExtent.geometry.op("&&")(
+                    select(func.ST_Collect(features.c.geom)).scalar_subquery()
+                ),
+            )
+            .correlate(Resource)
+            .lateral("resource_area")
+        )
+
+        # One row per requested feature, so that each predicate is evaluated
+        # once per resource and feature.
+        per_feature = [
+            ST_Covers(resource_area.c.geom, features.c.geom).label("covers"),
+            ST_Intersects(resource_area.c.geom, features.c.geom).label("intersects"),
         ]
+        if with_overlap:
+            per_feature += [
+                func.ST_Area(
+                    func.ST_Intersection(resource_area.c.geom, features.c.geom)
+                ).label("overlap_area"),
+                func.ST_Area(features.c.geom).label("area"),
+            ]
+        relations = (
+            select(*per_feature)
+            .select_from(resource_area)
+            .join(features, true())
+            .subquery("relations")
+        )
 
-        covers = [ST_Covers(SpatialExtent.geometry, geom) for geom in shapely_geoms]
-        intersects_conditions = [
-            ST_Intersects(SpatialExtent.geometry, geom) for geom in shapely_geoms
+        is_global = Resource.spatial_extent.any(
+            SpatialExtent.type == SpatialExtentRequestType.Global
+        )
+        scores = [
+            is_global.label("is_global"),
+            func.bool_or(relations.c.covers).label("covers_some"),
+            func.bool_and(relations.c.covers).label("covers_all"),
+            func.bool_or(relations.c.intersects).label("intersects_some"),
+            func.bool_and(relations.c.intersects).label("intersects_all"),
         ]
+        if with_overlap:
+            scores.append(
+                func.sum(relations.c.overlap_area)
+                .op("/")(func.nullif(func.sum(relations.c.area), 0))
+                .label("overlap_ratio")
+            )
+        match = select(*scores).select_from(relations).lateral("match")
 
-        is_global = Resource.spatial_extent_type == SpatialExtentRequestType.Global
+        columns = [
+            or_(match.c.is_global, match.c.covers_some).label("covers_some"),
+            or_(match.c.is_global, match.c.covers_all).label("covers_all"),
+            or_(match.c.is_global, match.c.intersects_some).label("intersects_some"),
+            or_(match.c.is_global, match.c.intersects_all).label("intersects_all"),
+        ]
+        if with_overlap:
+            columns.append(
+                case((match.c.is_global, 1.0), else_=match.c.overlap_ratio).label(
+                    "overlap_ratio"
+                )
+            )
 
-        stmt = stmt.add_columns(
-            or_(is_global, *covers).label("covers_some"),
-            or_(is_global, and_(*covers)).label("covers_all"),
-            or_(is_global, *intersects_conditions).label("intersects_some"),
-            or_(is_global, and_(*intersects_conditions)).label("intersects_all"),
+        return (
+            stmt.join(match, true())
+            .add_columns(*columns)
+            .where(or_(match.c.is_global, match.c.intersects_some))
         )
 
+    def apply_temporal_filters(self, stmt):
+        self.logger.info("Filtering by temporal extent")
+
+        # Filter resources where any of the extents overlap at least one of
+        # the requested years. Uses the GiST index on date_range. An extent
+        # without an end date runs until the end of the current year, so the
+        # stored unbounded range only narrows the candidates for those.
+        year_ranges = cast(bindparam("year_ranges"), DATEMULTIRANGE)
+        open_extent = func.daterange(
+            TemporalExtent.start_date,
+            func.greatest(TemporalExtent.start_date, CURRENT_YEAR_END),
+            "[]",
+            type_=DATERANGE,
+        )
         return stmt.where(
-            or_(
-                is_global,
+            Resource.temporal_extent.any(
                 and_(
-                    or_(*envelope_intersects_conditions),
-                    or_(*intersects_conditions, *covers),
-                ),
+                    TemporalExtent.date_range.overlaps(year_ranges),
+                    or_(
+                        ~func.upper_inf(TemporalExtent.date_range),
+                        open_extent.overlaps(year_ranges),
+                    ),
+                )
             )
         )
 
-    def apply_temporal_filters(self, stmt, resources_req):
-        logging.info("Filtering by temporal extent")
 
-        from data_catalog_backend.models import TemporalExtent
+def keyword_match(tag) -> ColumnElement:
+    """Whether one of the keywords of a resource is the tag, ignoring case."""
+    return exists(
+        select(literal_column("1"))
+        .select_from(func.unnest(Resource.keywords).alias("keyword"))
+        .where(func.lower(literal_column("keyword")) == func.lower(tag))
+    )
 
-        TemporalExtentAlias = aliased(TemporalExtent)
 
-        dates = []
-        for year in resources_req.years:
-            dates.append(datetime.strptime(year, "%Y"))
+def keyset_condition(keys: list[tuple[ColumnElement, bool, ColumnElement]]):
+    """Returns the condition for rows after a cursor, given each sort key
+    with whether it is descending and its value in the cursor.
 
-        current_year = datetime.today().year
+    Keys in one direction are compared as a row, which an index on them
+    can serve. Otherwise a row comes after the cursor if it is after it in
+    one key and equal in all keys before.
+    """
+    if len({descending for _, descending, _ in keys}) == 1:
+        row = tuple_(*[expression for expression, _, _ in keys])
+        cursor = tuple_(*[value for _, _, value in keys])
+        return row < cursor if keys[0][1] else row > cursor
+    return or_(
+        *[
+            and_(
+                *[keys[j][0] == keys[j][2] for j in range(i)],
+                expression < value if descending else expression > value,
+            )
+            for i, (expression, descending, value) in enumerate(keys)
+        ]
+    )
 
-        # Outer join TemporalExtent to Resource
-        stmt = stmt.outerjoin(
-            TemporalExtentAlias, TemporalExtentAlias.resource_id == Resource.id
-        )
 
-        # Extract years from request
-        request_years = [date.year for date in dates]
-
-        # Build a list of year range checks
-        year_within_extent_conditions = []
-        for year in request_years:
-            start_check = func.extract("year", TemporalExtentAlias.start_date) <= year
-            end_check = (
-                func.extract(
-                    "year",
-                    func.coalesce(
-                        TemporalExtentAlias.end_date, datetime(current_year, 1, 1)
-                    ),
-                )
-                >= year
-            )
-            year_within_extent_conditions.append(and_(start_check, end_check))
+def sort_key_names(stmt: Select) -> list[str]:
+    return [
+        column.key
+        for column in stmt.selected_columns
+        if column.key.startswith(SORT_KEY_PREFIX)
+    ]
 
-        # Filter resources where any of the extents match at least one year
-        stmt = stmt.where(or_(*year_within_extent_conditions))
 
-        return stmt
+def sort_key_types(stmt: Select) -> list[type]:
+    """Returns the Python types of the sort key values of a page statement,
+    which cursor values are converted to before they are bound."""
+    return [
+        column.type.python_type
+        for column in stmt.selected_columns
+        if column.key.startswith(SORT_KEY_PREFIX)
+    ]
+
+
+def year_multirange(
+    years: list[int], year_from: Optional[int] = None, year_to: Optional[int] = None
+) -> str:
+    """Returns the requested years as a datemultirange literal.
+
+    Consecutive years are merged into one range. A range of years without
+    a first or last year is unbounded on that side.
+    """
+    intervals = [(year, year) for year in years]
+    if year_from is not None or year_to is not None:
+        lower = year_from if year_from is not None else -math.inf
+        upper = year_to if year_to is not None else math.inf
+        if lower <= upper:
+            intervals.append((lower, upper))
+
+    ranges = []
+    for lower, upper in sorted(intervals):
+        if ranges and ranges[-1][1] >= lower - 1:
+            ranges[-1] = (ranges[-1][0], max(ranges[-1][1], upper))
+        else:
+            ranges.append((lower, upper))
+
+    return (
+        "{"
+        + ",".join(
+            f"[{date(lower, 1, 1) if lower != -math.inf else ''},"
+            f"{date(upper, 12, 31) if upper != math.inf else ''}]"
+            for lower, upper in ranges
+        )
+        + "}"
+    )
+
+
+@lru_cache(maxsize=256)
+def _cached_statements(query_shape: QueryShape) -> tuple[Select, Select]:
+    logger.debug(f"Building resource search statements for {query_shape}")
+    return ResourceQuery().build_statements(query_shape)
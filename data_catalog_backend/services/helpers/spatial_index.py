@@ -0,0 +1,281 @@
+import abc
+import logging
+import threading
+import time
+import uuid
+from typing import Any, Generic, Iterable, NamedTuple, Optional, TypeVar
+
+import shapely
+from shapely import STRtree
+from shapely.geometry.base import BaseGeometry
+from sqlalchemy import Select, func, select
+from sqlalchemy.orm import Session
+
+from data_catalog_backend.config import settings
+from data_catalog_backend.models import (
+    Geometry,
+    SpatialExtent,
+    SpatialExtentType,
+    spatial_extent_geometry_relation,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def spatial_change_token() -> Select:
+    """Returns a statement whose result changes when geometries, spatial
+    extents or the links between them are added, updated or removed.
+
+    Moving an extent to another resource changes its updated_at.
+    """
+    return select(
+        select(func.count()).select_from(Geometry).scalar_subquery(),
+        select(func.max(Geometry.updated_at)).scalar_subquery(),
+        select(func.count()).select_from(SpatialExtent).scalar_subquery(),
+        select(func.max(SpatialExtent.updated_at)).scalar_subquery(),
+        select(func.count())
+        .select_from(spatial_extent_geometry_relation)
+        .scalar_subquery(),
+    )
+
+
+class RefreshingIndex(abc.ABC, Generic[T]):
+    """An in-memory index that is rebuilt when the underlying tables change.
+
+    Subclasses provide a statement returning a change token and a way to
+    build the index from the database. The token is checked at most once
+    per ``refresh_seconds``; writes in this process can call ``invalidate``
+    to have the next lookup check right away.
+    """
+
+    def __init__(self, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._index: Optional[T] = None
+        self._token: Any = None
+        self._checked_at: Optional[float] = None
+
+    @abc.abstractmethod
+    def change_token_statement(self) -> Select: ...
+
+    @abc.abstractmethod
+    def build(self, session: Session) -> T: ...
+
+    @property
+    def loaded(self) -> bool:
+        return self._index is not None
+
+    def invalidate(self) -> None:
+        """Rebuilds the index on the next lookup, also when the change token
+        misses a write."""
+        with self._lock:
+            self._checked_at = None
+            self._token = None
+
+    def load(self, session: Session) -> None:
+        """Builds the index unconditionally."""
+        token = tuple(session.execute(self.change_token_statement()).one())
+        index = self.build(session)
+        with self._lock:
+            self._index, self._token = index, token
+            self._checked_at = time.monotonic()
+        logger.info(f"Loaded {type(self).__name__}")
+
+    def get(self, session: Session) -> T:
+        """Returns the index, rebuilding it first if the tables changed."""
+        now = time.monotonic()
+        with self._lock:
+            due = (
+                self._checked_at is None
+                or now - self._checked_at >= self.refresh_seconds
+            )
+            if due and self._index is not None:
+                # Let concurrent lookups use the current index meanwhile
+                self._checked_at = now
+        if due:
+            token = tuple(session.execute(self.change_token_statement()).one())
+            if token != self._token or self._index is None:
+                index = self.build(session)
+                with self._lock:
+                    self._index, self._token = index, token
+                logger.info(f"Rebuilt {type(self).__name__}")
+            with self._lock:
+                self._checked_at = time.monotonic()
+        return self._index
+
+
+class NamedGeometries(NamedTuple):
+    tree: STRtree
+    ids: list[uuid.UUID]
+    names: list[str]
+    # Resources whose spatial extents use each geometry
+    resource_ids: list[frozenset[uuid.UUID]]
+    # Resources with a global spatial extent, which contain any location
+    global_resource_ids: frozenset[uuid.UUID]
+
+    @classmethod
+    def from_rows(
+        cls,
+        geometries: Iterable[tuple[uuid.UUID, str, bytes]],
+        links: Iterable[tuple[uuid.UUID, uuid.UUID]],
+        global_resource_ids: Iterable[uuid.UUID],
+        tolerance: float,
+    ) -> "NamedGeometries":
+        geometries = list(geometries)
+        shapes = shapely.from_wkb([bytes(wkb) for _, _, wkb in geometries])
+        shapes = shapely.make_valid(shapes)
+        if tolerance > 0:
+            shapes = shapely.simplify(shapes, tolerance, preserve_topology=True)
+
+        resources_by_geometry: dict[uuid.UUID, set[uuid.UUID]] = {}
+        for geometry_id, resource_id in links:
+            resources_by_geometry.setdefault(geometry_id, set()).add(resource_id)
+
+        return cls(
+            tree=STRtree(shapes),
+            ids=[geometry_id for geometry_id, _, _ in geometries],
+            names=[name for _, name, _ in geometries],
+            resource_ids=[
+                frozenset(resources_by_geometry.get(geometry_id, ()))
+                for geometry_id, _, _ in geometries
+            ],
+            global_resource_ids=frozenset(global_resource_ids),
+        )
+
+    def covering(
+        self, geometry: BaseGeometry
+    ) -> tuple[list[tuple[uuid.UUID, str]], set[uuid.UUID]]:
+        """Returns the named geometries and the resources that cover a geometry."""
+        hits = sorted(self.tree.query(geometry, predicate="covered_by"))
+        named = [(self.ids[i], self.names[i]) for i in hits]
+        resources = set(self.global_resource_ids)
+        for i in hits:
+            resources.update(self.resource_ids[i])
+        return named, resources
+
+
+class GeometryIndex(RefreshingIndex[NamedGeometries]):
+    """STRtree over simplified copies of all named geometries."""
+
+    def __init__(self, refresh_seconds: float, tolerance: float):
+        super().__init__(refresh_seconds)
+        self.tolerance = tolerance
+
+    def change_token_statement(self) -> Select:
+        return spatial_change_token()
+
+    def build(self, session: Session) -> NamedGeometries:
+        geometries = session.execute(
+            select(Geometry.id, Geometry.name, func.ST_AsBinary(Geometry.geometry))
+        ).all()
+        links = session.execute(
+            select(
+                spatial_extent_geometry_relation.c.geometry_id,
+                SpatialExtent.resource_id,
+            ).join(
+                SpatialExtent,
+                SpatialExtent.id
+                == spatial_extent_geometry_relation.c.spatial_extent_id,
+            )
+        ).all()
+        global_resource_ids = session.scalars(
+            select(SpatialExtent.resource_id)
+            .where(SpatialExtent.type == SpatialExtentType.Global)
+            .distinct()
+        ).all()
+        return NamedGeometries.from_rows(
+            geometries, links, global_resource_ids, self.tolerance
+        )
+
+
+class ResourceAreas(NamedTuple):
+    # Built over the parts of the simplified area of each resource, grown by
+    # the simplification tolerance so that they contain the original area.
+    # Separate parts keep the bounding boxes of scattered regions small.
+    tree: STRtree
+    part_owners: list[int]
+    resource_ids: list[uuid.UUID]
+    global_resource_ids: frozenset[uuid.UUID]
+
+    @classmethod
+    def from_rows(
+        cls,
+        # A resource with several spatial extents has one row for each
+        areas: Iterable[tuple[uuid.UUID, bytes]],
+        global_resource_ids: Iterable[uuid.UUID],
+        tolerance: float,
+    ) -> "ResourceAreas":
+        areas = list(areas)
+        shapes = shapely.make_valid(shapely.from_wkb([bytes(wkb) for _, wkb in areas]))
+        if tolerance > 0:
+            shapes = shapely.simplify(shapes, tolerance, preserve_topology=True)
+            # Square caps and mitred joins contain the round buffer, which
+            # contains every point within the tolerance of the simplified area
+            shapes = shapely.buffer(
+                shapes, tolerance, cap_style="square", join_style="mitre"
+            )
+        parts, part_owners = shapely.get_parts(shapes, return_index=True)
+        return cls(
+            tree=STRtree(parts),
+            part_owners=part_owners.tolist(),
+            resource_ids=[resource_id for resource_id, _ in areas],
+            global_resource_ids=frozenset(global_resource_ids),
+        )
+
+    def candidates(self, features: list[BaseGeometry]) -> list[uuid.UUID]:
+        """Returns the resources that may intersect any of the features.
+
+        Resources left out are certain not to match. The ones returned
+        still need an exact check against their full geometries.
+        """
+        _, hits = self.tree.query(features, predicate="intersects")
+        candidates = set(self.global_resource_ids)
+        candidates.update(
+            self.resource_ids[self.part_owners[i]] for i in set(hits.tolist())
+        )
+        return sorted(candidates)
+
+
+class ExtentIndex(RefreshingIndex[ResourceAreas]):
+    """STRtree over the stored spatial extent geometries of each resource."""
+
+    def __init__(self, refresh_seconds: float, tolerance: float):
+        super().__init__(refresh_seconds)
+        self.tolerance = tolerance
+
+    def change_token_statement(self) -> Select:
+        return spatial_change_token()
+
+    def build(self, session: Session) -> ResourceAreas:
+        areas = session.execute(
+            select(
+                SpatialExtent.resource_id, func.ST_AsBinary(SpatialExtent.geometry)
+            ).where(SpatialExtent.geometry.is_not(None))
+        ).all()
+        global_resource_ids = session.scalars(
+            select(SpatialExtent.resource_id)
+            .where(SpatialExtent.type == SpatialExtentType.Global)
+            .distinct()
+        ).all()
+        return ResourceAreas.from_rows(areas, global_resource_ids, self.tolerance)
+
+
+geometry_index = GeometryIndex(
+    refresh_seconds=settings.spatial_index_refresh_seconds,
+    tolerance=settings.spatial_index_tolerance,
+)
+extent_index = ExtentIndex(
+    refresh_seconds=settings.spatial_index_refresh_seconds,
+    tolerance=settings.spatial_prefilter_tolerance,
+)
+
+
+def invalidate_spatial_indexes() -> None:
+    """Makes the next lookup check whether the spatial indexes are stale.
+
+    Called after admin writes to geometries or spatial extents.
+    """
+    geometry_index.invalidate()
+    extent_index.invalidate()
@@ -0,0 +1,194 @@
+import bisect
+import heapq
+import re
+import uuid
+from typing import Iterable, NamedTuple, Optional
+
+from sqlalchemy import Select, distinct, func, literal, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import Session
+
+from data_catalog_backend.config import settings
+from data_catalog_backend.models import (
+    Category,
+    Geometry,
+    Provider,
+    Resource,
+    ResourceCategory,
+    ResourceProvider,
+    SpatialExtent,
+    spatial_extent_geometry_relation,
+)
+from data_catalog_backend.schemas.suggestion import SuggestionResponse, SuggestionType
+from data_catalog_backend.services.helpers.spatial_index import RefreshingIndex
+
+# Most suggestions returned for a prefix
+MAX_SUGGESTIONS = 20
+# The best suggestions for prefixes up to this length are kept at build
+# time, as these prefixes match a large share of all entries
+SHORT_PREFIX = 2
+
+WORD = re.compile(r"\w+")
+
+
+def normalize(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+def suggestion_change_token() -> Select:
+    """Returns a statement whose result changes when any suggested text or
+    the number of resources it leads to changes."""
+
+    def names(column) -> Select:
+        return select(
+            func.md5(func.string_agg(column, aggregate_order_by(literal("|"), column)))
+        )
+
+    return select(
+        select(func.count()).select_from(Resource).scalar_subquery(),
+        select(func.max(Resource.updated_at)).scalar_subquery(),
+        names(Category.title).scalar_subquery(),
+        names(Provider.name).scalar_subquery(),
+        select(func.count()).select_from(Geometry).scalar_subquery(),
+        select(func.max(Geometry.updated_at)).scalar_subquery(),
+        select(func.count()).select_from(ResourceCategory).scalar_subquery(),
+        select(func.count()).select_from(ResourceProvider).scalar_subquery(),
+        select(func.count()).select_from(SpatialExtent).scalar_subquery(),
+        select(func.count())
+        .select_from(spatial_extent_geometry_relation)
+        .scalar_subquery(),
+    )
+
+
+class Suggestions(NamedTuple):
+    # Entries, best first, so that a lower position is a better suggestion
+    entries: list[SuggestionResponse]
+    # The normalized text from the start of each word of each entry, sorted,
+    # and the position of the entry it belongs to
+    keys: list[str]
+    owners: list[int]
+    # Positions of the best entries for each prefix up to SHORT_PREFIX long
+    short: dict[str, list[int]]
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[SuggestionResponse]) -> "Suggestions":
+        # Texts that differ only in case are one suggestion, spelled the way
+        # that leads to the most resources
+        merged: dict[tuple[SuggestionType, str, Optional[uuid.UUID]], list] = {}
+        for entry in entries:
+            key = (entry.type, normalize(entry.text), entry.resource_id)
+            if not key[1]:
+                continue
+            if key not in merged:
+                merged[key] = [entry, 0]
+            elif entry.resources > merged[key][0].resources:
+                merged[key][0] = entry
+            merged[key][1] += entry.resources
+        ranked = sorted(
+            (
+                entry.model_copy(update={"resources": resources})
+                for entry, resources in merged.values()
+            ),
+            key=lambda entry: (-entry.resources, len(entry.text), entry.text),
+        )
+
+        keyed = []
+        short: dict[str, list[int]] = {}
+        for position, entry in enumerate(ranked):
+            text = normalize(entry.text)
+            starts = {match.start() for match in WORD.finditer(text)} or {0}
+            keyed.extend((text[start:], position) for start in starts)
+            for prefix in {
+                text[start : start + length]
+                for start in starts
+                for length in range(1, SHORT_PREFIX + 1)
+            }:
+                best = short.setdefault(prefix, [])
+                if len(best) < MAX_SUGGESTIONS:
+                    best.append(position)
+        keyed.sort()
+        return cls(
+            entries=ranked,
+            keys=[key for key, _ in keyed],
+            owners=[position for _, position in keyed],
+            short=short,
+        )
+
+    def lookup(self, prefix: str, limit: int) -> list[SuggestionResponse]:
+        """Returns the best entries with a word that starts with the prefix.
+
+        A prefix of several words matches entries that contain those words
+        in order, the last one possibly incomplete.
+        """
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        if len(prefix) <= SHORT_PREFIX and limit <= MAX_SUGGESTIONS:
+            return [self.entries[i] for i in self.short.get(prefix, [])[:limit]]
+        start = bisect.bisect_left(self.keys, prefix)
+        # Every key that starts with the prefix sorts before this one
+        end = bisect.bisect_left(self.keys, prefix + "\U0010ffff", lo=start)
+        positions = set(self.owners[start:end])
+        return [self.entries[i] for i in heapq.nsmallest(limit, positions)]
+
+
+class SuggestionIndex(RefreshingIndex[Suggestions]):
+    """Prefix index over resource titles, keywords, category titles,
+    provider names and the names of regions that resources cover."""
+
+    def change_token_statement(self) -> Select:
+        return suggestion_change_token()
+
+    def build(self, session: Session) -> Suggestions:
+        keywords = select(
+            Resource.id, func.unnest(Resource.keywords).label("keyword")
+        ).subquery()
+        queries = {
+            SuggestionType.Keyword: select(
+                keywords.c.keyword, func.count(distinct(keywords.c.id))
+            ).group_by(keywords.c.keyword),
+            SuggestionType.Category: select(
+                Category.title, func.count(ResourceCategory.resource_id)
+            )
+            .join(ResourceCategory, ResourceCategory.category_id == Category.id)
+            .group_by(Category.id),
+            SuggestionType.Provider: select(
+                Provider.name, func.count(ResourceProvider.resource_id)
+            )
+            .join(ResourceProvider, ResourceProvider.provider_id == Provider.id)
+            .group_by(Provider.id),
+            SuggestionType.Region: select(
+                Geometry.name, func.count(distinct(SpatialExtent.resource_id))
+            )
+            .join(
+                spatial_extent_geometry_relation,
+                spatial_extent_geometry_relation.c.geometry_id == Geometry.id,
+            )
+            .join(
+                SpatialExtent,
+                SpatialExtent.id
+                == spatial_extent_geometry_relation.c.spatial_extent_id,
+            )
+            .group_by(Geometry.id),
+        }
+        entries = [
+            SuggestionResponse(
+                text=title,
+                type=SuggestionType.Resource,
+                resource_id=resource_id,
+                resources=1,
+            )
+            for resource_id, title in session.execute(
+                select(Resource.id, Resource.title)
+            )
+        ]
+        for suggestion_type, stmt in queries.items():
+            entries.extend(
+                SuggestionResponse(text=text, type=suggestion_type, resources=count)
+                for text, count in session.execute(stmt)
+                if text
+            )
+        return Suggestions.from_entries(entries)
+
+
+suggestion_index = SuggestionIndex(refresh_seconds=settings.suggest_refresh_seconds)
@@ -0,0 +1,149 @@
+import logging
+import threading
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Optional
+
+from sqlalchemy import UUID, BigInteger, Float, Insert, bindparam, func, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.orm import Session
+
+from data_catalog_backend.config import settings
+from data_catalog_backend.database import USE_PRIMARY, SessionLocal
+from data_catalog_backend.models import Resource, ResourcePopularity
+
+logger = logging.getLogger(__name__)
+
+# Start of the forward decayed popularity scores. Weights double every
+# half-life from here, which stays far within float range for decades.
+POPULARITY_EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def view_weight(at: datetime, half_life_days: float) -> float:
+    """Returns what one view at a time adds to a popularity score."""
+    days = (at - POPULARITY_EPOCH).total_seconds() / 86400
+    return 2 ** (days / half_life_days)
+
+
+@lru_cache(maxsize=1)
+def _upsert_statement() -> Insert:
+    views = (
+        func.unnest(
+            bindparam("resource_ids", type_=ARRAY(UUID)),
+            bindparam("view_counts", type_=ARRAY(BigInteger)),
+        )
+        .table_valued("resource_id", "view_count")
+        .render_derived(name="views")
+    )
+    # Views of resources that were deleted in the meantime are dropped, and
+    # rows are written in id order so concurrent flushes lock them in order
+    rows = (
+        select(
+            Resource.id,
+            views.c.view_count,
+            views.c.view_count * bindparam("weight", type_=Float),
+            func.now(),
+        )
+        .join(views, views.c.resource_id == Resource.id)
+        .order_by(Resource.id)
+    )
+    table = ResourcePopularity.__table__
+    upsert = insert(table).from_select(
+        ["resource_id", "view_count", "score", "updated_at"], rows
+    )
+    return upsert.on_conflict_do_update(
+        index_elements=[table.c.resource_id],
+        set_={
+            "view_count": table.c.view_count + upsert.excluded.view_count,
+            "score": table.c.score + upsert.excluded.score,
+            "updated_at": upsert.excluded.updated_at,
+        },
+    )
+
+
+class ViewCounter:
+    """Counts resource views in memory and writes them in batches.
+
+    Views are added up per resource and written with one upsert every flush
+    interval, so viewing a resource does not write to the primary database.
+    At most ``max_pending`` resources are counted between flushes, and views
+    that are not flushed yet are lost if the process is killed.
+    """
+
+    def __init__(self, flush_seconds: float, max_pending: int):
+        self.flush_seconds = flush_seconds
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._counts: Counter[uuid.UUID] = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def record(self, resource_id: uuid.UUID) -> None:
+        with self._lock:
+            if (
+                resource_id not in self._counts
+                and len(self._counts) >= self.max_pending
+            ):
+                return
+            self._counts[resource_id] += 1
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="view-counts", daemon=True
+                )
+                self._thread.start()
+
+    def flush(self, session: Session) -> int:
+        """Writes the views counted so far and returns the number of resources."""
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+        if not counts:
+            return 0
+        resource_ids = sorted(counts)
+        try:
+            session.execute(
+                _upsert_statement(),
+                {
+                    "resource_ids": resource_ids,
+                    "view_counts": [counts[id] for id in resource_ids],
+                    "weight": view_weight(
+                        datetime.now(timezone.utc), settings.popularity_half_life_days
+                    ),
+                },
+            )
+            session.commit()
+        except Exception:
+            session.rollback()
+            # Counted again with the next flush
+            with self._lock:
+                self._counts.update(counts)
+            raise
+        return len(resource_ids)
+
+    def _flush(self) -> None:
+        try:
+            with SessionLocal() as session:
+                session.info[USE_PRIMARY] = True
+                self.flush(session)
+        except Exception as e:
+            logger.error(f"Could not write resource view counts: {e}")
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_seconds):
+            self._flush()
+
+    def shutdown(self) -> None:
+        """Stops the flush thread and writes the remaining views."""
+        self._stop.set()
+        with self._lock:
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        self._flush()
+
+
+view_counter = ViewCounter(
+    flush_seconds=settings.view_counts_flush_seconds,
+    max_pending=settings.view_counts_max_pending,
+)
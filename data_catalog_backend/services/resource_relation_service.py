@@ -1,7 +1,25 @@
 import logging
+import uuid
+from typing import Optional
 
-from data_catalog_backend.models import resource_relation
-from data_catalog_backend.schemas.resource import ResourceRelationRequest
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from data_catalog_backend.models import Resource, resource_relation
+from data_catalog_backend.schemas.resource import (
+    ResourceLineageEdge,
+    ResourceLineageNode,
+    ResourceLineageResponse,
+    ResourceRelationRequest,
+    ResourceRelationResponse,
+)
+from data_catalog_backend.services.helpers.collection_aggregates import (
+    refresh_collection_aggregates,
+)
+from data_catalog_backend.services.helpers.resource_lineage import (
+    LineageDirection,
+    lineage_statement,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -13,7 +31,7 @@ class ResourceRelationService:
 
     def create_resource_relation(
         self, resource_relation_req: ResourceRelationRequest
-    ) -> None:
+    ) -> ResourceRelationResponse:
         parent = self.resource_service.find_entity_with_name(
             resource_relation_req.parent
         )
@@ -32,3 +50,109 @@ class ResourceRelationService:
         except Exception as e:
             self.session.rollback()
             raise e
+        refresh_collection_aggregates(self.session, [parent.id])
+        return ResourceRelationResponse(used_by=parent.id, based_on=child.id)
+
+    def create_resource_relations(
+        self, resource_relation_reqs: list[ResourceRelationRequest]
+    ) -> list[ResourceRelationResponse]:
+        """Adds many relations at once and returns the ones that are new.
+
+        All titles are resolved with one query, and relations that already
+        exist are skipped.
+        """
+        titles = {req.parent for req in resource_relation_reqs} | {
+            req.child for req in resource_relation_reqs
+        }
+        ids: dict[str, uuid.UUID] = {}
+        ambiguous = set()
+        for title, resource_id in self.session.execute(
+            select(Resource.title, Resource.id).where(Resource.title.in_(titles))
+        ):
+            if title in ids:
+                ambiguous.add(title)
+            ids[title] = resource_id
+        missing = titles - ids.keys()
+        if missing:
+            raise ValueError(f"Resources not found: {', '.join(sorted(missing))}")
+        if ambiguous:
+            raise ValueError(
+                f"Titles used by more than one resource: {', '.join(sorted(ambiguous))}"
+            )
+
+        edges = list(
+            dict.fromkeys(
+                (ids[req.parent], ids[req.child]) for req in resource_relation_reqs
+            )
+        )
+        for parent_id, child_id in edges:
+            if parent_id == child_id:
+                raise ValueError("A resource cannot be related to itself")
+        if not edges:
+            return []
+
+        stmt = (
+            insert(resource_relation)
+            .on_conflict_do_nothing()
+            .returning(resource_relation.c.parent_id, resource_relation.c.child_id)
+        )
+        try:
+            created = self.session.execute(
+                stmt,
+                [
+                    {"parent_id": parent_id, "child_id": child_id}
+                    for parent_id, child_id in edges
+                ],
+            ).all()
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            raise e
+        logger.info(f"Added {len(created)} of {len(edges)} resource relations")
+        refresh_collection_aggregates(
+            self.session, [parent_id for parent_id, _ in created]
+        )
+        return [
+            ResourceRelationResponse(used_by=parent_id, based_on=child_id)
+            for parent_id, child_id in created
+        ]
+
+    def get_lineage(
+        self, resource_id: uuid.UUID, direction: LineageDirection, depth: int
+    ) -> Optional[ResourceLineageResponse]:
+        """Returns the ancestors or descendants of a resource up to a depth.
+
+        The whole lineage is read with one query. A related resource that is
+        reached along several branches is returned once, at its lowest
+        depth. Returns None if the resource does not exist.
+        """
+        rows = self.session.execute(
+            lineage_statement(direction),
+            {"resource_id": resource_id, "max_depth": depth},
+        ).all()
+        if not rows and not self.session.scalar(
+            select(Resource.id).where(Resource.id == resource_id)
+        ):
+            return None
+
+        nodes: dict[uuid.UUID, ResourceLineageNode] = {}
+        edges: dict[tuple[uuid.UUID, uuid.UUID], bool] = {}
+        for row in rows:
+            if row.id != resource_id and row.id not in nodes:
+                # Rows are ordered by depth
+                nodes[row.id] = ResourceLineageNode.model_validate(row)
+            if direction == LineageDirection.Ancestors:
+                edge = (row.id, row.near_id)
+            else:
+                edge = (row.near_id, row.id)
+            edges[edge] = edges.get(edge, False) or row.is_cycle
+
+        return ResourceLineageResponse(
+            resource_id=resource_id,
+            depth=depth,
+            nodes=list(nodes.values()),
+            edges=[
+                ResourceLineageEdge(parent=parent, child=child, cycle=cycle)
+                for (parent, child), cycle in edges.items()
+            ],
+        )
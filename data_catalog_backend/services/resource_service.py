@@ -1,13 +1,16 @@
 import logging
 import uuid
+import zlib
 from datetime import datetime
 from typing import Optional
 
+import shapely
 from fastapi import HTTPException
-from sqlalchemy import select, func, and_, case
+from sqlalchemy import select, func, and_, case, delete, or_
 from sqlalchemy.orm import joinedload, Session
 from sqlalchemy.sql.functions import user
 
+from data_catalog_backend.config import settings
 from data_catalog_backend.exceptions import (
     LicenseNotFoundError,
     ProviderNotFoundError,
@@ -25,21 +28,43 @@ from data_catalog_backend.models import (
     TemporalExtent,
     Provider,
     License,
+    resource_relation,
 )
 from data_catalog_backend.schemas.User import User
-from data_catalog_backend.schemas.resource import ResourceRequest
+from data_catalog_backend.schemas.resource import ResourceRequest, ResourceView
 
 from data_catalog_backend.schemas.resource_query import (
+    ResourceQueryPage,
     ResourceQueryRequest,
-    ResourceQuerySpatialResponse,
-    ResourceQueryResponse,
+    resource_query_adapter,
 )
 from data_catalog_backend.services.category_service import CategoryService
 from data_catalog_backend.services.code_example_service import CodeExampleService
 from data_catalog_backend.services.example_service import ExampleService
 from data_catalog_backend.services.geometry_service import GeometryService
-from data_catalog_backend.services.helpers.resource_queries import ResourceQuery
+from data_catalog_backend.services.helpers.collection_aggregates import (
+    refresh_collection_aggregates,
+)
+from data_catalog_backend.services.helpers.extent_geometries import (
+    extent_geometry_updater,
+)
+from data_catalog_backend.services.helpers.geometry_processing import (
+    feature_collection_json,
+)
+from data_catalog_backend.services.helpers.resource_loading import (
+    resource_load_options,
+)
+from data_catalog_backend.services.helpers.resource_queries import (
+    ResourceQuery,
+    sort_key_types,
+)
+from data_catalog_backend.services.helpers.spatial_index import (
+    extent_index,
+    invalidate_spatial_indexes,
+)
+from data_catalog_backend.services.helpers.suggestions import suggestion_index
 from data_catalog_backend.services.license_service import LicenseService
+from data_catalog_backend.utils.cursors import decode_cursor, encode_cursor
 from data_catalog_backend.services.provider_service import ProviderService
 
 logger = logging.getLogger(__name__)
@@ -69,81 +94,105 @@ class ResourceService:
         return self.session.scalars(stmt).unique().one_or_none()
 
     def get_resources(
-        self, page: int, per_page: int, resources_req: ResourceQueryRequest
-    ):
-        base_stmt = (
-            select(
-                Resource.id,
-                Resource.title,
-                Resource.abstract,
-                Resource.type,
-                Category.icon.label("icon"),
-                Resource.has_spatial_extent,
-                Resource.spatial_extent_type,
-            )
-            .select_from(Resource)
-            .join(
-                ResourceCategory,
-                and_(
-                    ResourceCategory.resource_id == Resource.id,
-                    ResourceCategory.is_main_category.is_(True),
-                ),
-            )
-            .join(Category, Category.id == ResourceCategory.category_id)
-        )
-
+        self,
+        page: int,
+        per_page: int,
+        resources_req: ResourceQueryRequest,
+        fields: tuple[str, ...] = (),
+        cursor: Optional[str] = None,
+    ) -> ResourceQueryPage:
+        """Returns a page of search results, with only ``fields`` if given.
+
+        With a cursor from a previous page, returns the results after it
+        instead of the page with the given number. Raises ValueError for
+        invalid cursors and sort orders.
+        """
         query = ResourceQuery()
-        if resources_req.tags:
-            base_stmt = query.apply_tag_filters(base_stmt, resources_req)
-        if resources_req.types:
-            base_stmt = query.apply_type_filters(base_stmt, resources_req)
-        if resources_req.categories:
-            base_stmt = query.apply_category_filters(base_stmt, resources_req)
-        if resources_req.providers:
-            base_stmt = query.apply_provider_filters(base_stmt, resources_req)
-        if resources_req.features:
-            base_stmt = query.apply_features_filters(base_stmt, resources_req)
-        if resources_req.years:
-            base_stmt = query.apply_temporal_filters(base_stmt, resources_req)
-        if resources_req.spatial or resources_req.features:
-            base_stmt = base_stmt.outerjoin(SpatialExtent)
-            if resources_req.features:
-                base_stmt = query.apply_features_filters(base_stmt, resources_req)
-            if resources_req.spatial:
-                base_stmt = query.apply_spatial_filters(base_stmt, resources_req)
-
-        group_by = [
-            Resource.id,
-            Resource.title,
-            Resource.type,
-            Category.icon,
-            Resource.has_spatial_extent,
-            Resource.spatial_extent_type,
-        ]
-        if resources_req.features and len(resources_req.features) > 0:
-            group_by.append(SpatialExtent.id)
-
-        base_stmt = base_stmt.group_by(*group_by)
-        base_stmt = base_stmt.distinct(Resource.title)
-        base_stmt = base_stmt.order_by(Resource.title)
-
-        total_stmt = select(func.count()).select_from(base_stmt.subquery())
-        total = self.session.execute(total_stmt).scalar()
-
-        # Pagination
-        stmt = base_stmt.offset(per_page * page).limit(per_page)
-        results = self.session.execute(stmt).mappings().all()
-
-        return ResourceQueryResponse(
-            current_page=page,
+        prefiltered = bool(resources_req.features) and settings.spatial_index_enabled
+        stmt, total_stmt = query.statements(
+            resources_req, prefiltered, fields, keyset=bool(cursor)
+        )
+        scope = query.cursor_scope(resources_req)
+        after = None
+        if cursor:
+            after = decode_cursor(cursor, scope, sort_key_types(stmt))
+        params = query.parameters(resources_req, page, per_page, after)
+        if prefiltered:
+            # Resources that cannot match are ruled out in memory, so the
+            # exact spatial checks only run for the remaining ones
+            params["candidate_ids"] = extent_index.get(self.session).candidates(
+                list(shapely.from_wkb(params["features"]))
+            )
+            if not params["candidate_ids"]:
+                return ResourceQueryPage(None if cursor else page, 0, [], fields)
+
+        total = self.session.execute(total_stmt, params).scalar()
+        results = self.session.execute(stmt, params).all()
+        next_cursor = None
+        if len(results) > per_page:
+            results = results[:per_page]
+            next_cursor = encode_cursor(scope, query.cursor(stmt, results[-1]))
+
+        return ResourceQueryPage(
+            # A page after a cursor has no number
+            current_page=None if cursor else page,
             total_pages=total // per_page + (total % per_page > 0),
-            data=[ResourceQuerySpatialResponse(**dict(row)) for row in results],
+            data=resource_query_adapter(fields).validate_python(results),
+            fields=fields,
+            next_cursor=next_cursor,
         )
 
     def get_resource(self, resource_id: uuid.UUID) -> Resource:
         stmt = select(Resource).where(Resource.id == resource_id)
         return self.session.scalars(stmt).unique().one_or_none()
 
+    def get_resource_view(
+        self, resource_id: uuid.UUID, view: ResourceView
+    ) -> Optional[Resource]:
+        """Returns a resource with only the columns and related objects of
+        a view loaded."""
+        stmt = (
+            select(Resource)
+            .where(Resource.id == resource_id)
+            .options(*resource_load_options(view))
+        )
+        return self.session.scalars(stmt).unique().one_or_none()
+
+    def get_resources_by_ids(
+        self, resource_ids: list[uuid.UUID], view: ResourceView
+    ) -> tuple[list[Resource], list[uuid.UUID]]:
+        """Returns the resources with some ids in the order of the ids, and
+        the ids that were not found.
+
+        The resources are loaded with one query, plus one per included
+        relationship. Shared objects such as providers, categories and
+        licenses are loaded once and shared between the resources.
+        """
+        resource_ids = list(dict.fromkeys(resource_ids))
+        stmt = (
+            select(Resource)
+            .where(Resource.id.in_(resource_ids))
+            .options(*resource_load_options(view))
+        )
+        found = {
+            resource.id: resource
+            for resource in self.session.scalars(stmt).unique().all()
+        }
+        return (
+            [found[id] for id in resource_ids if id in found],
+            [id for id in resource_ids if id not in found],
+        )
+
+    def get_resource_summaries(self, resource_ids) -> list[Resource]:
+        if not resource_ids:
+            return []
+        stmt = (
+            select(Resource)
+            .where(Resource.id.in_(resource_ids))
+            .order_by(Resource.title, Resource.id)
+        )
+        return list(self.session.scalars(stmt).all())
+
     def create_resource(self, resource_req: ResourceRequest, user: User) -> Resource:
         try:
             license = self.license_service.get_license_by_name(resource_req.license)
@@ -276,6 +325,11 @@ class ResourceService:
 
             self.session.add(resource)
             self.session.commit()
+            invalidate_spatial_indexes()
+            suggestion_index.invalidate()
+            extent_geometry_updater.schedule(
+                extent.id for extent in spatial_extent_objects
+            )
 
             return resource
         except Exception as e:
@@ -315,6 +369,8 @@ class ResourceService:
         existing_resource.updated_at = datetime.now()
 
         self.session.commit()
+        refresh_collection_aggregates(self.session, [existing_resource.id])
+        suggestion_index.invalidate()
         return existing_resource
 
     def update_license(
@@ -364,6 +420,7 @@ class ResourceService:
         existing_resource.providers = new_providers
         self.session.add(existing_resource)
         self.session.commit()
+        refresh_collection_aggregates(self.session, [resource_id])
 
         updated_providers = self.provider_service.get_providers_by_resource_id(
             resource_id
@@ -410,6 +467,8 @@ class ResourceService:
             existing_resource.categories.append(resource_category)
 
         self.session.commit()
+        refresh_collection_aggregates(self.session, [resource_id])
+        suggestion_index.invalidate()
         # Return the updated main category
         return self.category_service.get_category(category_id)
 
@@ -460,6 +519,8 @@ class ResourceService:
         existing_resource.categories = new_additional_resource_categories
         self.session.add(existing_resource)
         self.session.commit()
+        refresh_collection_aggregates(self.session, [resource_id])
+        suggestion_index.invalidate()
 
         updated_categories = (
             self.category_service.get_additional_categories_by_resource_id(resource_id)
@@ -470,6 +531,34 @@ class ResourceService:
         stmt = select(SpatialExtent).where(SpatialExtent.id == spatial_extent_id)
         return self.session.scalars(stmt).unique().one_or_none()
 
+    def get_spatial_extent_geojson(
+        self, spatial_extent_ids: list[uuid.UUID], simplified: bool = False
+    ) -> dict[uuid.UUID, bytes]:
+        """Returns the stored GeoJSON FeatureCollection of each extent that
+        has a geometry."""
+        if not spatial_extent_ids:
+            return {}
+        geojson = (
+            SpatialExtent.geojson_simplified if simplified else SpatialExtent.geojson
+        )
+        rows = self.session.execute(
+            select(
+                SpatialExtent.id,
+                geojson,
+                # Only extents whose GeoJSON is not encoded yet need the WKB
+                case((geojson.is_(None), func.ST_AsBinary(SpatialExtent.geometry))),
+            ).where(SpatialExtent.id.in_(spatial_extent_ids))
+        ).all()
+        result = {}
+        for extent_id, compressed, wkb in rows:
+            if compressed is not None:
+                result[extent_id] = zlib.decompress(compressed)
+            elif wkb is not None:
+                result[extent_id] = feature_collection_json(
+                    shapely.from_wkb(bytes(wkb))
+                )
+        return result
+
     def update_spatial_extent(
         self,
         resource_id: uuid.UUID,
@@ -494,6 +583,8 @@ class ResourceService:
         existing_resource.spatial_extent = new_spatial_extents
         self.session.add(existing_resource)
         self.session.commit()
+        refresh_collection_aggregates(self.session, [resource_id])
+        invalidate_spatial_indexes()
 
         return new_spatial_extents
 
@@ -523,6 +614,7 @@ class ResourceService:
         existing_resource.temporal_extent = new_temporal_extent
         self.session.add(existing_resource)
         self.session.commit()
+        refresh_collection_aggregates(self.session, [resource_id])
 
         return new_temporal_extent
 
@@ -548,9 +640,12 @@ class ResourceService:
                 self.session.add(geometry_relation)
 
             self.session.commit()
+            resource_id = spatial_extent.resource_id
             self.session.delete(spatial_extent)
 
             self.session.commit()
+            refresh_collection_aggregates(self.session, [resource_id])
+            invalidate_spatial_indexes()
             logger.info(f"SpatialExtent {spatial_extent_id} deleted successfully.")
         except Exception as e:
             self.session.rollback()
@@ -583,7 +678,23 @@ class ResourceService:
             if not resource:
                 raise ValueError(f"Resource with id {resource_id} not found")
 
+            # Collections that the resource is a child of, whose aggregates
+            # change once it is gone
+            parent_ids = self.session.scalars(
+                select(resource_relation.c.parent_id).where(
+                    resource_relation.c.child_id == resource_id
+                )
+            ).all()
+
             try:
+                self.session.execute(
+                    delete(resource_relation).where(
+                        or_(
+                            resource_relation.c.child_id == resource_id,
+                            resource_relation.c.parent_id == resource_id,
+                        )
+                    )
+                )
                 for provider in resource.providers:
                     self.session.delete(provider)
                 for extent in resource.spatial_extent:
@@ -602,6 +713,8 @@ class ResourceService:
             try:
                 self.session.delete(resource)
                 self.session.commit()
+                suggestion_index.invalidate()
+                refresh_collection_aggregates(self.session, parent_ids)
             except Exception as e:
                 logger.error(
                     f"Error commiting delete for resource with ID:{resource_id} - {e}"
@@ -0,0 +1,19 @@
+import logging
+
+from data_catalog_backend.schemas.suggestion import SuggestionResponse
+from data_catalog_backend.services.helpers.suggestions import suggestion_index
+
+logger = logging.getLogger(__name__)
+
+
+class SuggestionService:
+    def __init__(self, session):
+        self.session = session
+
+    def suggest(self, prefix: str, limit: int) -> list[SuggestionResponse]:
+        """Returns the best suggestions for what a user has typed so far.
+
+        Lookups only read the in-memory index. The database is queried at
+        most once per refresh interval, to check whether to rebuild it.
+        """
+        return suggestion_index.get(self.session).lookup(prefix, limit)
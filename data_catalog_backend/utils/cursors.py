@@ -0,0 +1,54 @@
+import base64
+import binascii
+import uuid
+from datetime import date, datetime
+from typing import Any
+
+import orjson
+
+
+def encode_cursor(scope: str, values: list[Any]) -> str:
+    """Encodes the sort key values of the last result of a page as an opaque
+    cursor for the next page of the search identified by ``scope``."""
+    return (
+        base64.urlsafe_b64encode(orjson.dumps({"scope": scope, "values": values}))
+        .decode()
+        .rstrip("=")
+    )
+
+
+def decode_cursor(cursor: str, scope: str, types: list[type]) -> list[Any]:
+    """Decodes a cursor from encode_cursor, converting its values to the
+    Python types of the sort keys. Raises ValueError for cursors that cannot
+    be decoded, were made for another search or hold values of other types.
+    """
+    try:
+        content = orjson.loads(
+            base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        )
+    except (binascii.Error, orjson.JSONDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(content, dict) or content.get("scope") != scope:
+        raise ValueError("Cursor does not belong to this search or sort order")
+    values = content.get("values")
+    if not isinstance(values, list) or len(values) != len(types):
+        raise ValueError("Invalid cursor")
+    return [_convert(value, type_) for value, type_ in zip(values, types)]
+
+
+def _convert(value: Any, type_: type) -> Any:
+    # bool is an int, but never a sort key
+    if isinstance(value, bool):
+        raise ValueError("Invalid cursor")
+    if type_ is float and isinstance(value, (int, float)):
+        return float(value)
+    if type_ in (str, int) and isinstance(value, type_):
+        return value
+    if type_ in (datetime, date, uuid.UUID) and isinstance(value, str):
+        try:
+            if type_ is uuid.UUID:
+                return uuid.UUID(value)
+            return type_.fromisoformat(value)
+        except ValueError as e:
+            raise ValueError("Invalid cursor") from e
+    raise ValueError("Invalid cursor")
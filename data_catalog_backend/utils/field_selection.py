@@ -0,0 +1,41 @@
+from typing import Iterable, Optional, Type
+
+from pydantic import create_model
+
+from data_catalog_backend.schemas.basemodel import BaseModel
+
+
+def parse_field_names(
+    value: Optional[str], available: Iterable[str], parameter: str = "fields"
+) -> frozenset[str]:
+    """Parses a comma separated list of field names from a query parameter.
+
+    Returns an empty set when the parameter is left out. Raises ValueError
+    for names that are not available.
+    """
+    if not value:
+        return frozenset()
+    names = frozenset(name.strip() for name in value.split(",") if name.strip())
+    unknown = names.difference(available)
+    if unknown:
+        raise ValueError(
+            f"Unknown {parameter}: {', '.join(sorted(unknown))}. "
+            f"Available: {', '.join(sorted(available))}"
+        )
+    return names
+
+
+def partial_model(
+    model: Type[BaseModel], fields: Iterable[str], name: str
+) -> Type[BaseModel]:
+    """Creates a model with only some of the fields of another model."""
+    fields = set(fields)
+    return create_model(
+        name,
+        __base__=BaseModel,
+        **{
+            field_name: (field.annotation, field)
+            for field_name, field in model.model_fields.items()
+            if field_name in fields
+        },
+    )
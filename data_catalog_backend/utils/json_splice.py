@@ -0,0 +1,37 @@
+import json
+from typing import Any, Optional, Type
+
+from pydantic import BaseModel
+
+_MISSING = object()
+
+
+def dump_json_without(schema: Type[BaseModel], obj: Any, exclude: set[str]) -> bytes:
+    """Validates an object into a schema and dumps it as JSON, leaving out
+    some fields.
+
+    The excluded fields are never read from the object, so they can be
+    deferred columns that are added to the JSON with splice_json instead.
+    """
+    data = {}
+    for name in schema.model_fields:
+        if (
+            name not in exclude
+            and (value := getattr(obj, name, _MISSING)) is not _MISSING
+        ):
+            data[name] = value
+    return (
+        schema.model_validate(data)
+        .model_dump_json(exclude=exclude, exclude_none=True)
+        .encode()
+    )
+
+
+def splice_json(document: bytes, key: str, value: Optional[bytes]) -> bytes:
+    """Adds a member holding already encoded JSON to a JSON object."""
+    if value is None:
+        return document
+    # Everything up to the closing brace of the object
+    head = document.rstrip()[:-1]
+    separator = b"" if head.rstrip().endswith(b"{") else b","
+    return head + separator + json.dumps(key).encode() + b":" + value + b"}"
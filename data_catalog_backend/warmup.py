@@ -0,0 +1,170 @@
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+from sqlalchemy import Engine, select
+from sqlalchemy.orm import Session, configure_mappers
+
+from data_catalog_backend.config import settings
+from data_catalog_backend.database import SessionLocal, engine, replica_engines
+from data_catalog_backend.models import (
+    Category,
+    License,
+    Provider,
+    Resource,
+    ResourceType,
+    SpatialExtentRequestType,
+)
+from data_catalog_backend.readiness import readiness
+from data_catalog_backend.schemas.resource import FULL_RESOURCE_VIEW
+from data_catalog_backend.schemas.resource_query import (
+    ResourceQueryRequest,
+    ResourceSort,
+    resource_query_adapter,
+)
+from data_catalog_backend.services.helpers.resource_loading import (
+    resource_load_options,
+)
+from data_catalog_backend.services.helpers.resource_queries import ResourceQuery
+from data_catalog_backend.services.helpers.spatial_index import (
+    extent_index,
+    geometry_index,
+)
+from data_catalog_backend.services.helpers.suggestions import suggestion_index
+
+logger = logging.getLogger(__name__)
+
+# Searches with the shapes most requests have, as sent by GET /v1/resources
+WARMUP_SEARCHES = [
+    ResourceQueryRequest(),
+    ResourceQueryRequest(types=[ResourceType.Dataset]),
+    ResourceQueryRequest(spatial=[SpatialExtentRequestType.Global]),
+    ResourceQueryRequest(tags=["warmup"]),
+    ResourceQueryRequest(year_from=2000),
+    ResourceQueryRequest(sort=ResourceSort.Popularity),
+    ResourceQueryRequest(sort=ResourceSort.UpdatedAt),
+]
+
+
+def prefill_pool(pool_engine: Engine, connections: int) -> int:
+    """Opens up to ``connections`` connections and returns them to the pool,
+    so the first requests do not wait for connections to be established.
+
+    Returns the number of connections opened, which is at most the pool size.
+    """
+    connections = min(connections, pool_engine.pool.size())
+    opened = []
+    try:
+        for _ in range(connections):
+            opened.append(pool_engine.connect())
+    finally:
+        for connection in opened:
+            connection.close()
+    return len(opened)
+
+
+def load_spatial_indexes(session: Session) -> None:
+    geometry_index.load(session)
+    extent_index.load(session)
+
+
+def read_reference_data(session: Session) -> None:
+    """Reads the categories, providers and licenses, which most clients
+    fetch first."""
+    for model in (Category, Provider, License):
+        session.scalars(select(model)).all()
+
+
+def run_common_searches(session: Session) -> None:
+    """Runs the first page of the common searches, which builds and caches
+    their statements."""
+    query = ResourceQuery()
+    for resources_req in WARMUP_SEARCHES:
+        stmt, total_stmt = query.statements(resources_req)
+        params = query.parameters(resources_req, 0, 10)
+        session.execute(total_stmt, params).scalar()
+        resource_query_adapter(()).validate_python(session.execute(stmt, params).all())
+
+
+def read_hot_resources(session: Session) -> None:
+    """Loads the most recently updated resources with all their related
+    objects, as shown by the resource page."""
+    if settings.warmup_hot_resources <= 0:
+        return
+    stmt = (
+        select(Resource)
+        .options(*resource_load_options(FULL_RESOURCE_VIEW))
+        .order_by(Resource.updated_at.desc())
+        .limit(settings.warmup_hot_resources)
+    )
+    session.scalars(stmt).unique().all()
+
+
+def _run_step(name: str, step: Callable[[], object]) -> None:
+    started = time.perf_counter()
+    try:
+        step()
+    except Exception as e:
+        # A failed step only means the first requests are slower
+        logger.warning(f"Warmup step {name} failed: {e}")
+        return
+    logger.info(f"Warmup step {name} took {time.perf_counter() - started:.2f}s")
+
+
+def warm_up(public_api: bool, stop: Optional[threading.Event] = None) -> None:
+    """Prepares this worker for traffic, then marks it ready.
+
+    Configures the mappers, opens pooled connections and, for the public
+    API, loads the spatial indexes and reads the data that the first
+    requests are most likely to need. Failed steps are logged and skipped,
+    and setting ``stop`` skips the steps that have not started yet. The
+    worker is marked ready however the warmup ends.
+    """
+    stop = stop or threading.Event()
+    started = time.perf_counter()
+    try:
+        if not settings.warmup_enabled:
+            return
+        steps: list[tuple[str, Callable[[], object]]] = [
+            ("configure_mappers", configure_mappers)
+        ]
+        engines = [engine, *replica_engines] if public_api else [engine]
+        for pool_engine in engines:
+            steps.append(
+                (
+                    f"prefill_pool[{pool_engine.url.host}]",
+                    lambda pool_engine=pool_engine: prefill_pool(
+                        pool_engine, settings.warmup_connections
+                    ),
+                )
+            )
+        for name, step in steps:
+            if stop.is_set():
+                return
+            _run_step(name, step)
+        if not public_api:
+            return
+        with SessionLocal() as session:
+            session_steps = [
+                ("reference_data", read_reference_data),
+                ("common_searches", run_common_searches),
+                ("suggestions", suggestion_index.load),
+                ("hot_resources", read_hot_resources),
+            ]
+            if settings.spatial_index_enabled:
+                # Otherwise the indexes are loaded on first use
+                session_steps.insert(0, ("spatial_indexes", load_spatial_indexes))
+            for name, step in session_steps:
+                if stop.is_set():
+                    return
+                _run_step(name, lambda: step(session))
+                session.rollback()
+    except Exception as e:
+        logger.error(f"Warmup failed: {e}")
+    finally:
+        readiness.mark_warmed_up()
+        if stop.is_set():
+            logger.info("Warmup stopped at shutdown")
+        elif settings.warmup_enabled:
+            logger.info(f"Warmup finished in {time.perf_counter() - started:.2f}s")
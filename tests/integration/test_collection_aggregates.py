@@ -0,0 +1,82 @@
+from datetime import date
+
+import pytest
+from sqlalchemy.orm import Session
+
+from data_catalog_backend.models import (
+    CollectionAggregate,
+    Resource,
+    ResourceType,
+    TemporalExtent,
+)
+from data_catalog_backend.schemas.resource import ResourceRelationRequest
+from data_catalog_backend.services.category_service import CategoryService
+from data_catalog_backend.services.code_example_service import CodeExampleService
+from data_catalog_backend.services.example_service import ExampleService
+from data_catalog_backend.services.geometry_service import GeometryService
+from data_catalog_backend.services.license_service import LicenseService
+from data_catalog_backend.services.provider_service import ProviderService
+from data_catalog_backend.services.resource_relation_service import (
+    ResourceRelationService,
+)
+from data_catalog_backend.services.resource_service import ResourceService
+
+
+@pytest.fixture(scope="function")
+def resource_service(db_session: Session) -> ResourceService:
+    return ResourceService(
+        db_session,
+        LicenseService(db_session),
+        ProviderService(db_session),
+        CategoryService(db_session),
+        ExampleService(db_session),
+        GeometryService(db_session),
+        CodeExampleService(db_session),
+    )
+
+
+@pytest.fixture(scope="function")
+def collection_and_child(db_session: Session):
+    collection = Resource(
+        title="Test Collection",
+        abstract="Abstract for Test Collection",
+        type=ResourceType.DatasetCollection,
+        created_by="test_user",
+    )
+    child = Resource(
+        title="Test Child",
+        abstract="Abstract for Test Child",
+        type=ResourceType.Dataset,
+        created_by="test_user",
+        temporal_extent=[
+            TemporalExtent(
+                start_date=date(2001, 1, 1),
+                end_date=date(2005, 12, 31),
+                created_by="test_user",
+            )
+        ],
+    )
+    db_session.add_all([collection, child])
+    db_session.commit()
+    return collection.id, child.id
+
+
+def test_aggregate_follows_added_and_removed_children(
+    db_session: Session, resource_service, collection_and_child
+):
+    collection_id, child_id = collection_and_child
+    ResourceRelationService(db_session, resource_service).create_resource_relation(
+        ResourceRelationRequest(parent="Test Collection", child="Test Child")
+    )
+
+    aggregate = db_session.get(CollectionAggregate, collection_id)
+    assert aggregate.child_count == 1
+    assert (aggregate.start_year, aggregate.end_year) == (2001, 2005)
+
+    resource_service.delete_resource(child_id)
+
+    db_session.expire_all()
+    aggregate = db_session.get(CollectionAggregate, collection_id)
+    assert aggregate.child_count == 0
+    assert (aggregate.start_year, aggregate.end_year) == (None, None)
+    assert aggregate.provider_ids == []
@@ -0,0 +1,81 @@
+import uuid
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy import text
+
+from benchmarks.search_plans import explain
+from data_catalog_backend.models import ResourceType, SpatialExtentRequestType
+from data_catalog_backend.schemas.resource_query import (
+    ResourceQueryRequest,
+    ResourceSort,
+)
+from data_catalog_backend.services.helpers.resource_queries import ResourceQuery
+
+
+@pytest.fixture
+def connection(db_session):
+    connection = db_session.connection()
+    # The test tables are nearly empty, so make the planner prefer indexes
+    # whenever one can be used.
+    connection.execute(text("SET LOCAL enable_seqscan = off"))
+    return connection
+
+
+def search_plan(connection, request: ResourceQueryRequest) -> str:
+    query = ResourceQuery()
+    stmt, _ = query.statements(request)
+    return explain(connection, stmt, query.parameters(request, 0, 10), analyze=False)
+
+
+@pytest.mark.parametrize(
+    "request_, index",
+    [
+        (ResourceQueryRequest(), "ix_spatial_extents_resource_id"),
+        (
+            ResourceQueryRequest(types=[ResourceType.Dataset]),
+            "ix_resources_type",
+        ),
+        (
+            ResourceQueryRequest(categories=[uuid.uuid4()]),
+            "ix_resource_category_category_id",
+        ),
+        (
+            ResourceQueryRequest(providers=[uuid.uuid4()]),
+            "ix_resource_provider_provider_id",
+        ),
+        (
+            ResourceQueryRequest(years=["2015"]),
+            "ix_temporalextents_date_range",
+        ),
+    ],
+)
+def test_search_uses_index(connection, request_, index):
+    assert index in search_plan(connection, request_)
+
+
+def test_spatial_type_filter_uses_resource_index(connection):
+    plan = search_plan(
+        connection, ResourceQueryRequest(spatial=[SpatialExtentRequestType.Global])
+    )
+    assert "ix_spatial_extents_resource_id" in plan
+
+
+@pytest.mark.parametrize(
+    "sort, cursor, index",
+    [
+        (ResourceSort.Title, ["Soil"], "ix_resources_title_id"),
+        (
+            ResourceSort.UpdatedAt,
+            [datetime(2025, 1, 1, tzinfo=timezone.utc)],
+            "ix_resources_updated_at_id",
+        ),
+        (ResourceSort.ReleaseDate, [date(2025, 1, 1)], "ix_resources_release_date_id"),
+    ],
+)
+def test_keyset_page_uses_sort_index(connection, sort, cursor, index):
+    query = ResourceQuery()
+    request = ResourceQueryRequest(sort=sort)
+    stmt, _ = query.statements(request, keyset=True)
+    params = query.parameters(request, 0, 10, cursor + [uuid.uuid4()])
+    assert index in explain(connection, stmt, params, analyze=False)
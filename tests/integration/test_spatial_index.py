@@ -0,0 +1,82 @@
+import pytest
+from geoalchemy2.shape import from_shape
+from shapely.geometry import Point, box
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from data_catalog_backend.models import (
+    Resource,
+    ResourceType,
+    SpatialExtent,
+    SpatialExtentType,
+)
+from data_catalog_backend.services.category_service import CategoryService
+from data_catalog_backend.services.code_example_service import CodeExampleService
+from data_catalog_backend.services.example_service import ExampleService
+from data_catalog_backend.services.geometry_service import GeometryService
+from data_catalog_backend.services.helpers.spatial_index import (
+    extent_index,
+    spatial_change_token,
+)
+from data_catalog_backend.services.license_service import LicenseService
+from data_catalog_backend.services.provider_service import ProviderService
+from data_catalog_backend.services.resource_service import ResourceService
+
+
+@pytest.fixture(scope="function")
+def resource_service(db_session: Session) -> ResourceService:
+    return ResourceService(
+        db_session,
+        LicenseService(db_session),
+        ProviderService(db_session),
+        CategoryService(db_session),
+        ExampleService(db_session),
+        GeometryService(db_session),
+        CodeExampleService(db_session),
+    )
+
+
+@pytest.fixture(scope="function")
+def extent_and_resources(db_session: Session):
+    first, second = [
+        Resource(
+            title=f"Test Resource {i}",
+            abstract=f"Abstract for Test Resource {i}",
+            type=ResourceType.Dataset,
+            created_by="test_user",
+        )
+        for i in (1, 2)
+    ]
+    db_session.add_all([first, second])
+    db_session.flush()
+    extent = SpatialExtent(
+        type=SpatialExtentType.Region,
+        resource_id=first.id,
+        geometry=from_shape(box(10, 10, 20, 20), srid=4326),
+        created_by="test_user",
+    )
+    db_session.add(extent)
+    db_session.commit()
+    # May hold the extents of earlier tests
+    extent_index.invalidate()
+
+    yield extent, first, second
+
+    db_session.execute(delete(SpatialExtent))
+    db_session.execute(delete(Resource))
+    db_session.commit()
+
+
+def test_moved_extent_is_found_for_its_new_resource(
+    db_session: Session, resource_service: ResourceService, extent_and_resources
+):
+    extent, first, second = extent_and_resources
+    point = Point(15, 15)
+    assert extent_index.get(db_session).candidates([point]) == [first.id]
+    token = db_session.execute(spatial_change_token()).one()
+
+    resource_service.update_spatial_extent(second.id, [extent.id])
+
+    # In this process through invalidate(), in others through the token
+    assert extent_index.get(db_session).candidates([point]) == [second.id]
+    assert db_session.execute(spatial_change_token()).one() != token
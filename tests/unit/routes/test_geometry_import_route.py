@@ -0,0 +1,31 @@
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from data_catalog_backend.config import settings
+from data_catalog_backend.routes.admin import geometry_routes
+from data_catalog_backend.schemas.User import User
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(settings, "geometry_import_max_bytes", 16)
+    app = FastAPI()
+    app.include_router(geometry_routes.router)
+    app.dependency_overrides[geometry_routes.authenticate_user] = lambda: MagicMock(
+        spec=User, email="admin@example.com"
+    )
+    app.dependency_overrides[geometry_routes.get_geometry_service] = lambda: MagicMock()
+    return TestClient(app)
+
+
+def test_import_rejects_files_over_the_limit(client):
+    response = client.post("/geometries/import", content=b"x" * 17)
+    assert response.status_code == 413
+
+
+def test_import_rejects_streamed_files_over_the_limit(client):
+    response = client.post("/geometries/import", content=iter([b"x" * 10, b"x" * 10]))
+    assert response.status_code == 413
@@ -0,0 +1,16 @@
+from sqlalchemy.dialects import postgresql
+
+from data_catalog_backend.services.helpers.collection_aggregates import _statements
+
+
+def test_aggregates_are_upserted_from_the_children_of_each_collection():
+    upsert, stale = _statements()
+    sql = str(upsert.compile(dialect=postgresql.dialect()))
+    assert sql.startswith("INSERT INTO collection_aggregates")
+    assert "ON CONFLICT (resource_id) DO UPDATE" in sql
+    # Children are looked up for each collection, not for every resource
+    assert "FROM resource_relation, resources" not in sql
+    assert sql.count("WHERE resource_relation.parent_id = resources.id") == 5
+
+    sql = str(stale.compile(dialect=postgresql.dialect()))
+    assert sql.startswith("DELETE FROM collection_aggregates")
@@ -0,0 +1,115 @@
+import io
+import json
+from concurrent.futures import Future
+from unittest.mock import MagicMock
+
+import pytest
+import shapely
+from geoalchemy2.shape import from_shape
+from shapely.geometry import GeometryCollection, Point, Polygon, box
+
+from data_catalog_backend.exceptions import GeometryImportError
+from data_catalog_backend.models import Geometry, SpatialExtent
+from data_catalog_backend.services import geometry_service
+from data_catalog_backend.services.helpers.geometry_import import read_geojson
+from data_catalog_backend.services.helpers.geometry_processing import (
+    feature_collection_json,
+    prepare_geometries,
+    union_geometries,
+)
+
+
+def _collection(*features) -> io.BytesIO:
+    return io.BytesIO(
+        json.dumps({"type": "FeatureCollection", "features": list(features)}).encode()
+    )
+
+
+def _feature(name, geometry):
+    return {"type": "Feature", "properties": {"name": name}, "geometry": geometry}
+
+
+def test_read_geojson_names_features_and_reports_unnamed():
+    square = {"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 0]]]}
+    errors = []
+    features = list(
+        read_geojson(
+            _collection(_feature("Kenya", square), _feature(None, square)),
+            "name",
+            errors,
+        )
+    )
+    assert features == [("Kenya", square)]
+    assert len(errors) == 1
+
+
+def test_read_geojson_rejects_invalid_json():
+    with pytest.raises(GeometryImportError):
+        list(read_geojson(io.BytesIO(b'{"features": [{'), "name", []))
+
+
+def test_prepare_geometries_repairs_and_encodes():
+    bowtie = Polygon([(0, 0), (1, 1), (1, 0), (0, 1), (0, 0)])
+    results = prepare_geometries(
+        [("bowtie", bowtie.__geo_interface__), ("wkb", bowtie.wkb)], 0.0, 0.0
+    )
+    assert [name for name, _, _ in results] == ["bowtie", "wkb"]
+    for _, ewkb, error in results:
+        assert error is None
+        geometry = shapely.from_wkb(ewkb)
+        assert geometry.is_valid
+        assert shapely.get_srid(geometry) == 4326
+
+
+def test_union_geometries_repairs_and_merges_each_group():
+    bowtie = Polygon([(0, 0), (1, 1), (1, 0), (0, 1), (0, 0)])
+    square = Polygon([(1, 0), (2, 0), (2, 1), (1, 1), (1, 0)])
+    both, none = union_geometries(
+        [("both", [bowtie.wkb, square.wkb]), ("none", [])], 0.0, 0.0, 0.0
+    )
+    assert (both.key, none.key) == ("both", "none")
+    union = shapely.from_wkb(both.ewkb)
+    assert union.is_valid
+    assert union.area == shapely.make_valid(bowtie).area + square.area
+    assert shapely.get_srid(union) == 4326
+    assert none == ("none", None, None, None)
+
+
+def test_feature_collection_json_matches_the_model_conversion():
+    collection = GeometryCollection([box(0, 0, 1, 1), Point(0.5, 2)])
+    extent = SpatialExtent(geometry=from_shape(collection, srid=4326))
+    assert json.loads(feature_collection_json(collection)) == json.loads(
+        extent.geom.model_dump_json(exclude_none=True)
+    )
+
+
+def test_create_geometry_reads_the_features_in_the_pool(monkeypatch):
+    batches = []
+
+    class InlinePool:
+        def submit(self, fn, batch, *args):
+            batches.append(batch)
+            future = Future()
+            future.set_result(fn(batch, *args))
+            return future
+
+    monkeypatch.setattr(geometry_service, "get_process_pool", InlinePool)
+    monkeypatch.setattr(geometry_service, "invalidate_spatial_indexes", lambda: None)
+    session = MagicMock()
+    square = box(0, 0, 1, 1).__geo_interface__
+    geometry_service.GeometryService(session).create_geometry(
+        Geometry(
+            name="Square",
+            geometry={
+                "type": "FeatureCollection",
+                "features": [_feature("Square", square)],
+            },
+        ),
+        MagicMock(email="admin@example.com"),
+    )
+    # The request thread only passes on the GeoJSON
+    [[(name, collection)]] = batches
+    assert name == "Square"
+    assert collection == {"type": "GeometryCollection", "geometries": [square]}
+    [stored] = session.add.call_args.args
+    assert stored.geometry is not None
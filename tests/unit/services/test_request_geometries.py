@@ -0,0 +1,64 @@
+import math
+
+import pytest
+import shapely
+from geojson_pydantic import Feature
+from shapely.geometry import Polygon, shape
+
+from data_catalog_backend.config import settings
+from data_catalog_backend.exceptions import RequestGeometryError
+from data_catalog_backend.services.helpers.request_geometries import (
+    normalize_geometry,
+    normalized_geometries,
+    normalized_wkb,
+)
+
+
+def _feature(coordinates) -> Feature:
+    return Feature(
+        type="Feature",
+        properties={},
+        geometry={"type": "Polygon", "coordinates": [coordinates]},
+    )
+
+
+def _circle(vertices: int) -> list:
+    points = [
+        [
+            10 + math.cos(2 * math.pi * i / vertices),
+            math.sin(2 * math.pi * i / vertices),
+        ]
+        for i in range(vertices)
+    ]
+    return points + [points[0]]
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    normalized_geometries.clear()
+    yield
+    normalized_geometries.clear()
+
+
+def test_invalid_polygon_is_made_valid():
+    bowtie = Polygon([(0, 0), (1, 1), (1, 0), (0, 1), (0, 0)])
+    assert normalize_geometry(bowtie, 0.0001, 1000).is_valid
+
+
+def test_large_polygon_is_simplified_to_budget():
+    detailed = shape(_feature(_circle(5000)).geometry)
+    simplified = normalize_geometry(detailed, 0.0001, 500)
+    assert shapely.get_num_coordinates(simplified) <= 500
+    assert simplified.area == pytest.approx(detailed.area, rel=0.01)
+
+
+def test_repeated_features_are_served_from_cache():
+    first = normalized_wkb([_feature(_circle(100))])
+    second = normalized_wkb([_feature(_circle(100))])
+    assert first[0] is second[0]
+
+
+def test_too_many_vertices_are_rejected(monkeypatch):
+    monkeypatch.setattr(settings, "feature_max_vertices", 150)
+    with pytest.raises(RequestGeometryError):
+        normalized_wkb([_feature(_circle(100)), _feature(_circle(100))])
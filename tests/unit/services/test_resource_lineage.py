@@ -0,0 +1,26 @@
+from sqlalchemy.dialects import postgresql
+
+from data_catalog_backend.services.helpers.resource_lineage import (
+    LineageDirection,
+    lineage_statement,
+)
+
+
+def _sql(direction: LineageDirection) -> str:
+    return str(lineage_statement(direction).compile(dialect=postgresql.dialect()))
+
+
+def test_lineage_is_one_recursive_query_that_stops_at_cycles():
+    sql = _sql(LineageDirection.Ancestors)
+    assert sql.startswith("WITH RECURSIVE lineage")
+    assert "= ANY (lineage.path)" in sql
+    assert "lineage.is_cycle IS false" in sql
+    assert "lineage.depth < %(max_depth)s" in sql
+    assert lineage_statement(LineageDirection.Ancestors) is lineage_statement(
+        LineageDirection.Ancestors
+    )
+
+
+def test_lineage_directions_follow_relations_the_opposite_way():
+    assert "WHERE resource_relation.child_id = " in _sql(LineageDirection.Ancestors)
+    assert "WHERE resource_relation.parent_id = " in _sql(LineageDirection.Descendants)
@@ -0,0 +1,63 @@
+import uuid
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from data_catalog_backend.models import Resource
+from data_catalog_backend.schemas.resource import (
+    FULL_RESOURCE_VIEW,
+    RESOURCE_BATCH_MAX_IDS,
+    ResourceBatchRequest,
+    ResourceResponse,
+    ResourceView,
+    resource_response_model,
+)
+from data_catalog_backend.services.helpers.resource_loading import (
+    resource_load_options,
+)
+
+
+def _sql(view: ResourceView) -> str:
+    stmt = select(Resource).options(*resource_load_options(view))
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_views_default_to_the_whole_resource():
+    assert ResourceView.parse(None, None) is FULL_RESOURCE_VIEW
+    assert resource_response_model(FULL_RESOURCE_VIEW) is ResourceResponse
+
+    only_include = ResourceView.parse(None, "providers")
+    assert "html_content" in only_include.fields
+    assert only_include.include == ("providers",)
+
+    with pytest.raises(ValueError):
+        ResourceView.parse("title,geometry", None)
+    with pytest.raises(ValueError):
+        ResourceView.parse(None, "title")
+
+
+def test_views_load_and_return_only_what_is_asked_for():
+    view = ResourceView.parse("title", "license")
+    assert set(resource_response_model(view).model_fields) == {
+        "id",
+        "title",
+        "license",
+    }
+
+    sql = _sql(view)
+    assert "resources.title" in sql
+    assert "html_content" not in sql
+    # The computed columns are subqueries that are left out as well
+    assert "spatial_extents" not in sql
+    assert "JOIN licenses" in sql
+
+
+def test_batch_requests_are_limited():
+    ids = [uuid.uuid4() for _ in range(RESOURCE_BATCH_MAX_IDS + 1)]
+    assert len(ResourceBatchRequest(ids=ids[:-1]).ids) == RESOURCE_BATCH_MAX_IDS
+    with pytest.raises(ValidationError):
+        ResourceBatchRequest(ids=ids)
+    with pytest.raises(ValidationError):
+        ResourceBatchRequest(ids=[])
@@ -0,0 +1,247 @@
+import json
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from geojson_pydantic import Feature
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from data_catalog_backend.models import Resource
+from data_catalog_backend.schemas.resource_query import (
+    ResourceQueryPage,
+    ResourceQueryRequest,
+    ResourceSort,
+    parse_fields,
+    resource_query_adapter,
+)
+from data_catalog_backend.services.helpers.resource_queries import (
+    ResourceQuery,
+    QueryShape,
+    sort_key_types,
+    year_multirange,
+)
+from data_catalog_backend.utils.cursors import decode_cursor, encode_cursor
+
+
+def test_requests_with_same_shape_share_statements():
+    query = ResourceQuery()
+    first = query.statements(
+        ResourceQueryRequest(tags=["soil"], categories=[uuid.uuid4()])
+    )
+    second = query.statements(
+        ResourceQueryRequest(tags=["rain"], categories=[uuid.uuid4(), uuid.uuid4()])
+    )
+    assert first[0] is second[0]
+    assert first[1] is second[1]
+
+
+def test_number_of_tags_changes_shape():
+    one_tag = QueryShape.from_request(ResourceQueryRequest(tags=["soil"]))
+    two_tags = QueryShape.from_request(ResourceQueryRequest(tags=["soil", "rain"]))
+    assert one_tag != two_tags
+
+
+def test_parameters_hold_request_values():
+    category = uuid.uuid4()
+    params = ResourceQuery().parameters(
+        ResourceQueryRequest(tags=["soil"], categories=[category]), page=2, per_page=10
+    )
+    assert params["offset"] == 20
+    # One more than a page, to tell whether another page follows
+    assert params["limit"] == 11
+    assert params["tag_pattern_0"] == "%soil%"
+    assert params["categories"] == [category]
+
+
+def test_year_multirange_merges_consecutive_years():
+    assert (
+        year_multirange([2015, 2016, 2017, 2020])
+        == "{[2015-01-01,2017-12-31],[2020-01-01,2020-12-31]}"
+    )
+
+
+def test_year_multirange_combines_years_and_range():
+    assert (
+        year_multirange([2000, 2012], year_from=2010, year_to=2015)
+        == "{[2000-01-01,2000-12-31],[2010-01-01,2015-12-31]}"
+    )
+
+
+def test_year_multirange_keeps_future_years_and_open_ranges():
+    assert year_multirange([2030]) == "{[2030-01-01,2030-12-31]}"
+    assert year_multirange([2000], year_from=2020) == (
+        "{[2000-01-01,2000-12-31],[2020-01-01,]}"
+    )
+    assert year_multirange([], year_to=1999) == "{[,1999-12-31]}"
+    assert year_multirange([], year_from=2010, year_to=2000) == "{}"
+
+
+def test_open_ended_extents_run_until_the_current_year():
+    stmt, _ = ResourceQuery().statements(ResourceQueryRequest(years=["2028"]))
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "temporalextents.date_range && CAST(" in sql
+    assert "upper_inf(temporalextents.date_range)" in sql
+    assert "make_date(CAST(EXTRACT(year FROM CURRENT_DATE) AS INTEGER)" in sql
+
+
+def _point(x: float, y: float) -> Feature:
+    return Feature(
+        type="Feature", properties={}, geometry={"type": "Point", "coordinates": [x, y]}
+    )
+
+
+def test_number_of_features_does_not_change_shape():
+    one = QueryShape.from_request(ResourceQueryRequest(features=[_point(1, 2)]))
+    two = QueryShape.from_request(
+        ResourceQueryRequest(features=[_point(1, 2), _point(3, 4)])
+    )
+    assert one == two
+
+
+def test_overlap_ratio_is_only_selected_when_requested():
+    query = ResourceQuery()
+    plain, _ = query.statements(ResourceQueryRequest(features=[_point(1, 2)]))
+    ranked, _ = query.statements(
+        ResourceQueryRequest(features=[_point(1, 2)], with_overlap=True)
+    )
+    assert "overlap_ratio" not in plain.selected_columns
+    assert "overlap_ratio" in ranked.selected_columns
+
+
+def test_fields_limit_selected_columns_but_keep_ordering():
+    page, _ = ResourceQuery().statements(
+        ResourceQueryRequest(features=[_point(1, 2)], with_overlap=True),
+        fields=parse_fields("title,covers_all"),
+    )
+    assert list(page.selected_columns.keys()) == [
+        "id",
+        "title",
+        "covers_all",
+        "sort_key_0",
+        "sort_key_1",
+        "sort_key_2",
+    ]
+    assert "overlap_ratio" in str(page.compile())
+
+
+def test_fields_are_validated_once_into_partial_results():
+    assert parse_fields(None) == ()
+    assert parse_fields("title, icon") == ("icon", "id", "title")
+    with pytest.raises(ValueError):
+        parse_fields("title,html_content")
+
+    resource_id = uuid.uuid4()
+    data = resource_query_adapter(("id", "title")).validate_python(
+        [{"id": resource_id, "title": "Soil", "abstract": "ignored"}]
+    )
+    page = ResourceQueryPage(0, 1, data, ("id", "title"))
+    assert json.loads(page.json()) == {
+        "current_page": 0,
+        "total_pages": 1,
+        "data": [{"id": str(resource_id), "title": "Soil"}],
+    }
+
+
+def test_popularity_sort_joins_scores_only_for_the_page():
+    page, total = ResourceQuery().statements(
+        ResourceQueryRequest(sort=ResourceSort.Popularity)
+    )
+    assert "coalesce(resource_popularity.score" in str(page.compile())
+    assert "resource_popularity" not in str(total.compile())
+
+
+def test_relevance_sort_needs_tags_or_features():
+    with pytest.raises(ValueError):
+        QueryShape.from_request(ResourceQueryRequest(sort=ResourceSort.Relevance))
+    shape = QueryShape.from_request(
+        ResourceQueryRequest(tags=["soil"], sort=ResourceSort.Relevance)
+    )
+    assert shape.sort == ResourceSort.Relevance
+
+
+def test_overlap_ranking_defaults_to_relevance_sort():
+    shape = QueryShape.from_request(
+        ResourceQueryRequest(features=[_point(1, 2)], with_overlap=True)
+    )
+    assert shape.sort == ResourceSort.Relevance
+
+
+def test_keyset_compares_keys_in_one_direction_as_a_row():
+    page, _ = ResourceQuery().statements(
+        ResourceQueryRequest(sort=ResourceSort.UpdatedAt), keyset=True
+    )
+    sql = str(page.compile(dialect=postgresql.dialect()))
+    assert "(resources.updated_at, resources.id) < (%(cursor_0)s" in sql
+    assert "ORDER BY sort_key_0 DESC, sort_key_1 DESC" in sql
+
+
+def test_cursor_holds_sort_key_values():
+    query = ResourceQuery()
+    page, _ = query.statements(ResourceQueryRequest())
+    scope = query.cursor_scope(ResourceQueryRequest())
+    resource_id = uuid.uuid4()
+    row = SimpleNamespace(
+        id=resource_id, title="Soil", sort_key_0="Soil", sort_key_1=resource_id
+    )
+    cursor = encode_cursor(scope, query.cursor(page, row))
+    assert decode_cursor(cursor, scope, sort_key_types(page)) == [
+        "Soil",
+        resource_id,
+    ]
+    with pytest.raises(ValueError):
+        decode_cursor("not a cursor", scope, sort_key_types(page))
+
+
+def test_cursor_values_are_converted_to_sort_key_types():
+    request = ResourceQueryRequest(sort=ResourceSort.UpdatedAt)
+    page, _ = ResourceQuery().statements(request)
+    types = sort_key_types(page)
+    scope = ResourceQuery().cursor_scope(request)
+    resource_id = uuid.uuid4()
+    updated_at = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+    cursor = encode_cursor(scope, [updated_at, resource_id])
+    assert decode_cursor(cursor, scope, types) == [updated_at, resource_id]
+    for values in (["Soil", str(resource_id)], [updated_at, "a"], [updated_at]):
+        with pytest.raises(ValueError):
+            decode_cursor(encode_cursor(scope, values), scope, types)
+
+
+def test_cursor_only_fits_the_search_it_was_made_for():
+    query = ResourceQuery()
+    by_title = query.cursor_scope(ResourceQueryRequest())
+    cursor = encode_cursor(by_title, ["Soil", str(uuid.uuid4())])
+    by_date = query.cursor_scope(ResourceQueryRequest(sort=ResourceSort.UpdatedAt))
+    with_tags = query.cursor_scope(ResourceQueryRequest(tags=["soil"]))
+    for scope in (by_date, with_tags):
+        with pytest.raises(ValueError):
+            decode_cursor(cursor, scope, [str, uuid.UUID])
+    # Other values for the same filters are another search too
+    soil_cursor = encode_cursor(with_tags, ["Soil", str(uuid.uuid4())])
+    with_other_tags = query.cursor_scope(ResourceQueryRequest(tags=["rain"]))
+    with pytest.raises(ValueError):
+        decode_cursor(soil_cursor, with_other_tags, [str, uuid.UUID])
+    assert with_tags == query.cursor_scope(ResourceQueryRequest(tags=["soil"]))
+    assert by_title == query.cursor_scope(ResourceQueryRequest(sort=ResourceSort.Title))
+
+
+def test_page_after_a_cursor_has_no_number():
+    page = ResourceQueryPage(None, 3, [], next_cursor="abc")
+    assert json.loads(page.json()) == {
+        "total_pages": 3,
+        "next_cursor": "abc",
+        "data": [],
+    }
+
+
+def test_sort_indexes_are_declared_on_the_model():
+    indexes = {
+        index.name: str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+        for index in Resource.__table__.indexes
+    }
+    assert indexes["ix_resources_title_id"].endswith("(title, id)")
+    assert indexes["ix_resources_updated_at_id"].endswith("(updated_at, id)")
+    assert indexes["ix_resources_release_date_id"].endswith(
+        "(coalesce(release_date, DATE '0001-01-01'), id)"
+    )
@@ -0,0 +1,87 @@
+import math
+import uuid
+from unittest.mock import MagicMock
+
+import pytest
+from shapely.geometry import Point, box
+
+from data_catalog_backend.services.helpers.spatial_index import (
+    NamedGeometries,
+    RefreshingIndex,
+    ResourceAreas,
+)
+
+NORWAY, KENYA = uuid.uuid4(), uuid.uuid4()
+SOIL, RAIN, GLOBAL = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+
+
+def _index() -> NamedGeometries:
+    return NamedGeometries.from_rows(
+        geometries=[
+            (NORWAY, "Norway", box(4, 57, 31, 71).wkb),
+            (KENYA, "Kenya", box(34, -5, 42, 5).wkb),
+        ],
+        links=[(NORWAY, SOIL), (KENYA, SOIL), (KENYA, RAIN)],
+        global_resource_ids=[GLOBAL],
+        tolerance=0.0001,
+    )
+
+
+def test_point_lookup_returns_covering_geometries_and_resources():
+    geometries, resources = _index().covering(Point(37, 0))
+    assert geometries == [(KENYA, "Kenya")]
+    assert resources == {SOIL, RAIN, GLOBAL}
+
+
+def test_bbox_must_be_covered():
+    geometries, resources = _index().covering(box(30, 60, 35, 65))
+    assert geometries == []
+    assert resources == {GLOBAL}
+
+
+def test_empty_index():
+    index = NamedGeometries.from_rows([], [], [], tolerance=0.0001)
+    assert index.covering(Point(0, 0)) == ([], set())
+
+
+def test_prefilter_keeps_resources_near_simplified_borders():
+    detailed = Point(10, 10).buffer(1, quad_segs=256)
+    areas = ResourceAreas.from_rows(
+        [(SOIL, detailed.wkb), (RAIN, box(40, 40, 41, 41).wkb)],
+        global_resource_ids=[GLOBAL],
+        tolerance=0.1,
+    )
+    # Just inside the original circle, between vertices of the simplified one
+    edge = Point(10 + 0.9999 * math.cos(0.3), 10 + 0.9999 * math.sin(0.3))
+    assert detailed.covers(edge)
+    assert set(areas.candidates([edge])) == {SOIL, GLOBAL}
+    assert areas.candidates([Point(0, 0)]) == [GLOBAL]
+
+
+def test_index_without_build_cannot_be_created():
+    class TokenOnly(RefreshingIndex):
+        def change_token_statement(self):
+            return None
+
+    with pytest.raises(TypeError):
+        TokenOnly(refresh_seconds=30)
+
+
+def test_invalidated_index_is_rebuilt_with_an_unchanged_token():
+    class Counting(RefreshingIndex):
+        builds = 0
+
+        def change_token_statement(self):
+            return None
+
+        def build(self, session):
+            self.builds += 1
+            return self.builds
+
+    session = MagicMock()
+    session.execute.return_value.one.return_value = (1, None)
+    index = Counting(refresh_seconds=0)
+    assert index.get(session) == 1
+    assert index.get(session) == 1
+    index.invalidate()
+    assert index.get(session) == 2
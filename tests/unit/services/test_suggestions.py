@@ -0,0 +1,65 @@
+import uuid
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from data_catalog_backend.schemas.suggestion import SuggestionResponse, SuggestionType
+from data_catalog_backend.services import resource_service
+from data_catalog_backend.services.helpers.suggestions import Suggestions
+
+SOIL = uuid.uuid4()
+
+
+def _index() -> Suggestions:
+    return Suggestions.from_entries(
+        [
+            SuggestionResponse(
+                text="Soil Moisture Index",
+                type=SuggestionType.Resource,
+                resource_id=SOIL,
+                resources=1,
+            ),
+            SuggestionResponse(text="soil", type=SuggestionType.Keyword, resources=5),
+            SuggestionResponse(text="Soil", type=SuggestionType.Keyword, resources=2),
+            SuggestionResponse(
+                text="Agriculture", type=SuggestionType.Category, resources=3
+            ),
+            SuggestionResponse(text="Kenya", type=SuggestionType.Region, resources=4),
+        ]
+    )
+
+
+def test_prefix_matches_start_of_any_word_best_first():
+    texts = [s.text for s in _index().lookup("MOIST", 10)]
+    assert texts == ["Soil Moisture Index"]
+    texts = [s.text for s in _index().lookup("so", 10)]
+    assert texts == ["soil", "Soil Moisture Index"]
+
+
+def test_texts_differing_in_case_are_merged():
+    (keyword,) = [s for s in _index().lookup("soil", 10) if s.type == "keyword"]
+    assert keyword.text == "soil"
+    assert keyword.resources == 7
+
+
+def test_prefix_of_several_words_and_limit():
+    assert [s.resource_id for s in _index().lookup("soil  moisture i", 10)] == [SOIL]
+    assert len(_index().lookup("s", 1)) == 1
+    assert _index().lookup("   ", 10) == []
+    assert _index().lookup("xyz", 10) == []
+
+
+def test_setting_the_main_category_refreshes_suggestions(monkeypatch):
+    category_id = uuid.uuid4()
+    link = SimpleNamespace(category_id=category_id, is_main_category=False)
+    service = resource_service.ResourceService(MagicMock(), *[MagicMock()] * 6)
+    monkeypatch.setattr(
+        service, "get_resource", lambda _: SimpleNamespace(categories=[link])
+    )
+    monkeypatch.setattr(
+        resource_service, "refresh_collection_aggregates", lambda *args: None
+    )
+    invalidate = MagicMock()
+    monkeypatch.setattr(resource_service.suggestion_index, "invalidate", invalidate)
+    service.set_main_category(category_id, SOIL, MagicMock())
+    assert link.is_main_category
+    invalidate.assert_called_once()
@@ -0,0 +1,61 @@
+import uuid
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from data_catalog_backend.models import ResourcePopularity
+
+from data_catalog_backend.services.helpers.view_counts import (
+    POPULARITY_EPOCH,
+    ViewCounter,
+    _upsert_statement,
+    view_weight,
+)
+
+
+def test_views_are_added_up_and_flushed_in_one_statement():
+    first, second = sorted([uuid.uuid4(), uuid.uuid4()])
+    counter = ViewCounter(flush_seconds=60, max_pending=10)
+    for resource_id in (second, first, second):
+        counter._counts[resource_id] += 1
+    session = MagicMock()
+    assert counter.flush(session) == 2
+    session.execute.assert_called_once()
+    params = session.execute.call_args.args[1]
+    assert params["resource_ids"] == [first, second]
+    assert params["view_counts"] == [1, 2]
+    assert counter.flush(session) == 0
+
+
+def test_failed_flush_keeps_the_views():
+    resource_id = uuid.uuid4()
+    counter = ViewCounter(flush_seconds=60, max_pending=10)
+    counter._counts[resource_id] = 3
+    session = MagicMock()
+    session.execute.side_effect = RuntimeError("database unavailable")
+    with pytest.raises(RuntimeError):
+        counter.flush(session)
+    assert counter._counts[resource_id] == 3
+
+
+def test_view_weight_doubles_every_half_life():
+    later = POPULARITY_EPOCH + timedelta(days=30)
+    assert view_weight(POPULARITY_EPOCH, 30) == 1
+    assert view_weight(later, 30) == pytest.approx(2)
+
+
+def test_upsert_adds_to_existing_counts():
+    sql = str(_upsert_statement().compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (resource_id) DO UPDATE" in sql
+    assert "resource_popularity.score + excluded.score" in sql
+
+
+def test_score_index_is_declared_on_the_model():
+    # So that create_all and autogenerate agree with the migration
+    [index] = ResourcePopularity.__table__.indexes
+    assert str(CreateIndex(index).compile(dialect=postgresql.dialect())) == (
+        "CREATE INDEX ix_resource_popularity_score ON resource_popularity (score DESC)"
+    )
@@ -0,0 +1,94 @@
+import gzip
+
+import brotli
+import pytest
+import zstandard
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from data_catalog_backend.compression import (
+    CompressionMiddleware,
+    available_encodings,
+    negotiate_encoding,
+)
+
+BODY = b"spatial extent " * 200
+
+
+@pytest.fixture
+def client():
+    api = FastAPI()
+    api.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @api.get("/large")
+    def large():
+        return PlainTextResponse(BODY)
+
+    @api.get("/small")
+    def small():
+        return PlainTextResponse(b"small")
+
+    @api.get("/stream")
+    def stream():
+        return StreamingResponse(iter([BODY, BODY]), media_type="text/plain")
+
+    return TestClient(api)
+
+
+def _get(client, path, accept_encoding):
+    # The test client decodes gzip and brotli itself unless streamed raw
+    with client.stream(
+        "GET", path, headers={"Accept-Encoding": accept_encoding}
+    ) as response:
+        return response, b"".join(response.iter_raw())
+
+
+@pytest.mark.parametrize(
+    "accept_encoding,expected",
+    [
+        ("gzip, br, zstd", "zstd"),
+        ("gzip;q=1, br;q=0.5", "gzip"),
+        ("br, gzip;q=0.8", "br"),
+        ("*", "zstd"),
+        ("zstd;q=0, *;q=0.1", "br"),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_negotiate_encoding(accept_encoding, expected):
+    encodings = available_encodings(6, 4, 3)
+    assert negotiate_encoding(accept_encoding, encodings) == expected
+
+
+@pytest.mark.parametrize(
+    "encoding,decompress",
+    [
+        ("gzip", gzip.decompress),
+        ("br", brotli.decompress),
+        ("zstd", zstandard.ZstdDecompressor().decompressobj().decompress),
+    ],
+)
+def test_compresses_large_bodies(client, encoding, decompress):
+    response, body = _get(client, "/large", encoding)
+    assert response.headers["content-encoding"] == encoding
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) == len(body)
+    assert decompress(body) == BODY
+
+
+def test_compresses_streamed_bodies(client):
+    response, body = _get(client, "/stream", "gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert gzip.decompress(body) == BODY + BODY
+
+
+def test_leaves_small_bodies_and_unsupported_encodings(client):
+    response, body = _get(client, "/small", "gzip")
+    assert "content-encoding" not in response.headers
+    assert body == b"small"
+
+    response, body = _get(client, "/large", "identity")
+    assert "content-encoding" not in response.headers
+    assert body == BODY
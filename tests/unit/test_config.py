@@ -0,0 +1,18 @@
+from data_catalog_backend.config import Settings
+
+
+def test_pool_limits_without_budget():
+    settings = Settings(database_pool_size=15, database_max_overflow=5)
+    assert settings.database_pool_limits == (15, 5)
+
+
+def test_connection_budget_is_shared_by_workers():
+    settings = Settings(
+        uvicorn_reload=False, uvicorn_workers=4, database_connection_budget=30
+    )
+    assert settings.database_pool_limits == (7, 0)
+
+
+def test_reload_runs_one_worker():
+    settings = Settings(uvicorn_reload=True, uvicorn_workers=4)
+    assert settings.worker_count == 1
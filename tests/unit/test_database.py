@@ -0,0 +1,72 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine, select, insert, text
+
+from data_catalog_backend import database
+from data_catalog_backend.database import ReplicaMonitor, RoutingSession, USE_PRIMARY
+from data_catalog_backend.models import Resource
+
+
+@pytest.fixture
+def replica(monkeypatch):
+    replica = MagicMock(name="replica")
+    monkeypatch.setattr(database, "replica_engines", [replica])
+    monkeypatch.setattr(database.replica_monitor, "choose", lambda: replica)
+    return replica
+
+
+def test_reads_go_to_replica(replica):
+    session = RoutingSession()
+    assert session.get_bind(clause=select(Resource)) is replica
+
+
+def test_writes_go_to_primary(replica):
+    session = RoutingSession()
+    assert session.get_bind(clause=insert(Resource)) is database.engine
+
+
+def test_text_statements_go_to_primary(replica):
+    session = RoutingSession()
+    assert session.get_bind(clause=text("DELETE FROM resources")) is database.engine
+
+
+def test_flushed_session_stays_on_primary(replica):
+    session = RoutingSession()
+    session.dispatch.after_flush(session, None)
+    assert session.get_bind(clause=select(Resource)) is database.engine
+
+
+def test_pinned_session_uses_primary(replica):
+    session = RoutingSession()
+    session.info[USE_PRIMARY] = True
+    assert session.get_bind(clause=select(Resource)) is database.engine
+
+
+def test_falls_back_to_primary_without_usable_replica(monkeypatch, replica):
+    monkeypatch.setattr(database.replica_monitor, "choose", lambda: None)
+    session = RoutingSession()
+    assert session.get_bind(clause=select(Resource)) is database.engine
+
+
+def test_replica_lag_is_measured_in_the_background(monkeypatch):
+    replica = create_engine("sqlite://")
+    monitor = ReplicaMonitor([replica], max_lag_seconds=5, check_interval=60)
+    release = threading.Event()
+
+    def measure_lag(replica):
+        release.wait()
+        return 1.0
+
+    monkeypatch.setattr(monitor, "_measure_lag", measure_lag)
+    # Does not wait for the slow replica
+    assert monitor.choose() is None
+    release.set()
+    for _ in range(100):
+        if monitor.lag(replica) is not None:
+            break
+        time.sleep(0.01)
+    assert monitor.choose() is replica
+    monitor.shutdown()
@@ -0,0 +1,25 @@
+import json
+import uuid
+
+from data_catalog_backend.models import SpatialExtent, SpatialExtentType
+from data_catalog_backend.schemas.spatial_extent import SpatialExtentResponse
+from data_catalog_backend.utils.json_splice import dump_json_without, splice_json
+
+
+def test_splice_json_adds_encoded_members():
+    assert splice_json(b"{}", "geometry", b'{"a":1}') == b'{"geometry":{"a":1}}'
+    assert json.loads(splice_json(b'{"id":1} ', "list", b"[]")) == {
+        "id": 1,
+        "list": [],
+    }
+    assert splice_json(b'{"id":1}', "geometry", None) == b'{"id":1}'
+
+
+def test_dump_json_without_does_not_read_excluded_fields():
+    extent = SpatialExtent(
+        id=uuid.uuid4(), type=SpatialExtentType.Region, region="Kenya"
+    )
+    # Reading the geometry of a transient extent would fail validation
+    extent.geometry = b"not geojson"
+    dumped = json.loads(dump_json_without(SpatialExtentResponse, extent, {"geometry"}))
+    assert dumped == {"id": str(extent.id), "type": "REGION", "region": "Kenya"}
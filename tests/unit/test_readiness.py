@@ -0,0 +1,59 @@
+from sqlalchemy import create_engine, text
+
+from data_catalog_backend.database import ReplicaMonitor
+from data_catalog_backend.readiness import DatabaseProbe, Readiness
+
+
+class CountingProbe(DatabaseProbe):
+    def __init__(self, statement, ttl_seconds):
+        super().__init__(create_engine("sqlite://"), statement, ttl_seconds)
+        self.probes = 0
+
+    def _probe(self):
+        self.probes += 1
+        return super()._probe()
+
+
+def test_probe_result_is_cached():
+    probe = CountingProbe(text("SELECT 1"), ttl_seconds=60)
+    assert probe.check() is None
+    assert probe.check() is None
+    assert probe.probes == 1
+
+
+def test_probe_reports_errors():
+    probe = CountingProbe(text("SELECT postgis_lib_version()"), ttl_seconds=0)
+    assert "postgis_lib_version" in probe.check()
+    probe.check()
+    assert probe.probes == 2
+
+
+def test_not_ready_before_warmup():
+    readiness = Readiness(CountingProbe(text("SELECT 1"), ttl_seconds=60))
+    assert readiness.check() == {"ready": False, "warmup": "running"}
+    readiness.mark_warmed_up()
+    assert readiness.check()["ready"]
+
+
+def test_not_ready_without_a_usable_replica(monkeypatch):
+    replicas = ReplicaMonitor(
+        [create_engine("sqlite://"), create_engine("sqlite://")],
+        max_lag_seconds=5,
+        check_interval=60,
+    )
+    lags = iter([None, 30.0])
+    monkeypatch.setattr(replicas, "_measure_lag", lambda replica: next(lags))
+    # Checked once here instead of on the background thread
+    replicas.shutdown()
+    replicas.check()
+    readiness = Readiness(replicas=replicas)
+    readiness.mark_warmed_up()
+    result = readiness.check()
+    assert not result["ready"]
+    assert [replica["healthy"] for replica in result["replicas"]] == [False, False]
+    # Replicas are still reported when they do not gate readiness
+    lenient = Readiness(replicas=replicas, require_replica=False)
+    lenient.mark_warmed_up()
+    result = lenient.check()
+    assert result["ready"]
+    assert len(result["replicas"]) == 2
@@ -0,0 +1,25 @@
+import asyncio
+import signal
+
+from data_catalog_backend import recycling
+from data_catalog_backend.recycling import WorkerRecycleMiddleware
+
+
+async def _app(scope, receive, send):
+    pass
+
+
+def test_worker_stops_after_max_requests(monkeypatch):
+    signals = []
+    monkeypatch.setattr(recycling.os, "kill", lambda pid, sig: signals.append(sig))
+    middleware = WorkerRecycleMiddleware(_app, max_requests=2)
+    for _ in range(3):
+        asyncio.run(middleware({"type": "http"}, None, None))
+    assert signals == [signal.SIGTERM]
+
+
+def test_jitter_raises_the_limit():
+    limits = {
+        WorkerRecycleMiddleware(_app, 100, jitter=50).remaining for _ in range(50)
+    }
+    assert min(limits) >= 100 and max(limits) <= 150 and len(limits) > 1
@@ -0,0 +1,36 @@
+import os
+import subprocess
+import sys
+
+# Runs the app through its lifespan and lists the heavy modules it loaded
+SCRIPT = """
+import sys
+from fastapi.testclient import TestClient
+from data_catalog_backend.__main__ import app
+with TestClient(app) as client:
+    client.get("/healthz")
+print("loaded:" + ",".join(
+    module
+    for module in ("shapely", "data_catalog_backend.warmup")
+    if module in sys.modules
+))
+"""
+
+
+def test_health_only_server_does_not_load_the_geometry_stack():
+    env = dict(
+        os.environ,
+        INCLUDE_PUBLIC_API="false",
+        INCLUDE_ADMIN_API="false",
+        RUN_MIGRATIONS="false",
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", SCRIPT],
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+        check=True,
+    )
+    # Logs may go to stdout too
+    assert "loaded:" in result.stdout.splitlines()
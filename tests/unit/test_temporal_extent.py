@@ -0,0 +1,26 @@
+from datetime import date
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+
+from data_catalog_backend.models import TemporalExtent
+from data_catalog_backend.schemas.temporal_extent import TemporalExtentRequest
+
+
+def test_end_date_must_not_be_before_start_date():
+    TemporalExtentRequest(start_date=date(2001, 1, 1), end_date=date(2001, 1, 1))
+    TemporalExtentRequest(start_date=date(2001, 1, 1))
+    with pytest.raises(ValidationError):
+        TemporalExtentRequest(start_date=date(2001, 1, 2), end_date=date(2001, 1, 1))
+
+
+def test_table_checks_end_date():
+    ddl = str(
+        CreateTable(TemporalExtent.__table__).compile(dialect=postgresql.dialect())
+    )
+    assert (
+        "CONSTRAINT ck_temporalextents_end_after_start "
+        "CHECK (end_date IS NULL OR end_date >= start_date)"
+    ) in ddl
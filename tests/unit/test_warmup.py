@@ -0,0 +1,66 @@
+import threading
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+
+from data_catalog_backend import warmup
+from data_catalog_backend.readiness import Readiness
+from data_catalog_backend.services.helpers.resource_queries import QueryShape
+
+
+def test_prefill_pool_returns_connections_to_pool(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", poolclass=QueuePool, pool_size=3
+    )
+    assert warmup.prefill_pool(engine, 2) == 2
+    assert engine.pool.checkedin() == 2
+    assert engine.pool.checkedout() == 0
+
+
+def test_prefill_pool_opens_at_most_pool_size(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", poolclass=QueuePool, pool_size=3
+    )
+    assert warmup.prefill_pool(engine, 10) == 3
+
+
+def test_warmup_searches_have_distinct_shapes():
+    shapes = {QueryShape.from_request(req) for req in warmup.WARMUP_SEARCHES}
+    assert len(shapes) == len(warmup.WARMUP_SEARCHES)
+
+
+def test_ready_without_warmup(monkeypatch):
+    readiness = Readiness()
+    monkeypatch.setattr(warmup, "readiness", readiness)
+    monkeypatch.setattr(warmup.settings, "warmup_enabled", False)
+    assert not readiness.is_warmed_up
+    warmup.warm_up(public_api=True)
+    assert readiness.is_warmed_up
+
+
+def test_ready_when_warmup_fails(monkeypatch):
+    readiness = Readiness()
+    monkeypatch.setattr(warmup, "readiness", readiness)
+    monkeypatch.setattr(warmup.settings, "warmup_enabled", True)
+    monkeypatch.setattr(warmup, "replica_engines", [])
+    monkeypatch.setattr(warmup, "prefill_pool", lambda pool_engine, connections: 0)
+
+    def session_local():
+        raise RuntimeError("could not connect")
+
+    monkeypatch.setattr(warmup, "SessionLocal", session_local)
+    warmup.warm_up(public_api=True)
+    assert readiness.is_warmed_up
+
+
+def test_stopped_warmup_skips_remaining_steps(monkeypatch):
+    readiness = Readiness()
+    monkeypatch.setattr(warmup, "readiness", readiness)
+    monkeypatch.setattr(warmup.settings, "warmup_enabled", True)
+    steps = []
+    monkeypatch.setattr(warmup, "_run_step", lambda name, step: steps.append(name))
+    stop = threading.Event()
+    stop.set()
+    warmup.warm_up(public_api=True, stop=stop)
+    assert steps == []
+    assert readiness.is_warmed_up